@@ -0,0 +1,358 @@
+"""
+Exporter and importer hot paths on the fake bpy layer (see fake_bpy.py).
+
+    python -m benchmarks.bench_blender                          # time, print a table
+    python -m benchmarks.bench_blender --check                  # parity checks only
+    python -m benchmarks.bench_blender --save baseline.json
+    python -m benchmarks.bench_blender --compare baseline.json
+
+Timed: MRFExporter.get_mesh_data (deduplication, and a re-export of the
+unchanged mesh), get_keyframes (scene
+evaluation and baked .bphys cloth cache), and MRFImporter.create_mesh /
+create_shapeanim (the latter on a fresh mesh, so it includes create_mesh),
+on a procedurally animated cylinder. Costs are also reported per frame
+and per vertex.
+
+--check compares the vectorized code against the element-by-element
+loops it replaced (rounded-key dictionary deduplication and per-vertex
+`(matrix_world @ v.co) * scale`) and verifies the shape keys and F-curves
+written by create_shapeanim; keyframes read from a baked cloth cache must
+match scene evaluation, and a batch export of two objects x two clips must
+match separate exports while setting each frame once. Exit status 1 on
+any mismatch.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from . import fake_bpy
+from .bench_mrf import compare, peak_memory, time_best
+
+fake_bpy.install()
+
+from io_warcraft_mrf.core.exporter import MRFExporter, VertexTable, _mesh_cache, ExportJob, export_batch  # noqa: E402
+from io_warcraft_mrf.core.importer import MRFImporter  # noqa: E402
+
+# name: (vertices around, rings, frames)
+SIZES: Dict[str, Tuple[int, int, int]] = {
+    'small': (32, 16, 24),
+    'medium': (128, 64, 60),
+    'large': (256, 128, 60),
+}
+SCALE = 64.0
+
+
+def make_exporter(size: str) -> MRFExporter:
+    n_around, n_height, n_frames = SIZES[size]
+    fake_bpy.reset()
+    obj = fake_bpy.make_cylinder(n_around, n_height)
+    return MRFExporter(obj, SCALE, 'Textures/white', (1, n_frames), 1)
+
+
+# === Reference implementations (element by element, as before vectorization) ===
+
+def reference_mesh_data(mesh, uv_layer) -> Tuple[VertexTable, np.ndarray]:
+    vertex_map = {}
+    rows = []
+    triangles = []
+    for tri in mesh.loop_triangles:
+        triangle = []
+        for loop_index in tri.loops:
+            loop = mesh.loops[loop_index]
+            vert = mesh.vertices[loop.vertex_index]
+            uv = uv_layer[loop.index].uv
+            key = (
+                round(vert.co.x, 6), round(vert.co.y, 6), round(vert.co.z, 6),
+                round(vert.normal.x, 6), round(vert.normal.y, 6), round(vert.normal.z, 6),
+                round(uv.x, 6), round(uv.y, 6),
+            )
+            if key not in vertex_map:
+                vertex_map[key] = len(rows)
+                rows.append((vert.index, tuple(vert.co), tuple(vert.normal), tuple(uv)))
+            triangle.append(vertex_map[key])
+        triangles.append(triangle)
+
+    index, position, normal, uv = zip(*rows)
+    table = VertexTable(np.array(index), np.array(position, dtype=np.float32),
+                        np.array(normal, dtype=np.float32), np.array(uv, dtype=np.float32))
+    return table, np.array(triangles)
+
+
+def reference_keyframes(exporter: MRFExporter, vertex_table: VertexTable) -> np.ndarray:
+    scene = fake_bpy.context.scene
+    obj = exporter.obj
+    keyframes = []
+    for frame in range(exporter.kf_start, exporter.kf_end + 1):
+        scene.frame_set(frame)
+        mesh = obj.evaluated_get(fake_bpy.context.evaluated_depsgraph_get()).to_mesh()
+        frame_data = []
+        for index in vertex_table.index.tolist():
+            v = mesh.vertices[index]
+            frame_data.append((tuple((obj.matrix_world @ v.co) * exporter.scale), tuple(v.normal)))
+        keyframes.append(frame_data)
+        obj.to_mesh_clear()
+    return np.array(keyframes, dtype=np.float32)
+
+
+# === Checks ===
+
+def check_mesh_data(size: str) -> List[str]:
+    exporter = make_exporter(size)
+    mesh = exporter.obj.data
+    table, triangles = exporter.get_mesh_data()
+    expected, expected_triangles = reference_mesh_data(mesh, mesh.uv_layers.active.data)
+
+    errors = []
+    for field in ('index', 'position', 'normal', 'uv'):
+        if not np.array_equal(getattr(table, field), getattr(expected, field)):
+            errors.append(f"mesh_data/{size}: {field} differs from the reference")
+    if not np.array_equal(triangles, expected_triangles):
+        errors.append(f"mesh_data/{size}: triangles differ from the reference")
+    return errors
+
+
+def check_keyframes(size: str) -> List[str]:
+    exporter = make_exporter(size)
+    table, _ = exporter.get_mesh_data()
+    scene = fake_bpy.context.scene
+    scene.frame_current = 7
+    keyframes, _ = exporter.get_keyframes(table)
+
+    errors = []
+    if scene.frame_current != 7:
+        errors.append(f"keyframes/{size}: frame_current not restored ({scene.frame_current})")
+    if not np.array_equal(keyframes, reference_keyframes(exporter, table)):
+        errors.append(f"keyframes/{size}: values differ from per-vertex matrix_world @ co")
+    return errors
+
+
+def check_shapeanim(size: str) -> List[str]:
+    exporter = make_exporter(size)
+    table, triangles = exporter.get_mesh_data()
+    keyframes, _ = exporter.get_keyframes(table)
+    verts = keyframes[:, :, 0]
+    importer = MRFImporter(None, divisor=SCALE)
+    obj = importer.create_mesh(verts, triangles, table.uv, (0.0, 0.0, 0.0), 'MRF_Object')
+    importer.create_shapeanim(obj, verts)
+
+    errors = []
+    blocks = obj.data.shape_keys.key_blocks
+    co = np.array([block.data.arrays['co'] for block in blocks])
+    if not np.array_equal(co, verts / np.float32(SCALE)):
+        errors.append(f"shapeanim/{size}: shape key coordinates differ")
+
+    fcurves = {fc.data_path: fc for fc in obj.data.shape_keys.animation_data.action.fcurves}
+    for frame, block in enumerate(blocks):
+        expected = importer._get_switch_keyframes(frame, len(blocks))
+        fcurve = fcurves.get(f'key_blocks["{block.name}"].value')
+        points = [] if fcurve is None else fcurve.keyframe_points.arrays['co'].tolist()
+        if points != [list(p) for p in expected]:
+            errors.append(f"shapeanim/{size}: {block.name} keyframes {points} != {expected}")
+            break
+        if fcurve is not None and not (fcurve.keyframe_points.arrays['interpolation'] == 2).all():
+            errors.append(f"shapeanim/{size}: {block.name} interpolation is not BEZIER")
+            break
+    return errors
+
+
+def check_cache_keyframes(size: str) -> List[str]:
+    exporter = make_exporter(size)
+    table, _ = exporter.get_mesh_data()
+    expected, _ = exporter.get_keyframes(table)
+    with tempfile.TemporaryDirectory() as workdir:
+        fake_bpy.bake_cloth(exporter.obj, os.path.join(workdir, 'scene.blend'), range(1, SIZES[size][2] + 1))
+        exporter.source = 'BPHYS'
+        keyframes, _ = exporter.get_keyframes(table)
+
+    errors = []
+    if not np.array_equal(keyframes[:, :, 0], expected[:, :, 0]):
+        errors.append(f"cache_keyframes/{size}: positions differ from scene evaluation")
+    if not np.allclose(keyframes[:, :, 1], expected[:, :, 1], atol=1e-5):
+        errors.append(f"cache_keyframes/{size}: recomputed normals differ from scene evaluation")
+    return errors
+
+
+def check_batch(size: str) -> List[str]:
+    n_around, n_height, n_frames = SIZES[size]
+    fake_bpy.reset()
+    objects = [fake_bpy.make_cylinder(n_around, n_height, 'Cape'), fake_bpy.make_cylinder(n_around // 2, n_height, 'Banner')]
+    objects[1].matrix_world = fake_bpy.Matrix()
+    half = n_frames // 2
+    clips = [((1, half), False), ((half - 2, n_frames), True)]  # overlapping, the second one reversed
+    exporters = [MRFExporter(obj, SCALE, 'Textures/white', clip, clip[0], reverse_keyframes=reverse)
+                 for obj in objects for clip, reverse in clips]
+
+    scene = fake_bpy.context.scene
+    scene.frame_set_calls = 0
+    results = export_batch(exporters)
+    errors = []
+    if scene.frame_set_calls != n_frames + 1:
+        errors.append(f"batch/{size}: {scene.frame_set_calls} frame_set calls, expected {n_frames} + 1 to restore")
+    for exporter, models in zip(exporters, results):
+        expected = exporter.export_lods(())[0]
+        if not np.array_equal(models[0].keyframes, expected.keyframes):
+            errors.append(f"batch/{size}: {exporter.obj.name} {exporter.kf_start}-{exporter.kf_end} "
+                          f"keyframes differ from a separate export")
+    return errors
+
+
+def check_cancel(size: str) -> List[str]:
+    """An export job cancelled midway (scene frames done, cache keyframes pending) restores the frame."""
+    n_around, n_height, n_frames = SIZES[size]
+    exporter = make_exporter(size)
+    cache_obj = fake_bpy.make_cylinder(n_around, n_height, 'Cloth')
+    cache_exporter = MRFExporter(cache_obj, SCALE, 'Textures/white', (1, n_frames), 1, source='BPHYS')
+    scene = fake_bpy.context.scene
+    errors = []
+    with tempfile.TemporaryDirectory() as workdir:
+        fake_bpy.bake_cloth(cache_obj, os.path.join(workdir, 'scene.blend'), range(1, n_frames + 1))
+        scene.frame_set(7)
+        job = ExportJob([exporter, cache_exporter])
+        while job.done < n_frames + 2:
+            job.step()
+        job.cancel()
+    if scene.frame_current != 7:
+        errors.append(f"cancel/{size}: frame {scene.frame_current} after cancelling, expected 7")
+    if job.finished:
+        errors.append(f"cancel/{size}: job reports finished after cancelling")
+    return errors
+
+
+def run_checks(sizes: List[str]) -> List[str]:
+    errors = []
+    for size in sizes:
+        for check in (check_mesh_data, check_keyframes, check_shapeanim, check_cache_keyframes, check_batch,
+                      check_cancel):
+            errors += check(size)
+    return errors
+
+
+# === Timings ===
+
+def build_cases(size: str) -> List[Tuple[str, Callable[[], None], int, int]]:
+    """(name, func, frames, vertices) per case; the counts normalize the cost."""
+    exporter = make_exporter(size)
+    n_frames = SIZES[size][2]
+    table, triangles = exporter.get_mesh_data()
+    keyframes, _ = exporter.get_keyframes(table)
+    verts = keyframes[:, :, 0]
+    importer = MRFImporter(None, divisor=SCALE)
+
+    def mesh_data():
+        _mesh_cache.clear()
+        exporter.get_mesh_data()
+
+    def mesh_data_cached():
+        exporter.get_mesh_data()
+
+    def get_keyframes():
+        exporter.get_keyframes(table)
+
+    def create_mesh():
+        importer.create_mesh(verts, triangles, table.uv, (0.0, 0.0, 0.0), 'MRF_Object')
+
+    def create_shapeanim():
+        fake_bpy.reset()
+        obj = importer.create_mesh(verts, triangles, table.uv, (0.0, 0.0, 0.0), 'MRF_Object')
+        importer.create_shapeanim(obj, verts)
+
+    n_verts = len(table)
+    return [
+        ('mesh_data', mesh_data, 1, n_verts),
+        ('mesh_data_cached', mesh_data_cached, 1, n_verts),
+        ('get_keyframes', get_keyframes, n_frames, n_verts),
+        ('create_mesh', create_mesh, 1, n_verts),
+        ('create_shapeanim', create_shapeanim, n_frames, n_verts),
+    ]
+
+
+def build_cache_case(size: str, workdir: str) -> Tuple[str, Callable[[], None], int, int]:
+    exporter = make_exporter(size)
+    n_frames = SIZES[size][2]
+    table, _ = exporter.get_mesh_data()
+    fake_bpy.bake_cloth(exporter.obj, os.path.join(workdir, f'{size}.blend'), range(1, n_frames + 1))
+    exporter.source = 'BPHYS'
+
+    def cache_keyframes():
+        exporter.get_keyframes(table)
+
+    return 'cache_keyframes', cache_keyframes, n_frames, len(table)
+
+
+def run(sizes: List[str], repeat: int) -> dict:
+    results = {}
+
+    def measure(size, name, func, n_frames, n_verts):
+        seconds = time_best(func, repeat)
+        results[f'{name}/{size}'] = {
+            'seconds': seconds,
+            'per_frame_ms': seconds / n_frames * 1e3,
+            'per_vertex_ns': seconds / (n_frames * n_verts) * 1e9,
+            'peak_bytes': peak_memory(func),
+        }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for case in build_cases(size):
+                measure(size, *case)
+            # Built after the others ran: create_shapeanim resets bpy.data, including its filepath
+            measure(size, *build_cache_case(size, workdir))
+    return results
+
+
+def print_table(results: dict, baseline: dict = None):
+    print(f"{'case':<26}{'time (ms)':>12}{'ms/frame':>10}{'ns/vert':>10}{'peak (MB)':>12}{'vs base':>10}")
+    for key, r in results.items():
+        line = (f"{key:<26}{r['seconds'] * 1e3:>12.2f}{r['per_frame_ms']:>10.3f}"
+                f"{r['per_vertex_ns']:>10.1f}{r['peak_bytes'] / 1e6:>12.2f}")
+        if baseline and key in baseline:
+            line += f"{r['seconds'] / baseline[key]['seconds'] - 1:>+10.0%}"
+        print(line)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_blender',
+                                     description="Benchmark exporter/importer hot paths without Blender.")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case, the best is kept")
+    parser.add_argument('--check', action='store_true', help="Run the parity checks instead of timings")
+    parser.add_argument('--save', metavar='JSON', help="Write the results as a baseline")
+    parser.add_argument('--compare', metavar='JSON', help="Baseline to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Allowed slowdown / memory growth before --compare fails (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        errors = run_checks(args.sizes)
+        for line in errors:
+            print(f"FAIL {line}")
+        print(f"{len(errors)} parity check(s) failed" if errors else "All parity checks passed")
+        return 1 if errors else 0
+
+    results = run(args.sizes, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print_table(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'numpy': np.__version__, 'results': results}, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
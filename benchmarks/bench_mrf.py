@@ -0,0 +1,203 @@
+"""
+Throughput and memory benchmarks for the MRF parser, writer (full and
+incremental), validator, normal recomputation and point cache converter.
+
+    python -m benchmarks.bench_mrf                          # run, print a table
+    python -m benchmarks.bench_mrf --save baseline.json     # run and store a baseline
+    python -m benchmarks.bench_mrf --compare baseline.json  # fail on regressions
+
+Run from the repository root. Every case is timed on a synthetic model
+(see synthetic.py); the best of --repeat runs is kept. Peak memory is
+measured in a separate, untimed run because tracemalloc slows allocation
+down considerably. --compare exits with status 1 if any case got slower,
+or allocated more, than the baseline by more than --threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from io_warcraft_mrf.core.mrf_utils import MRFParser, MRFReader, MRFWriter
+from io_warcraft_mrf.core.mrf_utils.convert import point_cache_to_model, topology_from_mrf
+from io_warcraft_mrf.core.mrf_utils.normals import vertex_normals
+from io_warcraft_mrf.core.mrf_utils.point_cache import PointCacheReader, write_point_cache
+from io_warcraft_mrf.core.mrf_utils.validator import validate_file
+from io_warcraft_mrf.core.mrf_utils.writer import mrf_file_size
+
+from .synthetic import make_model
+
+# name: (nVerts, nFrames, nFaces or None for the plain grid)
+SIZES: Dict[str, Tuple[int, int, int]] = {
+    'small': (500, 30, None),
+    'medium': (8000, 120, None),
+    'large': (65535, 60, None),
+    'dense': (4000, 60, 60000),
+}
+# The tuple-based paths are far slower; only run them where they finish quickly
+TUPLE_LIMIT = 2_000_000  # nVerts * nFrames
+
+
+def time_best(func: Callable[[], None], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func: Callable[[], None]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def build_cases(size: str, workdir: str) -> List[Tuple[str, Callable[[], None]]]:
+    n_verts, n_frames, n_faces = SIZES[size]
+    model = make_model(n_verts, n_frames, n_faces)
+    source = os.path.join(workdir, f'{size}.mrf')
+    target = os.path.join(workdir, f'{size}_out.mrf')
+    MRFWriter(model, signature=False).write(source)
+    cache = os.path.join(workdir, f'{size}.pc2')
+    write_point_cache(cache, (frame[:, 0] for frame in model.keyframes), n_verts, n_frames)
+
+    def parse():
+        MRFParser(source, vectorized=True).read()
+
+    def write():
+        MRFWriter(model, signature=False).write(target)
+
+    def update():
+        # Re-export of an unchanged model: compared in place, nothing written
+        MRFWriter(model, signature=False).update(source)
+
+    def round_trip():
+        parser = MRFParser(source, vectorized=True)
+        parser.read()
+        MRFWriter(parser.data, signature=False).write(target)
+
+    def read_lazy():
+        with MRFReader(source) as reader:
+            reader.faces, reader.uvs
+            for i in range(len(reader)):
+                reader.keyframe(i)['pos'].sum()
+
+    def validate():
+        validate_file(source)
+
+    def normals():
+        # Batched over all frames, Blender's angle weighting
+        vertex_normals(model.keyframes[:, :, 0], model.faces, 'ANGLE')
+
+    def convert_pc2():
+        # Streamed: topology from the .mrf, positions from the cache, normals recomputed
+        with PointCacheReader(cache) as reader:
+            converted = point_cache_to_model(reader, topology_from_mrf(source))
+            MRFWriter(converted, signature=False).write(target)
+
+    cases = [('parse', parse), ('write', write), ('update', update), ('round_trip', round_trip),
+             ('read_lazy', read_lazy), ('validate', validate), ('normals', normals),
+             ('convert_pc2', convert_pc2)]
+
+    if n_verts * n_frames <= TUPLE_LIMIT:
+        tuples = model.to_model_data()
+
+        def parse_tuples():
+            MRFParser(source).read()
+
+        def write_tuples():
+            MRFWriter(tuples, signature=False).write(target)
+
+        cases += [('parse_tuples', parse_tuples), ('write_tuples', write_tuples)]
+    return cases
+
+
+def run(sizes: List[str], repeat: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            n_verts, n_frames, n_faces = SIZES[size]
+            model = make_model(n_verts, n_frames, n_faces)
+            file_size = mrf_file_size(n_frames, n_verts, model.header.nIndices, model.texture_path)
+            for name, func in build_cases(size, workdir):
+                seconds = time_best(func, repeat)
+                results[f'{name}/{size}'] = {
+                    'seconds': seconds,
+                    'mb_per_s': file_size / seconds / 1e6,
+                    'peak_bytes': peak_memory(func),
+                    'file_size': file_size,
+                }
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Describes every case that regressed by more than threshold (0.1 = 10%)."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if current[metric] > previous[metric] * (1 + threshold):
+                change = current[metric] / previous[metric] - 1
+                regressions.append(f"{key}: {metric} {previous[metric]:.4g} -> {current[metric]:.4g} (+{change:.0%})")
+    return regressions
+
+
+def print_table(results: dict, baseline: dict = None):
+    print(f"{'case':<24}{'time (ms)':>12}{'MB/s':>10}{'peak (MB)':>12}{'vs base':>10}")
+    for key, r in results.items():
+        line = f"{key:<24}{r['seconds'] * 1e3:>12.2f}{r['mb_per_s']:>10.1f}{r['peak_bytes'] / 1e6:>12.2f}"
+        if baseline and key in baseline:
+            line += f"{r['seconds'] / baseline[key]['seconds'] - 1:>+10.0%}"
+        print(line)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_mrf',
+                                     description="Benchmark MRF parsing and writing on synthetic models.")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case, the best is kept")
+    parser.add_argument('--save', metavar='JSON', help="Write the results as a baseline")
+    parser.add_argument('--compare', metavar='JSON', help="Baseline to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Allowed slowdown / memory growth before --compare fails (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print_table(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'results': results,
+            }, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,569 @@
+"""
+Array-backed stand-ins for the parts of bpy and mathutils used by
+MRFExporter and MRFImporter, so their hot paths run in plain CPython.
+
+    from benchmarks import fake_bpy
+    fake_bpy.install()
+    from io_warcraft_mrf.core.exporter import MRFExporter
+
+install() imports the io_warcraft_mrf package first (its __init__ skips
+registration without bpy), then puts the fakes in sys.modules so the
+core modules pick them up.
+
+Only what the add-on touches is modelled: meshes with vertices, loops,
+polygons, loop triangles and UV layers; shape keys; actions and F-curves;
+foreach_get/foreach_set with Blender's size checks; scene.frame_set and
+evaluated meshes. Vertex normals are angle weighted, as in Blender,
+using the add-on's own mrf_utils.normals.vertex_normals.
+mathutils.Vector and Matrix store float32 like the real module.
+"""
+
+import os
+import sys
+import types
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from io_warcraft_mrf.core.mrf_utils.normals import vertex_normals
+
+
+# === mathutils ===
+
+class Vector:
+    def __init__(self, seq=(0.0, 0.0, 0.0)):
+        self._data = np.array(seq, dtype=np.float32).reshape(-1)
+
+    x = property(lambda self: float(self._data[0]))
+    y = property(lambda self: float(self._data[1]))
+    z = property(lambda self: float(self._data[2]))
+
+    @property
+    def length(self) -> float:
+        return float(np.sqrt(np.dot(self._data.astype(np.float64), self._data)))
+
+    def copy(self) -> 'Vector':
+        return Vector(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, i):
+        return float(self._data[i])
+
+    def __iter__(self):
+        return (float(v) for v in self._data)
+
+    def __array__(self, dtype=None, copy=None):
+        return self._data.astype(dtype or np.float32)
+
+    def __add__(self, other):
+        return Vector(self._data + np.asarray(other, dtype=np.float32))
+
+    def __sub__(self, other):
+        return Vector(self._data - np.asarray(other, dtype=np.float32))
+
+    def __mul__(self, scalar):
+        return Vector(self._data * np.float32(scalar))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        return Vector(self._data / np.float32(scalar))
+
+    def __eq__(self, other):
+        return np.array_equal(self._data, np.asarray(other, dtype=np.float32))
+
+    def __repr__(self):
+        return f"Vector({tuple(self)})"
+
+
+class Matrix:
+    def __init__(self, rows=None):
+        self._data = np.identity(4, dtype=np.float32) if rows is None else np.array(rows, dtype=np.float32)
+
+    @classmethod
+    def Identity(cls, size: int = 4) -> 'Matrix':
+        return cls(np.identity(size))
+
+    def __array__(self, dtype=None, copy=None):
+        return self._data.astype(dtype or np.float32)
+
+    def __iter__(self):
+        return (Vector(row) for row in self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __matmul__(self, other):
+        if isinstance(other, Matrix):
+            return Matrix(self._data.astype(np.float64) @ other._data)
+        # Vector: float products summed in double per row, stored as float
+        v = np.asarray(other, dtype=np.float32)
+        terms = (self._data[:3, :3] * v[None, :]).astype(np.float64)
+        return Vector(terms.sum(axis=1) + self._data[:3, 3])
+
+
+# === Property collections ===
+
+class Element:
+    """One item of an ElementCollection, e.g. mesh.vertices[i]."""
+
+    def __init__(self, collection: 'ElementCollection', index: int):
+        object.__setattr__(self, '_collection', collection)
+        object.__setattr__(self, 'index', index)
+
+    def __getattr__(self, name):
+        array = self._collection.arrays[name]
+        value = array[self.index]
+        if array.ndim == 1:
+            return value.item()
+        if array.dtype.kind == 'f':
+            return Vector(value)
+        return tuple(value.tolist())
+
+    def __setattr__(self, name, value):
+        self._collection.arrays[name][self.index] = value
+
+
+class ElementCollection:
+    """
+    bpy_prop_collection with one array per attribute. foreach_get and
+    foreach_set require a flat sequence of exactly len * width values.
+    """
+
+    def __init__(self, length: int = 0, **attributes: Tuple[int, type]):
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, (width, dtype) in attributes.items():
+            shape = (length,) if width == 1 else (length, width)
+            self.arrays[name] = np.zeros(shape, dtype=dtype)
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index: int) -> Element:
+        if not -self._length <= index < self._length:
+            raise IndexError(f"index {index} out of range")
+        return Element(self, index % self._length)
+
+    def __iter__(self):
+        return (Element(self, i) for i in range(self._length))
+
+    def add(self, count: int):
+        for name, array in self.arrays.items():
+            grown = np.zeros((self._length + count,) + array.shape[1:], dtype=array.dtype)
+            grown[:self._length] = array
+            self.arrays[name] = grown
+        self._length += count
+
+    def foreach_get(self, attr: str, seq):
+        array = self.arrays[attr]
+        if len(seq) != array.size:
+            raise RuntimeError(f"internal error setting the array: {attr} expects {array.size} values")
+        seq[:] = array.reshape(-1)
+
+    def foreach_set(self, attr: str, seq):
+        array = self.arrays[attr]
+        values = np.asarray(seq)
+        if values.size != array.size:
+            raise RuntimeError(f"internal error setting the array: {attr} expects {array.size} values")
+        array[...] = values.reshape(array.shape)
+
+
+def _vertex_collection(length: int = 0) -> ElementCollection:
+    return ElementCollection(length, co=(3, np.float32), normal=(3, np.float32))
+
+
+# === ID types ===
+
+class UVLayer:
+    def __init__(self, name: str, n_loops: int):
+        self.name = name
+        self.data = ElementCollection(n_loops, uv=(2, np.float32))
+
+
+class UVLayers(list):
+    def __init__(self, mesh: 'Mesh'):
+        super().__init__()
+        self._mesh = mesh
+        self.active: Optional[UVLayer] = None
+
+    def new(self, name: str = 'UVMap') -> UVLayer:
+        layer = UVLayer(name, len(self._mesh.loops))
+        self.append(layer)
+        if self.active is None:
+            self.active = layer
+        return layer
+
+
+class KeyBlock:
+    def __init__(self, name: str, co: np.ndarray):
+        self.name = name
+        self.value = 0.0
+        self.data = ElementCollection(len(co), co=(3, np.float32))
+        self.data.arrays['co'][:] = co
+
+
+class AnimData:
+    def __init__(self):
+        self.action = None
+
+
+class Key:
+    def __init__(self, name: str = 'Key'):
+        self.name = name
+        self.key_blocks: List[KeyBlock] = []
+        self.animation_data: Optional[AnimData] = None
+
+    def animation_data_create(self) -> AnimData:
+        if self.animation_data is None:
+            self.animation_data = AnimData()
+        return self.animation_data
+
+
+class Mesh:
+    def __init__(self, name: str):
+        self.name = name
+        self.vertices = _vertex_collection()
+        self.loops = ElementCollection(vertex_index=(1, np.int32))
+        self.polygons = ElementCollection(loop_start=(1, np.int32), loop_total=(1, np.int32))
+        self.loop_triangles = ElementCollection(loops=(3, np.int32), vertices=(3, np.int32))
+        self.uv_layers = UVLayers(self)
+        self.shape_keys: Optional[Key] = None
+        self.materials = []
+
+    def update(self, calc_edges: bool = False):
+        """Fan-triangulates polygons into loop_triangles and recomputes vertex normals."""
+        starts = self.polygons.arrays['loop_start']
+        totals = self.polygons.arrays['loop_total']
+        if len(totals) and not totals.any():
+            totals[:] = np.diff(np.append(starts, len(self.loops)))
+        tris = [(s, s + k, s + k + 1) for s, n in zip(starts.tolist(), totals.tolist()) for k in range(1, n - 1)]
+        self.loop_triangles = ElementCollection(len(tris), loops=(3, np.int32), vertices=(3, np.int32))
+        if tris:
+            self.loop_triangles.arrays['loops'][:] = tris
+            self.loop_triangles.arrays['vertices'][:] = self.loops.arrays['vertex_index'][tris]
+        self.calc_normals()
+
+    def calc_normals(self):
+        """Angle-weighted vertex normals, as Blender computes them."""
+        co = self.vertices.arrays['co']
+        faces = self.loops.arrays['vertex_index'][self.loop_triangles.arrays['loops']]
+        self.vertices.arrays['normal'][:] = vertex_normals(co, faces, 'ANGLE')
+
+    def evaluated_copy(self, co: np.ndarray) -> 'Mesh':
+        """New mesh sharing this topology, with the given vertex positions."""
+        mesh = Mesh(self.name)
+        mesh.loops, mesh.polygons, mesh.loop_triangles = self.loops, self.polygons, self.loop_triangles
+        mesh.uv_layers = self.uv_layers
+        mesh.vertices = _vertex_collection(len(co))
+        mesh.vertices.arrays['co'][:] = co
+        mesh.calc_normals()
+        return mesh
+
+
+class Object:
+    """
+    animation(frame) -> (nVerts, 3) positions drives the evaluated mesh;
+    without it, the active shape key mix (or the rest mesh) is used.
+    Animated meshes are cached per frame, so repeated exports time the
+    add-on rather than this module.
+    """
+
+    def __init__(self, name: str, object_data: Mesh = None,
+                 animation: Callable[[int], np.ndarray] = None):
+        self.name = name
+        self.data = object_data
+        self.animation = animation
+        self.matrix_world = Matrix()
+        self.modifiers = Modifiers()
+        self.selected = False
+        self._evaluated = None
+        self._frame_cache: Dict[int, Mesh] = {}
+
+    def select_set(self, state: bool):
+        self.selected = state
+
+    def evaluated_get(self, depsgraph: 'Depsgraph') -> 'Object':
+        return self
+
+    def to_mesh(self) -> Mesh:
+        frame = context.scene.frame_current
+        if self.animation is not None:
+            if frame not in self._frame_cache:
+                self._frame_cache[frame] = self.data.evaluated_copy(self.animation(frame))
+            self._evaluated = self._frame_cache[frame]
+        elif self.data.shape_keys is not None:
+            self._evaluated = self.data.evaluated_copy(self._shape_key_mix())
+        else:
+            self._evaluated = self.data.evaluated_copy(self.data.vertices.arrays['co'])
+        return self._evaluated
+
+    def to_mesh_clear(self):
+        self._evaluated = None
+
+    def _shape_key_mix(self) -> np.ndarray:
+        blocks = self.data.shape_keys.key_blocks
+        basis = blocks[0].data.arrays['co']
+        mix = basis.astype(np.float64)
+        for block in blocks[1:]:
+            mix += block.value * (block.data.arrays['co'] - basis)
+        return mix.astype(np.float32)
+
+    def shape_key_add(self, name: str = 'Key', from_mix: bool = True) -> KeyBlock:
+        mesh = self.data
+        if mesh.shape_keys is None:
+            mesh.shape_keys = Key()
+            co = mesh.vertices.arrays['co']
+        elif from_mix:
+            co = self._shape_key_mix()
+        else:
+            co = mesh.shape_keys.key_blocks[0].data.arrays['co']
+        block = KeyBlock(name, co)
+        mesh.shape_keys.key_blocks.append(block)
+        return block
+
+
+class Modifier:
+    def __init__(self, name: str, type: str):
+        self.name = name
+        self.type = type
+        if type == 'CLOTH':
+            self.point_cache = types.SimpleNamespace(
+                use_disk_cache=False, use_external=False, filepath='', name='', index=0)
+
+
+class Modifiers(list):
+    def new(self, name: str, type: str) -> Modifier:
+        modifier = Modifier(name, type)
+        self.append(modifier)
+        return modifier
+
+
+class FCurve:
+    def __init__(self, data_path: str):
+        self.data_path = data_path
+        self.keyframe_points = ElementCollection(
+            co=(2, np.float32),
+            interpolation=(1, np.int32),
+            handle_left_type=(1, np.int32),
+            handle_right_type=(1, np.int32),
+        )
+
+    def update(self):
+        order = np.argsort(self.keyframe_points.arrays['co'][:, 0], kind='stable')
+        for name, array in self.keyframe_points.arrays.items():
+            array[...] = array[order]
+
+
+class FCurves(list):
+    def new(self, data_path: str, index: int = 0) -> FCurve:
+        if any(fc.data_path == data_path for fc in self):
+            raise RuntimeError(f"F-Curve '{data_path}' already exists")
+        fcurve = FCurve(data_path)
+        self.append(fcurve)
+        return fcurve
+
+
+class Action:
+    def __init__(self, name: str):
+        self.name = name
+        self.id_root = 'OBJECT'
+        self.fcurves = FCurves()
+
+
+class Material:
+    def __init__(self, name: str):
+        self.name = name
+        self.mrf_texture_props = types.SimpleNamespace(texture_path='')
+
+
+class _IDCollection(dict):
+    def __init__(self, factory: Callable):
+        super().__init__()
+        self._factory = factory
+
+    def new(self, name: str, *args, **kwargs):
+        item = self._factory(name, *args, **kwargs)
+        self[name] = item
+        return item
+
+
+# === Context ===
+
+class Depsgraph:
+    pass
+
+
+class Scene:
+    def __init__(self):
+        self.frame_current = 1
+        self.frame_start = 1
+        self.frame_end = 250
+        self.render = types.SimpleNamespace(fps=30)
+        self.frame_set_calls = 0
+
+    def frame_set(self, frame: int, subframe: float = 0.0):
+        self.frame_current = frame
+        self.frame_set_calls += 1
+
+
+class _ObjectList(list):
+    def link(self, obj: Object):
+        self.append(obj)
+
+
+class Context:
+    def __init__(self):
+        self.scene = Scene()
+        self.collection = types.SimpleNamespace(objects=_ObjectList())
+        self.view_layer = types.SimpleNamespace(objects=types.SimpleNamespace(active=None))
+        self.preferences = types.SimpleNamespace(edit=types.SimpleNamespace(
+            keyframe_new_interpolation_type='BEZIER',
+            keyframe_new_handle_type='AUTO_CLAMPED',
+        ))
+        self.window_manager = types.SimpleNamespace(popup_menu=lambda draw, title='', icon='NONE': None)
+
+    def evaluated_depsgraph_get(self) -> Depsgraph:
+        return Depsgraph()
+
+
+def _enum(**items: int):
+    return types.SimpleNamespace(enum_items={k: types.SimpleNamespace(identifier=k, value=v) for k, v in items.items()})
+
+
+_HANDLE_TYPES = dict(FREE=0, AUTO=1, VECTOR=2, ALIGNED=3, AUTO_CLAMPED=4)
+_bl_types = types.SimpleNamespace(
+    Object=Object,
+    Mesh=Mesh,
+    MeshPolygon=types.SimpleNamespace(bl_rna=types.SimpleNamespace(properties={
+        'loop_total': types.SimpleNamespace(is_readonly=True),
+    })),
+    Keyframe=types.SimpleNamespace(bl_rna=types.SimpleNamespace(properties={
+        'interpolation': _enum(CONSTANT=0, LINEAR=1, BEZIER=2),
+        'handle_left_type': _enum(**_HANDLE_TYPES),
+        'handle_right_type': _enum(**_HANDLE_TYPES),
+    })),
+)
+
+context = Context()
+
+
+def reset():
+    """Fresh scene and data blocks, e.g. between benchmark cases."""
+    global context
+    context = Context()
+    bpy.context = context
+    bpy.data = types.SimpleNamespace(
+        filepath='',
+        meshes=_IDCollection(Mesh),
+        objects=_IDCollection(Object),
+        materials=_IDCollection(Material),
+        actions=_IDCollection(Action),
+    )
+
+
+bpy = types.ModuleType('bpy')
+bpy.types = _bl_types
+bpy.ops = types.SimpleNamespace(object=types.SimpleNamespace(shade_smooth=lambda: {'FINISHED'}))
+bpy.path = types.SimpleNamespace(
+    abspath=lambda path: os.path.join(os.path.dirname(bpy.data.filepath), path[2:]) if path.startswith('//') else path)
+mathutils = types.ModuleType('mathutils')
+mathutils.Vector = Vector
+mathutils.Matrix = Matrix
+reset()
+
+
+def install():
+    import io_warcraft_mrf  # noqa: F401  (registers nothing while bpy is missing)
+    sys.modules['bpy'] = bpy
+    sys.modules['mathutils'] = mathutils
+
+
+# === Procedural meshes ===
+
+def make_cylinder(n_around: int, n_height: int, name: str = 'Cylinder') -> Object:
+    """
+    Open cylinder of quads with a UV seam where it closes, so corners on
+    the seam have two UVs and deduplication splits them.
+    Animated: the radius ripples and the whole shape twists over time.
+    """
+    angle = np.linspace(0.0, 2 * np.pi, n_around, endpoint=False)
+    height = np.linspace(0.0, 2.0, n_height)
+    rest = np.empty((n_height, n_around, 3), dtype=np.float32)
+    rest[..., 0] = np.cos(angle)[None]
+    rest[..., 1] = np.sin(angle)[None]
+    rest[..., 2] = height[:, None]
+    rest = rest.reshape(-1, 3)
+
+    ring = np.arange(n_around)
+    rows = np.arange(n_height - 1)[:, None] * n_around
+    a = (rows + ring).ravel()
+    b = (rows + (ring + 1) % n_around).ravel()
+    quads = np.column_stack((a, b, b + n_around, a + n_around))
+
+    # UV u runs 0..1 around; the closing column uses u = 1 instead of 0
+    u = (quads % n_around) / n_around
+    u[:, 1:3][u[:, 1:3] == 0] = 1.0
+    v = (quads // n_around) / (n_height - 1)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(rest))
+    mesh.vertices.foreach_set('co', rest.ravel())
+    mesh.loops.add(quads.size)
+    mesh.loops.foreach_set('vertex_index', quads.ravel())
+    mesh.polygons.add(len(quads))
+    mesh.polygons.foreach_set('loop_start', np.arange(0, quads.size, 4))
+    mesh.polygons.foreach_set('loop_total', np.full(len(quads), 4))
+    mesh.update()
+    uv_layer = mesh.uv_layers.new('UVMap')
+    uv_layer.data.foreach_set('uv', np.column_stack((u.ravel(), v.ravel())).ravel())
+
+    theta = np.arctan2(rest[:, 1], rest[:, 0]).astype(np.float64)
+    z = rest[:, 2].astype(np.float64)
+
+    def animation(frame: int) -> np.ndarray:
+        t = frame / 24.0
+        radius = 1.0 + 0.15 * np.sin(4 * z - 3 * t) * np.cos(3 * theta)
+        twist = theta + 0.3 * z * np.sin(t)
+        return np.column_stack((radius * np.cos(twist), radius * np.sin(twist), z)).astype(np.float32)
+
+    obj = bpy.data.objects.new(name, mesh, animation=animation)
+    obj.matrix_world = Matrix([
+        [0.0, -2.0, 0.0, 1.5],
+        [2.0, 0.0, 0.0, -0.5],
+        [0.0, 0.0, 2.0, 0.25],
+        [0.0, 0.0, 0.0, 1.0],
+    ])
+    return obj
+
+
+def bake_cloth(obj: Object, blend_path: str, frames: range):
+    """
+    Adds a Cloth modifier with a disk cache and writes the object's animation
+    as uncompressed .bphys files (world space positions), as Blender would
+    after Bake. bpy.data.filepath is set to blend_path.
+    """
+    bpy.data.filepath = blend_path
+    modifier = obj.modifiers.new('Cloth', 'CLOTH')
+    cache = modifier.point_cache
+    cache.use_disk_cache = True
+    directory = os.path.join(os.path.dirname(blend_path),
+                             'blendcache_' + os.path.splitext(os.path.basename(blend_path))[0])
+    os.makedirs(directory, exist_ok=True)
+
+    matrix = np.asarray(obj.matrix_world)
+    name = ''.join(f'{b:02X}' for b in obj.name.encode('utf-8'))
+    point = np.dtype([('location', '<f4', (3,)), ('velocity', '<f4', (3,)), ('xconst', '<f4', (3,))])
+    for frame in frames:
+        co = obj.animation(frame)
+        # Same float arithmetic as matrix_world @ co
+        terms = (co[:, None, :] * matrix[None, :3, :3]).astype(np.float64)
+        world = terms[..., 0] + terms[..., 1] + terms[..., 2] + matrix[:3, 3].astype(np.float64)
+        points = np.zeros(len(co), dtype=point)
+        points['location'] = world
+        header = np.array([2, len(co), (1 << 1) | (1 << 2) | (1 << 4)], dtype='<u4')
+        with open(os.path.join(directory, f'{name}_{frame:06d}_{cache.index:02d}.bphys'), 'wb') as f:
+            f.write(b'BPHYSICS' + header.tobytes() + points.tobytes())
+    return modifier
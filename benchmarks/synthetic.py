@@ -0,0 +1,73 @@
+"""
+Deterministic synthetic MRF data for benchmarks.
+
+A rectangular cloth grid waving over time, sized by vertex count, frame
+count and (optionally) face count. The same arguments always produce the
+same bytes.
+"""
+
+import math
+
+import numpy as np
+
+from io_warcraft_mrf.core.mrf_utils import ArrayModelData, Header
+
+MAX_VERTS = 0xFFFF
+
+
+def grid_faces(width: int, height: int) -> np.ndarray:
+    idx = np.arange(width * height).reshape(height, width)
+    quads = np.stack((idx[:-1, :-1], idx[1:, :-1], idx[1:, 1:], idx[:-1, 1:]), axis=-1).reshape(-1, 4)
+    return np.vstack((quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]))
+
+
+def make_model(n_verts: int, n_frames: int, n_faces: int = None, seed: int = 0) -> ArrayModelData:
+    """
+    Cloth-like ArrayModelData with n_verts vertices (4 to 65535) and n_frames
+    keyframes. Faces come from the grid; n_faces truncates them or appends
+    random triangles to reach the requested count.
+    """
+    if not 4 <= n_verts <= MAX_VERTS:  # The grid is at least 2x2
+        raise ValueError(f"n_verts must be in [4, {MAX_VERTS}]")
+    rng = np.random.default_rng(seed)
+
+    width = max(2, int(math.sqrt(n_verts)))
+    height = max(2, n_verts // width)
+    faces = grid_faces(width, height)
+    if n_faces is not None:
+        extra = max(0, n_faces - len(faces))
+        faces = np.vstack((faces[:n_faces], rng.integers(0, n_verts, (extra, 3))))
+
+    # Grid vertices first, leftovers (n_verts not a multiple of width) scattered
+    u = np.resize(np.tile(np.linspace(0.0, 1.0, width), height), n_verts)
+    v = np.resize(np.repeat(np.linspace(0.0, 1.0, height), width), n_verts)
+    u[width * height:] = rng.random(n_verts - width * height)
+    v[width * height:] = rng.random(n_verts - width * height)
+
+    t = np.arange(n_frames)[:, None] / 30.0
+    phase = 6.0 * u[None] - 4.0 * t
+    keyframes = np.empty((n_frames, n_verts, 2, 3), dtype=np.float32)
+    keyframes[:, :, 0, 0] = 100.0 * u
+    keyframes[:, :, 0, 1] = 10.0 * np.sin(phase) * v
+    keyframes[:, :, 0, 2] = -150.0 * v
+    normal = np.stack((-np.cos(phase) * 0.6 * v, np.ones_like(phase), np.zeros_like(phase)), axis=-1)
+    keyframes[:, :, 1] = normal / np.linalg.norm(normal, axis=-1, keepdims=True)
+
+    header = Header(
+        nFrames=n_frames,
+        nVerts=n_verts,
+        nIndices=len(faces) * 3,
+        frameDuration=1 / 30,
+        pivot=(0.0, 0.0, 0.0),
+        boundsRadius=0.0,
+        elapsedTime=0.0,
+        debugFlag=0,
+        offsets={},
+    )
+    return ArrayModelData(
+        header=header,
+        texture_path="Textures/white",
+        faces=faces.astype(np.uint16),
+        uvs=np.column_stack((u, v)),
+        keyframes=keyframes,
+    )
@@ -10,10 +10,23 @@ bl_info = {
     "category": "Import-Export",
 }
 
-import bpy
-from .operators.import_operator import ImportMRFOperator
-from .operators.export_operator import ExportMRFOperator
-from .ui.texture_panel import MRFTextureProperties, MATERIAL_PT_mrf_texture
+try:
+    import bpy
+except ImportError:
+    # Imported outside Blender, e.g. for python -m io_warcraft_mrf.core.mrf_utils
+    bpy = None
+
+if bpy is not None:
+    from .operators.import_operator import ImportMRFOperator
+    from .operators.export_operator import ExportMRFOperator
+    from .ui.texture_panel import MRFTextureProperties, MATERIAL_PT_mrf_texture
+
+    classes = (
+        MRFTextureProperties,
+        MATERIAL_PT_mrf_texture,
+        ImportMRFOperator,
+        ExportMRFOperator,
+    )
 
 def menu_func_import(self, context):
     self.layout.operator(ImportMRFOperator.bl_idname, text="Warcraft MORF (.mrf)")
@@ -21,13 +34,6 @@ def menu_func_import(self, context):
 def menu_func_export(self, context):
     self.layout.operator(ExportMRFOperator.bl_idname, text="Warcraft MORF (.mrf)")
 
-classes = (
-    MRFTextureProperties,
-    MATERIAL_PT_mrf_texture,
-    ImportMRFOperator,
-    ExportMRFOperator,
-)
-
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
@@ -1,17 +1,68 @@
 import bpy
+import hashlib
+import numpy as np
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Tuple, List
-from mathutils import Vector
+from pathlib import Path
+from typing import Callable, Dict, Tuple, List, Optional, Sequence
 
 from ..core.mrf_utils.header import Header
-from ..core.mrf_utils.model_data import ModelData
+from ..core.mrf_utils.model_data import ArrayModelData
+from ..core.mrf_utils.weld import weld
+from ..core.mrf_utils.resample import find_resample
+from ..core.mrf_utils.cache_optimizer import optimize as optimize_vertex_cache
+from ..core.mrf_utils.decimate import decimate
+from ..core.mrf_utils.writer import mrf_file_size
+from ..core.mrf_utils.bphys import BPhysCache, cache_name_from_id
+from ..core.mrf_utils.normals import vertex_normals
+from ..core.mrf_utils.profiler import NULL_PROFILER
+
+MAX_VERTS = 0xFFFF  # Face indices are uint16
+MESH_CACHE_SIZE = 8  # Deduplicated meshes kept for re-exports
+
+
+@dataclass
+class VertexTable:
+    """Exported vertices: source mesh vertex index, rest position, normal and UV per row."""
+    index: np.ndarray     # (n,) int64, index into mesh.vertices
+    position: np.ndarray  # (n, 3) float32
+    normal: np.ndarray    # (n, 3) float32
+    uv: np.ndarray        # (n, 2) float32
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def take(self, rows: np.ndarray) -> 'VertexTable':
+        return VertexTable(self.index[rows], self.position[rows], self.normal[rows], self.uv[rows])
+
+    def digest(self) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        for array in (self.index, self.position, self.normal, self.uv):
+            h.update(np.ascontiguousarray(array).data)
+        return h.digest()
+
+
+# Corner table digest -> (vertex table, triangles) of recent deduplications.
+# Re-exporting an unchanged mesh skips np.unique; the arrays are read-only.
+_mesh_cache: 'OrderedDict[bytes, Tuple[VertexTable, np.ndarray]]' = OrderedDict()
+
 
 class MRFExporter:
     def __init__(self, obj: bpy.types.Object, scale_factor: float, texture_path: str, kf_range: Tuple[int, int], elapsed_frame: int, 
                     deduplicate: bool = True, 
                     reverse_keyframes: bool = False, 
                     auto_bounds: bool = False, 
-                    playback_delay: float = 0):
+                    playback_delay: float = 0,
+                    transform_normals: bool = False,
+                    weld_distance: float = 0.0,
+                    weld_angle: float = 0.0,
+                    weld_uv: float = 0.0,
+                    resample_error: float = 0.0,
+                    optimize_cache: bool = False,
+                    decimate_ratio: float = 1.0,
+                    decimate_error: float = 0.0,
+                    source: str = 'SCENE',
+                    profiler=NULL_PROFILER):
         
         self.obj = obj
         self.scale = scale_factor
@@ -23,17 +74,103 @@ class MRFExporter:
         self.reverse_keyframes = reverse_keyframes
         self.auto_bounds = auto_bounds
         self.playback_delay = playback_delay
-
-    def export_to_modeldata(self) -> ModelData:
+        # Normals are exported in object space unless this is set
+        self.transform_normals = transform_normals
+        # Welding is enabled by a positive distance (Blender units)
+        self.weld_distance = weld_distance
+        self.weld_angle = weld_angle
+        self.weld_uv = weld_uv
+        # Resampling to a lower frame rate is enabled by a positive error (Blender units)
+        self.resample_error = resample_error
+        # Reorder triangles/vertices for the post-transform vertex cache
+        self.optimize_cache = optimize_cache
+        # Decimation target (fraction of vertices to keep) and error bound (Blender units, 0 = none)
+        self.decimate_ratio = decimate_ratio
+        self.decimate_error = decimate_error
+        # 'SCENE' evaluates the depsgraph per frame, 'BPHYS' reads the baked cloth cache files
+        self.source = source
+        # Opt-in stage timings (mrf_utils.profiler.Profiler)
+        self.profiler = profiler
+
+        # Filled during export, e.g. for operator reports
+        self.stats = {}
+
+    def export_to_modeldata(self, stream: bool = False) -> ArrayModelData:
+        """
+        With stream=True, keyframes is a generator that evaluates one frame
+        at a time, so MRFWriter can write each keyframe to disk as soon as
+        it is sampled. Stages that need the whole animation disable it.
+        """
         uniq_vertices, triangles_list = self.get_mesh_data()
-        uvs = [tuple(v['uv']) for v in uniq_vertices]
-        nverts = len(uniq_vertices)
 
+        if stream and not self._needs_all_frames():
+            model, uniq_vertices = self.streamed_model(uniq_vertices, triangles_list)
+            model.keyframes = self.iter_keyframes(uniq_vertices)
+            return model
+
+        keyframes, duration = self.get_keyframes(uniq_vertices)
+        return self.process_keyframes(uniq_vertices, triangles_list, keyframes, duration)[0]
+
+    def streamed_model(self, vertex_table: VertexTable, triangles: np.ndarray) -> Tuple[ArrayModelData, VertexTable]:
+        """
+        Model whose keyframes are produced one at a time (keyframes is left
+        None for the caller to fill), and the vertex table to sample them
+        with: optimize_cache reorders it. Only valid without whole-animation
+        stages (see _needs_all_frames).
+        """
+        if self.optimize_cache:
+            with self.profiler.stage('optimize_cache'):
+                vertex_table, triangles, _ = self._optimize_cache(vertex_table, triangles, stats=self.stats)
+        duration = self.get_frame_duration()
+        n_frames = self.kf_end - self.kf_start + 1
+        model = self._build_model(vertex_table, triangles, None, n_frames, duration,
+                                  self._calculate_elapsed_time(duration))
+        return model, vertex_table
+
+    def export_lods(self, lod_ratios: Sequence[float]) -> List[ArrayModelData]:
+        """
+        Main model followed by one decimated model per ratio (of the main
+        model's vertex count), all from a single frame evaluation pass.
+        """
+        uniq_vertices, triangles_list = self.get_mesh_data()
         keyframes, duration = self.get_keyframes(uniq_vertices)
+        return self.process_keyframes(uniq_vertices, triangles_list, keyframes, duration, lod_ratios)
 
+    def process_keyframes(self, vertex_table: VertexTable, triangles: np.ndarray, keyframes: np.ndarray,
+                          duration: float, lod_ratios: Sequence[float] = ()) -> List[ArrayModelData]:
+        """Runs the whole-animation stages on captured keyframes and builds the models."""
+        # Elapsed time is in seconds of the source animation, resampling keeps it
         elapsed_time = self._calculate_elapsed_time(duration)
 
-        base_vertices = [v['position'] for v in uniq_vertices]
+        if self.weld_distance > 0:
+            with self.profiler.stage('weld'):
+                vertex_table, triangles, keyframes = self._weld(vertex_table, triangles, keyframes)
+
+        with self.profiler.stage('decimate'):
+            levels = self._decimate(vertex_table, triangles, keyframes, lod_ratios)
+
+        models = []
+        for i, (table, faces, frames) in enumerate(levels):
+            stats = self.stats if i == 0 else self.stats.setdefault('lods', [{} for _ in lod_ratios])[i - 1]
+            level_duration = duration
+            if self.optimize_cache:
+                with self.profiler.stage('optimize_cache'):
+                    table, faces, frames = self._optimize_cache(table, faces, frames, stats=stats)
+            if self.resample_error > 0:
+                with self.profiler.stage('resample'):
+                    frames, level_duration = self._resample(frames, duration, faces.size, stats=stats)
+            stats['verts'] = len(table)
+            models.append(self._build_model(table, faces, frames, len(frames), level_duration, elapsed_time))
+        return models
+
+    def _build_model(self, vertex_table: VertexTable, triangles: np.ndarray, keyframes, n_frames: int,
+                     duration: float, elapsed_time: float) -> ArrayModelData:
+        uvs = vertex_table.uv.astype(np.float64)
+        nverts = len(vertex_table)
+        if nverts > MAX_VERTS:
+            raise ValueError(f"Too many vertices: {nverts} (MRF supports at most {MAX_VERTS})")
+
+        base_vertices = vertex_table.position
 
         pivot = (0.0, 0.0, 0.0)
         bounds_radius = 0.0
@@ -43,9 +180,9 @@ class MRFExporter:
             bounds_radius = self._compute_bounds_radius(base_vertices, pivot)
 
         header = Header(
-            nFrames=len(keyframes),
+            nFrames=n_frames,
             nVerts=nverts,
-            nIndices=len(triangles_list) * 3,
+            nIndices=len(triangles) * 3,
             frameDuration=duration,
             pivot=pivot,  
             boundsRadius=bounds_radius,
@@ -54,10 +191,10 @@ class MRFExporter:
             offsets={},
         )
 
-        model = ModelData(
+        model = ArrayModelData(
             header=header,
             texture_path=self.texture_path,
-            faces=triangles_list,
+            faces=triangles.astype(np.uint16),
             uvs=uvs,
             keyframes=keyframes
         )
@@ -68,73 +205,159 @@ class MRFExporter:
         mesh = self.obj.data
         uv_layer = mesh.uv_layers.active.data
 
-        if self.deduplicate:
-            return self._get_deduplicated_mesh(mesh, uv_layer)
-        else:
-            return self._get_raw_mesh(mesh, uv_layer)
-
-    def _get_vertex_key(self, vert, uv) -> Tuple:
-        return (
-            round(vert.co.x, 6), round(vert.co.y, 6), round(vert.co.z, 6),
-            round(vert.normal.x, 6), round(vert.normal.y, 6), round(vert.normal.z, 6),
-            round(uv.x, 6), round(uv.y, 6)
+        with self.profiler.stage('mesh_data'):
+            if self.deduplicate:
+                return self._get_deduplicated_mesh(mesh, uv_layer)
+            else:
+                return self._get_raw_mesh(mesh, uv_layer)
+
+    def _read_corners(self, mesh, uv_layer) -> VertexTable:
+        """One row per triangle corner, in mesh.loop_triangles order."""
+        tri_loops = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('loops', tri_loops)
+
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', loop_verts)
+
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        normals = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+        mesh.vertices.foreach_get('normal', normals)
+
+        uv = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.foreach_get('uv', uv)
+
+        verts = loop_verts[tri_loops]
+        return VertexTable(
+            index=verts.astype(np.int64),
+            position=co.reshape(-1, 3)[verts],
+            normal=normals.reshape(-1, 3)[verts],
+            uv=uv.reshape(-1, 2)[tri_loops],
         )
 
-    def _make_vert_info(self, vert, uv) -> dict:
-        return {
-            'index': vert.index,
-            'position': vert.co.copy(),
-            'normal': vert.normal.copy(),
-            'uv': uv.copy()
-        }
-
     def _get_deduplicated_mesh(self, mesh, uv_layer):
-        vertex_map = {}
-        uniq_vertices = []
-        triangles = []
-
-        for tri in mesh.loop_triangles:
-            triangle = []
-            for loop_index in tri.loops:
-                loop = mesh.loops[loop_index]
-                vert = mesh.vertices[loop.vertex_index]
-                uv = uv_layer[loop.index].uv
-
-                key = self._get_vertex_key(vert, uv)
-                if key not in vertex_map:
-                    vertex_map[key] = len(uniq_vertices)
-                    uniq_vertices.append(self._make_vert_info(vert, uv))
-
-                triangle.append(vertex_map[key])
-            triangles.append(tuple(triangle))
-
+        """
+        Merges corners whose position, normal and UV match to 6 decimal places.
+        Keys are quantized with rint(x * 1e6), so one np.unique pass builds the
+        vertex table and the remapped triangles. Vertices keep first-use order,
+        as in a loop over mesh.loop_triangles.
+        rint of the scaled value is not Python's round(x, 6): values at a
+        rounding tie or within float precision of one can land in the other
+        bucket, so such corners may be merged or split differently.
+        """
+        corners = self._read_corners(mesh, uv_layer)
+        if len(corners) == 0:
+            return corners, np.empty((0, 3), dtype=np.int64)
+
+        key = corners.digest()
+        if key in _mesh_cache:
+            _mesh_cache.move_to_end(key)
+            return _mesh_cache[key]
+
+        values = np.hstack((corners.position, corners.normal, corners.uv)).astype(np.float64)
+        keys = np.rint(values * 1e6).astype(np.int64)
+
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        # np.unique sorts keys; renumber unique rows by first occurrence
+        order = np.argsort(first, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+
+        uniq_vertices = corners.take(first[order])
+        triangles = rank[inverse].reshape(-1, 3)
+
+        for array in (uniq_vertices.index, uniq_vertices.position, uniq_vertices.normal, uniq_vertices.uv, triangles):
+            array.setflags(write=False)
+        _mesh_cache[key] = uniq_vertices, triangles
+        if len(_mesh_cache) > MESH_CACHE_SIZE:
+            _mesh_cache.popitem(last=False)
         return uniq_vertices, triangles
 
     def _get_raw_mesh(self, mesh, uv_layer):
-        uniq_vertices = []
-        triangles = []
-
-        for tri in mesh.loop_triangles:
-            triangle = []
-            for loop_index in tri.loops:
-                loop = mesh.loops[loop_index]
-                vert = mesh.vertices[loop.vertex_index]
-                uv = uv_layer[loop.index].uv
-
-                index = len(uniq_vertices)
-                uniq_vertices.append(self._make_vert_info(vert, uv))
-                triangle.append(index)
-            triangles.append(tuple(triangle))
-
+        uniq_vertices = self._read_corners(mesh, uv_layer)
+        triangles = np.arange(len(uniq_vertices)).reshape(-1, 3)
         return uniq_vertices, triangles
-    
-    def _compute_pivot(self, vertices: List[Vector]) -> Tuple[float, float, float]:
-        center = sum((Vector(v) for v in vertices), Vector()) / len(vertices)
-        return tuple(center * self.scale)
 
-    def _compute_bounds_radius(self, vertices: List[Vector], pivot: Tuple[float, float, float]) -> float:
-        pivot_vec = Vector(pivot)
-        return max((Vector(v) * self.scale - pivot_vec).length for v in vertices)
+    def _needs_all_frames(self) -> bool:
+        # Stages that work on the whole animation disable streaming
+        return self.weld_distance > 0 or self.resample_error > 0 or self._decimates()
+
+    def _decimates(self) -> bool:
+        return self.decimate_ratio < 1.0 or self.decimate_error > 0
+
+    def _weld(self, vertex_table: VertexTable, triangles: np.ndarray, keyframes: np.ndarray):
+        result = weld(keyframes, triangles, vertex_table.uv.astype(np.float64),
+                      distance=self.weld_distance * self.scale,
+                      normal_angle=self.weld_angle,
+                      uv_tolerance=self.weld_uv)
+
+        n_frames = len(keyframes)
+        size_before = mrf_file_size(n_frames, len(vertex_table), triangles.size, self.texture_path)
+        size_after = mrf_file_size(n_frames, int(result.keep.sum()), result.faces.size, self.texture_path)
+        self.stats['weld_vertices'] = result.removed
+        self.stats['weld_bytes'] = size_before - size_after
+
+        return vertex_table.take(result.keep), result.faces, keyframes[:, result.keep]
+
+    def _decimate(self, vertex_table: VertexTable, triangles: np.ndarray, keyframes: np.ndarray,
+                  lod_ratios: Sequence[float]):
+        """(table, faces, keyframes) for the main model and every LOD, in one progressive pass."""
+        main = (vertex_table, triangles, keyframes)
+        if not self._decimates() and not lod_ratios:
+            return [main]
+
+        n_verts = len(vertex_table)
+        main_target = int(n_verts * self.decimate_ratio) if self._decimates() else n_verts
+        targets = [main_target] + [int(main_target * ratio) for ratio in lod_ratios]
+        # The error bound only limits the main model, LODs go down to their targets
+        levels = decimate(keyframes, triangles, targets, self.decimate_error * self.scale)
+
+        result = []
+        for i, level in enumerate(levels):
+            if i == 0 and not self._decimates():
+                result.append(main)
+                continue
+            result.append((vertex_table.take(level.keep), level.faces, keyframes[:, level.keep]))
+
+        if self._decimates():
+            self.stats['decimate_before'] = n_verts
+            self.stats['decimate_error'] = levels[0].error / self.scale
+        return result
+
+    def _optimize_cache(self, vertex_table: VertexTable, triangles: np.ndarray, keyframes: np.ndarray = None,
+                        stats: dict = None):
+        """Same vertex permutation for the table (uvs, sampling map) and any captured keyframes."""
+        result = optimize_vertex_cache(triangles, len(vertex_table))
+        stats['acmr_before'] = result.acmr_before
+        stats['acmr_after'] = result.acmr_after
+
+        order = result.vertex_order
+        if keyframes is not None:
+            keyframes = keyframes[:, order]
+        return vertex_table.take(order), result.faces, keyframes
+
+    def _resample(self, keyframes: np.ndarray, duration: float, n_indices: int, stats: dict):
+        result = find_resample(keyframes, duration, self.resample_error * self.scale)
+
+        n_verts = keyframes.shape[1]
+        size_before = mrf_file_size(len(keyframes), n_verts, n_indices, self.texture_path)
+        size_after = mrf_file_size(len(result.keyframes), n_verts, n_indices, self.texture_path)
+        stats['resample_fps'] = 1.0 / result.frame_duration
+        stats['resample_frames'] = len(result.keyframes)
+        stats['resample_error'] = result.max_error / self.scale
+        stats['resample_bytes'] = size_before - size_after
+
+        return result.keyframes, result.frame_duration
+
+    def _compute_pivot(self, vertices: np.ndarray) -> Tuple[float, float, float]:
+        center = np.asarray(vertices, dtype=np.float64).mean(axis=0)
+        return tuple(float(c) for c in center * self.scale)
+
+    def _compute_bounds_radius(self, vertices: np.ndarray, pivot: Tuple[float, float, float]) -> float:
+        offsets = np.asarray(vertices, dtype=np.float64) * self.scale - np.asarray(pivot)
+        return float(np.linalg.norm(offsets, axis=1).max())
     
     def _calculate_elapsed_time(self, duration: float) -> float:
         if self.playback_delay > 0.0:
@@ -150,33 +373,275 @@ class MRFExporter:
         return max(0.0, offset * duration)
 
 
-    def get_keyframes(self, vertex_list):
-        scene = bpy.context.scene
-        old_frame = scene.frame_current
-        fps = scene.render.fps
-        duration = 1.0 / fps
+    def get_frame_duration(self) -> float:
+        return 1.0 / bpy.context.scene.render.fps
 
-        keyframes = []
+    def get_keyframes(self, vertex_table: VertexTable):
+        n_frames = self.kf_end - self.kf_start + 1
+        keyframes = np.empty((n_frames, len(vertex_table), 2, 3), dtype=np.float32)
+        for i, frame in enumerate(self.iter_keyframes(vertex_table)):
+            keyframes[i] = frame
+        return keyframes, self.get_frame_duration()
 
+    def _frame_range(self):
         frame_range = range(self.kf_start, self.kf_end + 1)
         if self.reverse_keyframes:
             frame_range = reversed(frame_range)
+        return frame_range
 
-        for frame in frame_range:
-            scene.frame_set(frame)
-            depsgraph = bpy.context.evaluated_depsgraph_get()
-            eval_obj = self.obj.evaluated_get(depsgraph)
-            mesh = eval_obj.to_mesh()
+    def iter_keyframes(self, vertex_table: VertexTable):
+        """Yields one (nVerts, 2, 3) float32 keyframe per exported frame."""
+        if self.source == 'BPHYS':
+            yield from self.iter_cache_keyframes(vertex_table)
+            return
 
-            frame_data = []
-            for vert_info in vertex_list:
-                v = mesh.vertices[vert_info['index']]
-                pos = tuple((self.obj.matrix_world @ v.co) * self.scale)
-                norm = tuple(v.normal)
-                frame_data.append((pos, norm))
-
-            keyframes.append(frame_data)
-            eval_obj.to_mesh_clear()
-
-        scene.frame_set(old_frame)
-        return keyframes, duration
\ No newline at end of file
+        scene = bpy.context.scene
+        old_frame = scene.frame_current
+        index_map = vertex_table.index
+
+        profiler = self.profiler
+        try:
+            for frame in self._frame_range():
+                with profiler.stage('frame_set'):
+                    scene.frame_set(frame)
+                with profiler.stage('to_mesh'):
+                    co, normals, matrix = _read_evaluated(self.obj, bpy.context.evaluated_depsgraph_get())
+                with profiler.stage('sample'):
+                    keyframe = self._sample_frame(co, normals, index_map, matrix)
+                yield keyframe
+        finally:
+            scene.frame_set(old_frame)
+
+    def _keyframe_index(self, frame: int) -> int:
+        """Position of a scene frame in the exported keyframes."""
+        return self.kf_end - frame if self.reverse_keyframes else frame - self.kf_start
+
+    def _sample_frame(self, co: np.ndarray, normals: np.ndarray, index_map: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        frame = np.empty((len(index_map), 2, 3), dtype=np.float32)
+        pos = co[index_map]
+
+        # Same arithmetic as mathutils' (matrix_world @ v.co) * scale:
+        # float products summed in double per row, rounded to float, then scaled in float.
+        terms = (pos[:, None, :] * matrix[None, :3, :3]).astype(np.float64)
+        world = terms[..., 0] + terms[..., 1] + terms[..., 2] + matrix[:3, 3].astype(np.float64)
+        frame[:, 0] = world.astype(np.float32) * np.float32(self.scale)
+
+        if self.transform_normals:
+            normal_matrix = np.linalg.inv(matrix[:3, :3].astype(np.float64)).T
+            world_normals = normals[index_map] @ normal_matrix.T
+            lengths = np.linalg.norm(world_normals, axis=1, keepdims=True)
+            frame[:, 1] = world_normals / np.where(lengths > 0, lengths, 1.0)
+        else:
+            frame[:, 1] = normals[index_map]
+        return frame
+
+    # === Baked cloth cache ===
+
+    def find_cloth_cache(self) -> BPhysCache:
+        """Locates the disk cache of the object's Cloth modifier, as Blender names its files."""
+        modifier = next((m for m in self.obj.modifiers if m.type == 'CLOTH'), None)
+        if modifier is None:
+            raise ValueError(f"'{self.obj.name}' has no Cloth modifier")
+        cache = modifier.point_cache
+        if not cache.use_disk_cache:
+            raise ValueError("Enable 'Disk Cache' in the cloth cache settings and bake again")
+
+        if cache.use_external:
+            index = cache.index if cache.index >= 0 else None
+            return BPhysCache(bpy.path.abspath(cache.filepath), cache.name, index)
+
+        if not bpy.data.filepath:
+            raise ValueError("Save the .blend file first: disk caches are stored next to it")
+        blend = Path(bpy.data.filepath)
+        name = cache.name or cache_name_from_id(self.obj.name)
+        return BPhysCache(str(blend.parent / f"blendcache_{blend.stem}"), name, cache.index)
+
+    def iter_cache_keyframes(self, vertex_table: VertexTable):
+        """
+        Reads positions straight from the baked .bphys files instead of
+        evaluating the scene, and recomputes normals from the mesh faces
+        (angle-weighted, like Blender's).
+        Cached positions are in world space, so only the scale is applied;
+        normals are rotated back to object space unless transform_normals.
+        The cache must hold one point per mesh vertex (no topology-changing
+        modifiers before Cloth); modifiers after Cloth are not applied.
+        """
+        cache = self.find_cloth_cache()
+        mesh = self.obj.data
+        n_verts = len(mesh.vertices)
+        faces = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', faces)
+        faces = faces.reshape(-1, 3)
+
+        index_map = vertex_table.index
+        rotation = np.array(self.obj.matrix_world, dtype=np.float64)[:3, :3]
+        scale = np.float32(self.scale)
+
+        profiler = self.profiler
+        for frame in self._frame_range():
+            with profiler.stage('cache_read'):
+                co = cache.read_locations(frame)
+            if len(co) != n_verts:
+                raise ValueError(f"Cache frame {frame} has {len(co)} points, the mesh has {n_verts} vertices")
+            with profiler.stage('normals'):
+                normals = vertex_normals(co, faces, 'ANGLE')[index_map]
+                if not self.transform_normals:
+                    # World -> object space for normals: n_obj = M^T n_world
+                    normals = normals @ rotation
+                    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+                    normals /= np.where(lengths > 0, lengths, 1.0)
+
+            keyframe = np.empty((len(index_map), 2, 3), dtype=np.float32)
+            keyframe[:, 0] = co[index_map] * scale
+            keyframe[:, 1] = normals
+            yield keyframe
+
+
+def _read_evaluated(obj: bpy.types.Object, depsgraph) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(nVerts, 3) positions and normals of the evaluated mesh, and the world matrix."""
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    size = len(mesh.vertices) * 3
+    co = np.empty(size, dtype=np.float32)
+    normals = np.empty(size, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    mesh.vertices.foreach_get('normal', normals)
+    eval_obj.to_mesh_clear()
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    return co.reshape(-1, 3), normals.reshape(-1, 3), matrix
+
+
+class ExportJob:
+    """
+    Exports several objects and/or clips (one MRFExporter each; clips of one
+    object are exporters sharing obj with different kf_range) with a single
+    scene evaluation per frame over the union of their ranges: each frame is
+    set once, every object is read once from that evaluation and sampled
+    into every clip that contains the frame. Baked cache exporters read one
+    keyframe per step after the scene frames.
+
+    The work is split into steps so that a caller can return to Blender's
+    event loop between them (see the modal export operator): step() until
+    finished, then finish() for the models, or cancel() to stop early.
+    Both restore the scene's current frame.
+
+    With stream, exporters without whole-animation stages (weld, resample,
+    decimation, LODs) do not keep their keyframes: streamed maps their
+    index to the model (header, faces and UVs, keyframes None) and the
+    caller sets sinks[index] to a callable(keyframe_index, keyframe), e.g.
+    MRFWriter.put_keyframe, that receives each keyframe as it is sampled.
+    """
+
+    def __init__(self, exporters: Sequence[MRFExporter], lod_ratios: Sequence[float] = (),
+                 stream: bool = False):
+        self.exporters = list(exporters)
+        self.lod_ratios = lod_ratios
+        self.profiler = self.exporters[0].profiler if self.exporters else NULL_PROFILER
+        self.mesh_data = [exporter.get_mesh_data() for exporter in self.exporters]
+        self.keyframes: List[Optional[np.ndarray]] = []
+        self.streamed: Dict[int, ArrayModelData] = {}
+        self.sinks: Dict[int, Callable[[int, np.ndarray], None]] = {}
+
+        self._scene_jobs = []
+        self._cache_jobs = []  # (exporter index, keyframe generator), read in turn
+        self._n_frames = []
+        for i, exporter in enumerate(self.exporters):
+            table, triangles = self.mesh_data[i]
+            n_frames = exporter.kf_end - exporter.kf_start + 1
+            self._n_frames.append(n_frames)
+            if stream and not exporter._needs_all_frames() and not lod_ratios:
+                self.streamed[i], table = exporter.streamed_model(table, triangles)
+                self.mesh_data[i] = table, triangles
+                self.keyframes.append(None)
+            else:
+                self.keyframes.append(np.empty((n_frames, len(table), 2, 3), dtype=np.float32))
+            if exporter.source == 'BPHYS':
+                # Point cache exporters do not need the scene
+                self._cache_jobs.append((i, exporter.iter_cache_keyframes(table)))
+            else:
+                self._scene_jobs.append(i)
+
+        self.frames = sorted({f for i in self._scene_jobs
+                              for f in range(self.exporters[i].kf_start, self.exporters[i].kf_end + 1)})
+        self.n_steps = len(self.frames) + sum(self._n_frames[i] for i, _ in self._cache_jobs)
+        self.done = 0
+        self._cache_read = 0  # Keyframes read from the current cache job
+
+        self.scene = bpy.context.scene
+        self.old_frame = self.scene.frame_current
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.n_steps
+
+    def step(self):
+        """Evaluates the next scene frame, or reads the next cached keyframe."""
+        if self.done < len(self.frames):
+            self._evaluate_frame(self.frames[self.done])
+        else:
+            i, keyframes = self._cache_jobs[0]
+            self._store(i, self._cache_read, next(keyframes))
+            self._cache_read += 1
+            if self._cache_read == self._n_frames[i]:
+                keyframes.close()
+                self._cache_jobs.pop(0)
+                self._cache_read = 0
+        self.done += 1
+
+    def _evaluate_frame(self, frame: int):
+        profiler = self.profiler
+        with profiler.stage('frame_set'):
+            self.scene.frame_set(frame)
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        # Clips active at this frame, grouped by object so each is read once
+        active = {}
+        for i in self._scene_jobs:
+            if self.exporters[i].kf_start <= frame <= self.exporters[i].kf_end:
+                active.setdefault(self.exporters[i].obj.name, []).append(i)
+        for jobs in active.values():
+            with profiler.stage('to_mesh'):
+                co, normals, matrix = _read_evaluated(self.exporters[jobs[0]].obj, depsgraph)
+            with profiler.stage('sample'):
+                for i in jobs:
+                    exporter = self.exporters[i]
+                    self._store(i, exporter._keyframe_index(frame), exporter._sample_frame(
+                        co, normals, self.mesh_data[i][0].index, matrix))
+
+    def _store(self, i: int, index: int, keyframe: np.ndarray):
+        if i in self.streamed:
+            self.sinks[i](index, keyframe)
+        else:
+            self.keyframes[i][index] = keyframe
+
+    def cancel(self):
+        for _, keyframes in self._cache_jobs:
+            keyframes.close()
+        self._cache_jobs = []
+        self.scene.frame_set(self.old_frame)
+
+    def finish(self) -> List[Optional[List[ArrayModelData]]]:
+        """
+        The models of each exporter as export_lods would return them (main
+        model, then LODs); None for streamed exporters, whose keyframes
+        have all gone to their sink.
+        """
+        if not self.finished:
+            raise RuntimeError(f"Export finished after {self.done} of {self.n_steps} steps")
+        self.scene.frame_set(self.old_frame)
+        return [None if i in self.streamed else
+                exporter.process_keyframes(table, triangles, self.keyframes[i], exporter.get_frame_duration(),
+                                           self.lod_ratios)
+                for i, (exporter, (table, triangles)) in enumerate(zip(self.exporters, self.mesh_data))]
+
+
+def export_batch(exporters: Sequence[MRFExporter],
+                 lod_ratios: Sequence[float] = ()) -> List[List[ArrayModelData]]:
+    """Runs an ExportJob to completion."""
+    job = ExportJob(exporters, lod_ratios)
+    try:
+        while not job.finished:
+            job.step()
+    except BaseException:
+        job.cancel()
+        raise
+    return job.finish()
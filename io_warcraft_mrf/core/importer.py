@@ -1,31 +1,46 @@
 import bpy
-from mathutils import Vector
+import numpy as np
 from ..utils.message_box import MessageBox
+from .mrf_utils.point_cache import write_point_cache
+from .mrf_utils.profiler import NULL_PROFILER
 
 
 class MRFImporter:
-    def __init__(self, model_data, divisor=1.0, shadesmooth=True):
+    def __init__(self, model_data, divisor=1.0, shadesmooth=True, cache_path=None, cache_format='PC2',
+                 profiler=NULL_PROFILER):
         self.model_data = model_data
+        self.profiler = profiler
         self.divisor = divisor
         self.shadesmooth = shadesmooth
+        # If set, animation goes to a point cache sidecar + Mesh Cache modifier instead of shape keys
+        self.cache_path = cache_path
+        self.cache_format = cache_format
 
     def import_model(self):
         data = self.model_data
         header = data.header
 
-        keyframes = [
-            [vertex[0] for vertex in frame]  #! Skip normals
-            for frame in data.keyframes
-        ]
-        
-        obj = self.create_mesh(
-            verts=keyframes,
-            faces=data.faces,
-            uv=data.uvs,
-            pivot=header.pivot,
-            filename="MRF_Object"
-        )
-        self.set_material(obj, data.texture_path)
+        # (nFrames, nVerts, 3) positions, works for list and array backed ModelData
+        keyframes = np.asarray(data.keyframes, dtype=np.float32).reshape(header.nFrames, header.nVerts, 2, 3)
+        keyframes = keyframes[:, :, 0]  #! Skip normals
+
+        with self.profiler.stage('create_mesh'):
+            obj = self.create_mesh(
+                verts=keyframes,
+                faces=data.faces,
+                uv=data.uvs,
+                pivot=header.pivot,
+                filename="MRF_Object"
+            )
+        if self.cache_path:
+            with self.profiler.stage('create_mesh_cache'):
+                self.create_mesh_cache(obj, keyframes, header.frameDuration)
+        else:
+            with self.profiler.stage('create_shapeanim'):
+                self.create_shapeanim(obj, keyframes)
+
+        with self.profiler.stage('set_material'):
+            self.set_material(obj, data.texture_path)
         MessageBox.show(data.texture_path, "MRF Texture path:", 'TEXTURE')
 
         # Scene settings
@@ -51,39 +66,110 @@ class MRFImporter:
         bpy.context.view_layer.objects.active = obj
         obj.select_set(True)
 
-        mesh.from_pydata(
-            [Vector(v) / self.divisor for v in verts[0]],
-            [],
-            faces
-        )
-        mesh.update()
+        # Bulk construction: one foreach_set per attribute instead of from_pydata
+        faces = np.asarray(faces, dtype=np.int32).reshape(-1, 3)
+        loop_verts = faces.ravel()
+        n_faces = len(faces)
+
+        coords = verts[0] / np.float32(self.divisor)
+        mesh.vertices.add(len(coords))
+        mesh.vertices.foreach_set('co', coords.ravel())
+
+        mesh.loops.add(len(loop_verts))
+        mesh.loops.foreach_set('vertex_index', loop_verts)
 
+        mesh.polygons.add(n_faces)
+        mesh.polygons.foreach_set('loop_start', np.arange(0, n_faces * 3, 3, dtype=np.int32))
+        if not bpy.types.MeshPolygon.bl_rna.properties['loop_total'].is_readonly:
+            # Derived from loop_start in newer Blender versions
+            mesh.polygons.foreach_set('loop_total', np.full(n_faces, 3, dtype=np.int32))
+        mesh.update(calc_edges=True)
+
+        # Per-loop UVs gathered through the loop -> vertex index array
+        uv = np.asarray(uv, dtype=np.float32).reshape(-1, 2)
         uv_layer = mesh.uv_layers.new(name='New UV Map')
-        for poly in mesh.polygons:
-            for loop_index in poly.loop_indices:
-                loop = mesh.loops[loop_index]
-                uv_layer.data[loop.index].uv = uv[loop.vertex_index]
+        uv_layer.data.foreach_set('uv', uv[loop_verts].ravel())
 
         if self.shadesmooth:
             bpy.ops.object.shade_smooth()
 
-        self.create_shapeanim(obj, verts)
         return obj
 
+    def create_mesh_cache(self, obj, verts, frame_duration):
+        """
+        Writes the positions to a .pc2/.mdd sidecar and plays them back with a
+        Mesh Cache modifier, which reads one frame at a time from disk.
+        Scene frame n shows keyframe n-1, as with the shape key animation.
+        """
+        divisor = np.float32(self.divisor)
+        write_point_cache(
+            self.cache_path,
+            (frame / divisor for frame in verts),
+            n_points=verts.shape[1],
+            n_frames=len(verts),
+            fmt=self.cache_format,
+            frame_duration=frame_duration,
+        )
+
+        modifier = obj.modifiers.new(name="MRF Cache", type='MESH_CACHE')
+        modifier.cache_format = self.cache_format
+        modifier.filepath = self.cache_path
+        modifier.time_mode = 'FRAME'
+        modifier.play_mode = 'SCENE'
+        modifier.frame_start = 1.0
+
     def create_shapeanim(self, obj, verts):
-        for frame, vertices in enumerate(verts):
-            shape_key = obj.shape_key_add(name=f"Frame{frame+1}")
-            for i, coord in enumerate(vertices):
-                shape_key.data[i].co = Vector(coord) / self.divisor
-
-            shape_key.value = 0.0
-            if frame != 0: # Position 0 is reserved
-                shape_key.keyframe_insert(data_path="value", frame=frame)
-                shape_key.value = 1.0
-                shape_key.keyframe_insert(data_path="value", frame=frame+1)
-            if frame < len(verts) - 1:
-                shape_key.value = 0.0
-                shape_key.keyframe_insert(data_path="value", frame=frame+2)
+        """
+        One shape key per frame, switched on and off by the keys' value:
+        Frame{n} is 0 at frame n-1, 1 at frame n and 0 again at frame n+1.
+        Coordinates are written with foreach_set and the F-curves are built
+        directly on a new Action instead of calling keyframe_insert.
+        """
+        n_frames = len(verts)
+        for frame in range(n_frames):
+            with self.profiler.stage('shapeanim.shape_key'):
+                shape_key = obj.shape_key_add(name=f"Frame{frame+1}", from_mix=False)
+                shape_key.data.foreach_set('co', (verts[frame] / np.float32(self.divisor)).ravel())
+                # Value left by the keyframe_insert sequence (overridden by animation)
+                shape_key.value = 1.0 if frame != 0 and frame == n_frames - 1 else 0.0
+
+        shape_keys = obj.data.shape_keys
+        if shape_keys is None:
+            return
+
+        anim_data = shape_keys.animation_data_create()
+        action = bpy.data.actions.new(name=f"{shape_keys.name}Action")
+        action.id_root = 'KEY'
+        anim_data.action = action
+
+        prefs = bpy.context.preferences.edit
+        keyframe_rna = bpy.types.Keyframe.bl_rna.properties
+        interpolation = keyframe_rna['interpolation'].enum_items[prefs.keyframe_new_interpolation_type].value
+        handle_type = keyframe_rna['handle_left_type'].enum_items[prefs.keyframe_new_handle_type].value
+
+        for frame, key_block in enumerate(shape_keys.key_blocks):
+            points = self._get_switch_keyframes(frame, n_frames)
+            if not points:
+                continue
+
+            fcurve = action.fcurves.new(data_path=f'key_blocks["{key_block.name}"].value')
+            keyframe_points = fcurve.keyframe_points
+            keyframe_points.add(len(points))
+            keyframe_points.foreach_set('co', np.array(points, dtype=np.float32).ravel())
+            keyframe_points.foreach_set('interpolation', np.full(len(points), interpolation, dtype=np.int32))
+            keyframe_points.foreach_set('handle_left_type', np.full(len(points), handle_type, dtype=np.int32))
+            keyframe_points.foreach_set('handle_right_type', np.full(len(points), handle_type, dtype=np.int32))
+            fcurve.update()
+
+    def _get_switch_keyframes(self, frame: int, n_frames: int):
+        # (frame, value) points of the on/off stepping for one shape key
+        points = []
+        if frame != 0: # Position 0 is reserved
+            points.append((frame, 0.0))
+            points.append((frame + 1, 1.0))
+        if frame < n_frames - 1:
+            points.append((frame + 2, 0.0))
+        return points
 
     def _get_start_frame(self, elapsed_time: float, frame_duration: float, n_frames: int) -> int:
         # Convert elapsed time to Blender frame index, clamped to [1, nFrames - 1]
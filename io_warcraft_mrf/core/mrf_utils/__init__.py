@@ -1,11 +1,14 @@
 from .header import Header
-from .model_data import ModelData
+from .model_data import ModelData, ArrayModelData
 from .parser import MRFParser
+from .reader import MRFReader
 from .writer import MRFWriter
 
 __all__ = [
     "Header",
     "ModelData",
+    "ArrayModelData",
     "MRFParser",
+    "MRFReader",
     "MRFWriter"
 ]
@@ -1,6 +1,8 @@
 import struct
 from typing import BinaryIO, Tuple
 
+import numpy as np
+
 # === Reading ===
 
 def read_byte(f: BinaryIO) -> int:
@@ -49,6 +51,21 @@ def write_triangle(t: Tuple[int, int, int]) -> bytes:
     return struct.pack('<HHH', *t)
 
 
+# === Bulk (NumPy) layouts ===
+
+# One keyframe entry: vector3 position followed by vector3 normal.
+KEYFRAME_DTYPE = np.dtype([('pos', '<f4', (3,)), ('normal', '<f4', (3,))])
+TRIANGLE_DTYPE = np.dtype(('<u2', (3,)))
+VECTOR2_DTYPE = np.dtype(('<f4', (2,)))
+
+def read_array(f: BinaryIO, dtype: np.dtype, count: int) -> np.ndarray:
+    size = dtype.itemsize * count
+    raw = f.read(size)
+    if len(raw) != size:
+        raise ValueError(f"Unexpected end of file: expected {size} bytes, got {len(raw)}")
+    return np.frombuffer(raw, dtype=dtype, count=count)
+
+
 # === Utility ===
 
 def align16(data: bytes) -> bytes:
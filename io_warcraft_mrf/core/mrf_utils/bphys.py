@@ -0,0 +1,111 @@
+# Reader for Blender's on-disk point caches (.bphys), as written when a
+# cloth simulation is baked with "Disk Cache" enabled. One file per frame:
+#
+#   char[8]  "BPHYSICS"
+#   uint32   typeflag       low 16 bits: cache type, 1 << 16: compressed
+#   uint32   totpoint
+#   uint32   data_types     bit i set: data type i is stored
+#   data     uncompressed:  interleaved per point, types in bit order
+#            compressed:    one block per type: uint8 compression mode,
+#                           then totpoint values (only mode 0 is supported)
+#
+# Values are in native (little-endian) byte order; cloth positions are in
+# world space.
+
+import re
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+BPHYS_MAGIC = b'BPHYSICS'
+BPHYS_EXTENSION = '.bphys'
+
+TYPE_MASK = 0x0000FFFF
+TYPEFLAG_COMPRESS = 1 << 16
+PTCACHE_TYPE_CLOTH = 2
+
+# Data type bit -> (name, dtype); XCONST (cloth) shares the AVELOCITY slot
+DATA_TYPES = (
+    ('index', np.dtype('<u4')),
+    ('location', np.dtype(('<f4', (3,)))),
+    ('velocity', np.dtype(('<f4', (3,)))),
+    ('rotation', np.dtype(('<f4', (4,)))),
+    ('avelocity', np.dtype(('<f4', (3,)))),
+    ('size', np.dtype('<f4')),
+    ('times', np.dtype(('<f4', (3,)))),
+    ('boids', np.dtype('V20')),
+)
+_HEADER = np.dtype([('magic', 'S8'), ('typeflag', '<u4'), ('totpoint', '<u4'), ('data_types', '<u4')])
+
+
+def read_bphys(file_path: str) -> Dict[str, np.ndarray]:
+    """Decodes one cache file into {data type name: (totpoint, ...) array}."""
+    data = Path(file_path).read_bytes()
+    if len(data) < _HEADER.itemsize:
+        raise ValueError(f"{file_path}: file is too small for a point cache header")
+    header = np.frombuffer(data, dtype=_HEADER, count=1)[0]
+    if header['magic'] != BPHYS_MAGIC:
+        raise ValueError(f"{file_path}: not a Blender point cache file")
+
+    totpoint = int(header['totpoint'])
+    types = [(name, dtype) for bit, (name, dtype) in enumerate(DATA_TYPES) if header['data_types'] & (1 << bit)]
+    offset = _HEADER.itemsize
+
+    if not header['typeflag'] & TYPEFLAG_COMPRESS:
+        point = np.dtype([(name, dtype) for name, dtype in types])
+        if offset + point.itemsize * totpoint > len(data):
+            raise ValueError(f"{file_path}: point data is truncated")
+        points = np.frombuffer(data, dtype=point, count=totpoint, offset=offset)
+        return {name: points[name] for name, _ in types}
+
+    result = {}
+    for name, dtype in types:
+        mode = data[offset] if offset < len(data) else None
+        if mode != 0:
+            raise ValueError(f"{file_path}: compressed point caches are not supported, "
+                             f"set the cache compression to 'None' and bake again")
+        offset += 1
+        if offset + dtype.itemsize * totpoint > len(data):
+            raise ValueError(f"{file_path}: {name} data is truncated")
+        result[name] = np.frombuffer(data, dtype=dtype, count=totpoint, offset=offset)
+        offset += dtype.itemsize * totpoint
+    return result
+
+
+def cache_name_from_id(id_name: str) -> str:
+    """File name prefix Blender uses for unnamed caches: the owner ID's name in hex."""
+    return ''.join(f'{b:02X}' for b in id_name.encode('utf-8'))
+
+
+class BPhysCache:
+    """
+    The frames of one point cache in a directory:
+    {name}_{frame:06d}_{index:02d}.bphys (no index suffix if index is None).
+    """
+
+    def __init__(self, directory: str, name: str, index: int = None):
+        self.directory = Path(directory)
+        self.name = name
+        self.index = index
+
+    def frame_path(self, frame: int) -> Path:
+        suffix = '' if self.index is None else f'_{self.index:02d}'
+        return self.directory / f'{self.name}_{frame:06d}{suffix}{BPHYS_EXTENSION}'
+
+    def frames(self) -> List[int]:
+        """Frame numbers present on disk, sorted."""
+        suffix = '' if self.index is None else re.escape(f'_{self.index:02d}')
+        pattern = re.compile(re.escape(self.name) + r'_(\d{6})' + suffix + re.escape(BPHYS_EXTENSION) + '$')
+        found = (pattern.match(p.name) for p in self.directory.glob(f'{self.name}_*{BPHYS_EXTENSION}'))
+        return sorted(int(m.group(1)) for m in found if m)
+
+    def read_locations(self, frame: int) -> np.ndarray:
+        """(totpoint, 3) float32 positions of one frame."""
+        path = self.frame_path(frame)
+        if not path.is_file():
+            raise ValueError(f"Frame {frame} is not baked: {path} not found")
+        data = read_bphys(str(path))
+        if 'location' not in data:
+            raise ValueError(f"{path}: cache has no location data")
+        return data['location']
@@ -0,0 +1,147 @@
+# Vertex cache optimization after Tom Forsyth, "Linear-Speed Vertex Cache Optimisation" (2006).
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+CACHE_SIZE = 32
+CACHE_DECAY_POWER = 1.5
+LAST_TRI_SCORE = 0.75
+VALENCE_BOOST_SCALE = 2.0
+VALENCE_BOOST_POWER = 0.5
+
+
+@dataclass
+class CacheOptimizeResult:
+    faces: np.ndarray         # (nFaces, 3) reordered and renumbered faces
+    vertex_order: np.ndarray  # (nVerts,) old vertex index for each new index
+    acmr_before: float
+    acmr_after: float
+
+
+def acmr(faces: np.ndarray, cache_size: int = 16) -> float:
+    """Average cache miss ratio (misses per triangle) of a FIFO post-transform cache."""
+    if len(faces) == 0:
+        return 0.0
+    cache = [-1] * cache_size
+    cached = set()
+    head = misses = 0
+    for v in faces.ravel().tolist():
+        if v not in cached:
+            misses += 1
+            cached.discard(cache[head])
+            cache[head] = v
+            cached.add(v)
+            head = (head + 1) % cache_size
+    return misses / len(faces)
+
+
+def _score_table(max_valence: int) -> List[List[float]]:
+    # table[cache_position + 1][remaining valence], position -1 = not cached
+    table = []
+    for position in range(-1, CACHE_SIZE):
+        if position < 0:
+            cache_score = 0.0
+        elif position < 3:
+            cache_score = LAST_TRI_SCORE
+        else:
+            cache_score = (1.0 - (position - 3) / (CACHE_SIZE - 3)) ** CACHE_DECAY_POWER
+        row = [-1.0]
+        for valence in range(1, max_valence + 1):
+            row.append(cache_score + VALENCE_BOOST_SCALE * valence ** -VALENCE_BOOST_POWER)
+        table.append(row)
+    return table
+
+
+def optimize_triangle_order(faces: np.ndarray, n_verts: int) -> np.ndarray:
+    """Returns the triangle permutation chosen by Forsyth's greedy scoring."""
+    n_faces = len(faces)
+    if n_faces == 0:
+        return np.empty(0, dtype=np.int64)
+
+    tris = faces.tolist()
+    adjacency = [[] for _ in range(n_verts)]
+    for t, (a, b, c) in enumerate(tris):
+        adjacency[a].append(t)
+        adjacency[b].append(t)
+        adjacency[c].append(t)
+
+    table = _score_table(max(len(a) for a in adjacency))
+    remaining = [len(a) for a in adjacency]
+    position = [-1] * n_verts
+    vertex_score = [table[0][r] for r in remaining]
+    tri_score = [vertex_score[a] + vertex_score[b] + vertex_score[c] for a, b, c in tris]
+    added = [False] * n_faces
+
+    order = []
+    cache = []
+    best = max(range(n_faces), key=tri_score.__getitem__)
+    scan = 0
+
+    while True:
+        order.append(best)
+        added[best] = True
+        tri = tris[best]
+
+        for v in tri:
+            remaining[v] -= 1
+            adjacency[v].remove(best)
+
+        new_cache = list(tri)
+        new_cache.extend(v for v in cache if v not in tri)
+        for v in new_cache[CACHE_SIZE:]:
+            position[v] = -1
+            vertex_score[v] = table[0][remaining[v]]
+        cache = new_cache[:CACHE_SIZE]
+
+        touched = set(new_cache)
+        for i, v in enumerate(cache):
+            position[v] = i
+            vertex_score[v] = table[i + 1][remaining[v]]
+
+        best, best_score = -1, -1.0
+        for v in touched:
+            for t in adjacency[v]:
+                a, b, c = tris[t]
+                score = vertex_score[a] + vertex_score[b] + vertex_score[c]
+                tri_score[t] = score
+                if score > best_score:
+                    best, best_score = t, score
+
+        if len(order) == n_faces:
+            break
+        if best < 0:
+            # Nothing adjacent to the cache: continue with the next unused triangle
+            while added[scan]:
+                scan += 1
+            best = scan
+
+    return np.array(order, dtype=np.int64)
+
+
+def optimize(faces: np.ndarray, n_verts: int, cache_size: int = 16) -> CacheOptimizeResult:
+    """
+    Reorders triangles for the post-transform vertex cache, then renumbers
+    vertices in first-use order. Unreferenced vertices keep their relative
+    order at the end. Apply vertex_order to uvs and to every keyframe.
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    reordered = faces[optimize_triangle_order(faces, n_verts)]
+
+    flat = reordered.ravel()
+    _, first = np.unique(flat, return_index=True)
+    used = flat[np.sort(first)]
+    unused = np.setdiff1d(np.arange(n_verts), used)
+    vertex_order = np.concatenate((used, unused))
+
+    new_index = np.empty(n_verts, dtype=np.int64)
+    new_index[vertex_order] = np.arange(n_verts)
+    new_faces = new_index[reordered]
+
+    return CacheOptimizeResult(
+        faces=new_faces,
+        vertex_order=vertex_order,
+        acmr_before=acmr(faces, cache_size),
+        acmr_after=acmr(new_faces, cache_size),
+    )
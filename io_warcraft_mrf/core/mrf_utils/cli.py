@@ -0,0 +1,278 @@
+"""
+Headless command line tools for .mrf files (no Blender required).
+
+    python -m io_warcraft_mrf.core.mrf_utils info     PATH...
+    python -m io_warcraft_mrf.core.mrf_utils validate PATH... [--strict]
+    python -m io_warcraft_mrf.core.mrf_utils repack   PATH... [--strip-signature] [--reserved A,B,C,D,E,F]
+    python -m io_warcraft_mrf.core.mrf_utils convert  PATH... --to pc2|mdd [--scale S]
+    python -m io_warcraft_mrf.core.mrf_utils convert  CACHE... --to mrf --topology MRF|OBJ [--scale S]
+    python -m io_warcraft_mrf.core.mrf_utils diff     OLD NEW [--remap] [--tolerance T] [--frames]
+
+Directories are searched recursively for *.mrf files (*.pc2 and *.mdd for
+`convert --to mrf`) and processed in a
+process pool. One JSON object is printed per file as soon as it finishes;
+the exit code is 1 if any file failed.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .reader import MRFReader
+from .writer import MRFWriter
+from .point_cache import PointCacheReader, write_point_cache
+from .validator import validate_file, validate_model, checked_keyframes
+from .convert import load_topology, point_cache_to_model
+from .diff import diff_files, DeviationStats
+
+
+def iter_input_files(paths: List[str], patterns: Tuple[str, ...] = ('*.mrf',)) -> Iterator[Tuple[Path, Path]]:
+    """Yields (file, root) pairs; root is the argument the file was found under."""
+    for arg in paths:
+        root = Path(arg)
+        if root.is_dir():
+            for file in sorted(f for pattern in patterns for f in root.rglob(pattern)):
+                if file.is_file():
+                    yield file, root
+        else:
+            yield root, root.parent
+
+
+def output_path(file: Path, root: Path, output_dir: str, suffix: str) -> Path:
+    """Mirrors file's location below root into output_dir (or keeps it in place)."""
+    if output_dir:
+        target = Path(output_dir) / file.relative_to(root)
+    else:
+        target = file
+    target = target.with_suffix(suffix)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return target
+
+
+def _replace_atomically(target: Path, write: Callable[[str], None]):
+    temp = target.with_name(target.name + '.tmp')
+    try:
+        write(str(temp))
+        os.replace(temp, target)
+    finally:
+        if temp.exists():
+            temp.unlink()
+
+
+# === Commands ===
+# Each command runs in a worker process and returns a JSON-serializable dict.
+
+def cmd_info(file: Path, root: Path, args: argparse.Namespace) -> dict:
+    with MRFReader(str(file)) as reader:
+        header = asdict(reader.header)
+        header['offsets'].pop('keyframes')
+        return {
+            'file_size': reader.file_size,
+            'texture': reader.texture_path,
+            'header': header,
+        }
+
+
+def cmd_validate(file: Path, root: Path, args: argparse.Namespace) -> dict:
+    report = validate_file(str(file))
+    failed = report.errors or (args.strict and report.warnings)
+    return {'ok': not failed, 'errors': report.errors, 'warnings': report.warnings}
+
+
+def _parse_reserved(value: str) -> Tuple[int, ...]:
+    fields = tuple(int(v, 0) for v in value.split(','))
+    if len(fields) != 6 or not all(0 <= v <= 0xFFFFFFFF for v in fields):
+        raise argparse.ArgumentTypeError("expected 6 comma-separated uint32 values")
+    return fields
+
+
+def cmd_repack(file: Path, root: Path, args: argparse.Namespace) -> dict:
+    """Rewrites the file with 16-byte aligned chunks and the requested reserved field."""
+    with MRFReader(str(file)) as reader:
+        model = reader.to_model_data()
+        size_before = reader.file_size
+
+    if args.reserved is not None:
+        model.header.reserved_data = args.reserved
+    elif args.strip_signature:
+        model.header.reserved_data = None
+
+    target = output_path(file, root, args.output, '.mrf')
+    writer = MRFWriter(model, signature=False)
+    _replace_atomically(target, writer.write)
+    return {'output': str(target), 'size_before': size_before, 'size_after': target.stat().st_size}
+
+
+def cmd_convert(file: Path, root: Path, args: argparse.Namespace) -> dict:
+    """Writes the keyframe positions as a point cache, or a point cache as an .mrf."""
+    if args.to == 'mrf':
+        return _convert_to_mrf(file, root, args)
+    fmt = args.to.upper()
+    target = output_path(file, root, args.output, '.' + args.to)
+    scale = np.float32(args.scale)
+    with MRFReader(str(file)) as reader:
+        header = reader.header
+        frames = (reader.keyframe(i)['pos'] * scale for i in range(header.nFrames))
+        _replace_atomically(target, lambda p: write_point_cache(
+            p, frames, header.nVerts, header.nFrames, fmt, header.frameDuration))
+    return {'output': str(target)}
+
+
+def _convert_to_mrf(file: Path, root: Path, args: argparse.Namespace) -> dict:
+    if not args.topology:
+        raise ValueError("--to mrf needs --topology (an .mrf or .obj with the cache's faces and UVs)")
+    topology = load_topology(args.topology, preserve_seams=not args.split_seams)
+    target = output_path(file, root, args.output, '.mrf')
+    with PointCacheReader(str(file), fps=args.fps) as cache:
+        model = point_cache_to_model(cache, topology, args.scale, args.frame_range, args.texture,
+                                     args.normals.upper())
+        report = validate_model(model)
+        report.raise_for_errors()
+        model.keyframes = checked_keyframes(model.keyframes, report)
+        _replace_atomically(target, MRFWriter(model, signature=False).write)
+    return {'output': str(target), 'frames': model.header.nFrames, 'verts': model.header.nVerts,
+            'warnings': report.warnings}
+
+
+def _deviation_summary(stats: DeviationStats) -> dict:
+    frame, vertex, distance = stats.worst()
+    return {'max': distance, 'rms': stats.overall_rms, 'worst_frame': frame, 'worst_vertex': vertex}
+
+
+def cmd_diff(file: Path, root: Path, args: argparse.Namespace) -> dict:
+    """Compares file with its counterpart in args.new (a file, or a directory mirroring root)."""
+    other = Path(args.new)
+    if other.is_dir():
+        other = other / file.relative_to(root)
+    result = diff_files(str(file), str(other), remap=args.remap, quantum=args.quantum)
+
+    out = {
+        'ok': result.matches(args.tolerance, args.normal_tolerance, args.uv_tolerance),
+        'other': str(other),
+        'header': result.header,
+        'texture': result.texture,
+        'topology': result.topology,
+        'unmatched': result.unmatched,
+        'uv_max': result.uv_max,
+        'position': _deviation_summary(result.positions),
+        'normal': _deviation_summary(result.normals),
+    }
+    if args.frames:
+        p, n = result.positions, result.normals
+        out['frames'] = [
+            {'position': [p.max[i], p.mean[i], p.rms[i], int(p.worst_vertex[i])],
+             'normal': [n.max[i], n.mean[i], n.rms[i], int(n.worst_vertex[i])]}
+            for i in range(len(p.max))
+        ]
+    return out
+
+
+COMMANDS: Dict[str, Callable[[Path, Path, argparse.Namespace], dict]] = {
+    'info': cmd_info,
+    'validate': cmd_validate,
+    'repack': cmd_repack,
+    'convert': cmd_convert,
+    'diff': cmd_diff,
+}
+
+
+def run_one(command: str, file: Path, root: Path, args: argparse.Namespace) -> dict:
+    result = {'command': command, 'path': str(file)}
+    try:
+        # Commands may report a failure without raising by returning ok=False
+        result.update(COMMANDS[command](file, root, args))
+        result.setdefault('ok', True)
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+# === Entry point ===
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m io_warcraft_mrf.core.mrf_utils',
+                                     description="Inspect, validate and convert Warcraft III .mrf files.")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: number of cores)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add(name: str, help: str) -> argparse.ArgumentParser:
+        p = sub.add_parser(name, help=help)
+        p.add_argument('paths', nargs='+', help=".mrf files or directories")
+        return p
+
+    add('info', "Print header fields")
+    p = add('validate', "Check offsets, chunk layout, face indices and keyframe values")
+    p.add_argument('--strict', action='store_true', help="Treat warnings (alignment, non-unit normals, ...) as failures")
+
+    p = add('repack', "Rewrite with aligned chunks")
+    p.add_argument('-o', '--output', help="Output directory (default: rewrite in place)")
+    group = p.add_mutually_exclusive_group()
+    group.add_argument('--strip-signature', action='store_true', help="Zero the 24-byte reserved field")
+    group.add_argument('--reserved', type=_parse_reserved, help="Set the reserved field to 6 uint32 values")
+
+    p = add('convert', "Export keyframe positions as a point cache, or build an .mrf from a point cache")
+    p.add_argument('--to', choices=('pc2', 'mdd', 'mrf'), required=True)
+    p.add_argument('-o', '--output', help="Output directory (default: next to the input)")
+    p.add_argument('--scale', type=float, default=1.0, help="Multiply positions by this factor")
+    p.add_argument('--topology', help="--to mrf: .mrf or .obj providing faces, UVs (and texture for .mrf)")
+    p.add_argument('--texture', help="--to mrf: texture path (default: the topology .mrf's)")
+    p.add_argument('--frame-range', type=int, nargs=2, metavar=('START', 'END'),
+                   help="--to mrf: inclusive range of cache frames, 0-based (default: all)")
+    p.add_argument('--fps', type=float, default=30.0, help="--to mrf: frame rate of .pc2 caches (default: 30)")
+    p.add_argument('--normals', choices=('angle', 'area'), default='angle',
+                   help="--to mrf: face normal weighting (default: angle, as in Blender)")
+    p.add_argument('--split-seams', action='store_true',
+                   help="--to mrf: shade UV seam duplicates of a topology .mrf separately "
+                        "(default: they keep one shared normal)")
+
+    p = sub.add_parser('diff', help="Compare keyframes, topology and header of two builds")
+    p.add_argument('old', help=".mrf file or directory")
+    p.add_argument('new', help=".mrf file, or directory with the same layout as OLD")
+    p.add_argument('--remap', action='store_true',
+                   help="Match vertices by frame-0 position, normal and UV (e.g. deduplicated vs raw export)")
+    p.add_argument('--quantum', type=float, default=1e-4, help="Rounding step for --remap matching")
+    p.add_argument('--tolerance', type=float, default=0.0, help="Allowed position deviation")
+    p.add_argument('--normal-tolerance', type=float, default=0.0, help="Allowed normal deviation")
+    p.add_argument('--uv-tolerance', type=float, default=0.0, help="Allowed UV deviation")
+    p.add_argument('--frames', action='store_true',
+                   help="Include per-frame [max, mean, rms, worst vertex] for positions and normals")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'diff':
+        files = list(iter_input_files([args.old]))
+    elif args.command == 'convert' and args.to == 'mrf':
+        files = list(iter_input_files(args.paths, ('*.pc2', '*.mdd')))
+    else:
+        files = list(iter_input_files(args.paths))
+
+    failed = 0
+
+    def emit(result: dict):
+        nonlocal failed
+        failed += not result['ok']
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+
+    if args.jobs <= 1 or len(files) <= 1:
+        for file, root in files:
+            emit(run_one(args.command, file, root, args))
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [pool.submit(run_one, args.command, file, root, args) for file, root in files]
+            for future in as_completed(futures):
+                emit(future.result())
+
+    return 1 if failed or not files else 0
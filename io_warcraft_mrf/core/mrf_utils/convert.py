@@ -0,0 +1,169 @@
+# Point cache (.pc2 / .mdd) to .mrf conversion without Blender. Faces and
+# UVs come from a topology source (an existing .mrf or a Wavefront OBJ);
+# positions are streamed from the cache one frame at a time, normals are
+# recomputed, and MRFWriter writes each keyframe as soon as it is built.
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from .header import Header
+from .model_data import ArrayModelData
+from .normals import vertex_normals, seam_groups
+from .point_cache import PointCacheReader
+from .reader import MRFReader
+
+
+@dataclass
+class Topology:
+    """Output vertices as references into the cache's points."""
+    faces: np.ndarray   # (nFaces, 3) indices of output vertices
+    uvs: np.ndarray     # (nVerts, 2) float64, not flipped
+    index: np.ndarray   # (nVerts,) cache point of every output vertex
+    n_points: int       # Points the cache must have
+    groups: Optional[np.ndarray] = None  # (n_points,) points sharing one normal, see seam_groups
+    texture_path: str = ''
+    pivot: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    bounds_radius: float = 0.0
+    elapsed_time: float = 0.0
+
+
+def topology_from_mrf(file_path: str, preserve_seams: bool = True) -> Topology:
+    """
+    One cache point per .mrf vertex, as written by `convert --to pc2`. With
+    preserve_seams, vertices that the exporter split only for their UVs
+    (same frame-0 position and normal) keep sharing one normal.
+    """
+    with MRFReader(file_path) as reader:
+        h = reader.header
+        groups = None
+        if preserve_seams and h.nFrames:
+            rest = reader.keyframe(0)
+            groups = seam_groups(rest['pos'], rest['normal'])
+        return Topology(
+            faces=reader.faces.astype(np.int64),
+            uvs=reader.uvs.copy(),
+            index=np.arange(h.nVerts),
+            n_points=h.nVerts,
+            groups=groups,
+            texture_path=reader.texture_path,
+            pivot=h.pivot,
+            bounds_radius=h.boundsRadius,
+            elapsed_time=h.elapsedTime,
+        )
+
+
+def _obj_index(token: str, count: int) -> int:
+    """OBJ indices are 1-based, negative ones count back from the last element."""
+    i = int(token)
+    return i - 1 if i > 0 else count + i
+
+
+def topology_from_obj(file_path: str) -> Topology:
+    """
+    Reads v, vt and f records (polygons are fan-triangulated). Cache points
+    follow the order of the v records, as with Blender's Mesh Cache
+    modifier. Every distinct (v, vt) pair becomes an output vertex, so
+    vertices on UV seams are split the same way the exporter splits them.
+    """
+    n_points = 0
+    uvs = []
+    corners = []  # (v, vt) per triangle corner
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == 'v':
+                n_points += 1
+            elif parts[0] == 'vt':
+                uvs.append((float(parts[1]), float(parts[2]) if len(parts) > 2 else 0.0))
+            elif parts[0] == 'f':
+                polygon = []
+                for token in parts[1:]:
+                    fields = token.split('/')
+                    vt = _obj_index(fields[1], len(uvs)) if len(fields) > 1 and fields[1] else -1
+                    polygon.append((_obj_index(fields[0], n_points), vt))
+                for k in range(1, len(polygon) - 1):
+                    corners += (polygon[0], polygon[k], polygon[k + 1])
+
+    if not corners:
+        raise ValueError(f"{file_path}: no faces")
+    corners = np.array(corners, dtype=np.int64)
+    if corners[:, 0].min() < 0 or corners[:, 0].max() >= n_points or corners[:, 1].max() >= len(uvs):
+        raise ValueError(f"{file_path}: face index out of range")
+
+    # Distinct (v, vt) pairs numbered by first use
+    _, first, inverse = np.unique(corners, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    vertices = corners[first[order]]
+
+    uv_table = np.vstack((np.array(uvs, dtype=np.float64).reshape(-1, 2), np.zeros((1, 2))))
+    return Topology(
+        faces=rank[inverse.reshape(-1)].reshape(-1, 3),
+        uvs=uv_table[vertices[:, 1]],  # vt -1 (none) picks the zero row
+        index=vertices[:, 0],
+        n_points=n_points,
+    )
+
+
+def load_topology(file_path: str, preserve_seams: bool = True) -> Topology:
+    suffix = Path(file_path).suffix.lower()
+    if suffix == '.mrf':
+        return topology_from_mrf(file_path, preserve_seams)
+    if suffix == '.obj':
+        return topology_from_obj(file_path)
+    raise ValueError(f"Unsupported topology source: {file_path} (expected .mrf or .obj)")
+
+
+def _iter_keyframes(cache: PointCacheReader, topology: Topology, frames: range,
+                    scale: float, weighting: str) -> Iterator[np.ndarray]:
+    # Normals on the point mesh: output vertices split from one point share its normal
+    point_faces = topology.index[topology.faces]
+    scale = np.float32(scale)
+    for index in frames:
+        points = cache.frame(index)
+        keyframe = np.empty((len(topology.index), 2, 3), dtype=np.float32)
+        keyframe[:, 0] = points[topology.index] * scale
+        keyframe[:, 1] = vertex_normals(points, point_faces, weighting, topology.groups)[topology.index]
+        yield keyframe
+
+
+def point_cache_to_model(cache: PointCacheReader, topology: Topology, scale: float = 1.0,
+                         frame_range: Optional[Tuple[int, int]] = None,
+                         texture_path: Optional[str] = None, weighting: str = 'ANGLE') -> ArrayModelData:
+    """
+    Builds a model whose keyframes are a generator over the open cache, for
+    MRFWriter.write to stream. frame_range is an inclusive range of cache
+    frames (0-based). texture_path overrides the topology's. weighting is
+    passed to vertex_normals; 'ANGLE' matches Blender's normals.
+    """
+    if cache.n_points != topology.n_points:
+        raise ValueError(f"Point cache has {cache.n_points} points, the topology has {topology.n_points}")
+    start, end = frame_range if frame_range is not None else (0, cache.n_frames - 1)
+    if not 0 <= start <= end < cache.n_frames:
+        raise ValueError(f"Frame range {start}..{end} is outside the cache (0..{cache.n_frames - 1})")
+    frames = range(start, end + 1)
+
+    header = Header(
+        nFrames=len(frames),
+        nVerts=len(topology.index),
+        nIndices=topology.faces.size,
+        frameDuration=cache.frame_duration,
+        pivot=topology.pivot,
+        boundsRadius=topology.bounds_radius,
+        elapsedTime=topology.elapsed_time,
+        debugFlag=0,
+        offsets={},
+    )
+    return ArrayModelData(
+        header=header,
+        texture_path=texture_path if texture_path is not None else topology.texture_path,
+        faces=topology.faces.astype(np.uint16),
+        uvs=topology.uvs,
+        keyframes=_iter_keyframes(cache, topology, frames, scale, weighting),
+    )
@@ -0,0 +1,219 @@
+# Animation-aware mesh decimation: quadric error metrics (Garland & Heckbert)
+# accumulated per frame over the whole animation, with half-edge collapses
+# so every surviving vertex keeps its own keyframe data.
+
+import heapq
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+# Quadric of plane (a, b, c, d), upper triangle of the 4x4 matrix:
+# a², ab, ac, ad, b², bc, bd, c², cd, d²
+_QUADRIC_ROWS = (0, 0, 0, 0, 1, 1, 1, 2, 2, 3)
+_QUADRIC_COLS = (0, 1, 2, 3, 1, 2, 3, 2, 3, 3)
+_FRAME_CHUNK = 32
+
+
+@dataclass
+class DecimationLevel:
+    keep: np.ndarray   # (nVerts,) bool, surviving vertices of the input mesh
+    faces: np.ndarray  # (nFaces', 3) faces renumbered to the surviving vertices
+    error: float       # RMS plane distance of the last collapse, over all frames
+
+    @property
+    def n_verts(self) -> int:
+        return int(np.count_nonzero(self.keep))
+
+
+def _face_planes(positions: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """(nFaces, frames, 4) unit planes of every face in every frame."""
+    p0, p1, p2 = (positions[:, faces[:, k]].swapaxes(0, 1) for k in range(3))
+    normal = np.cross(p1 - p0, p2 - p0)
+    length = np.linalg.norm(normal, axis=2, keepdims=True)
+    normal /= np.where(length > 0, length, 1.0)
+    d = -np.einsum('tfi,tfi->tf', normal, p0)
+    return np.concatenate((normal, d[..., None]), axis=2)
+
+
+def vertex_quadrics(positions: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """(nVerts, frames, 10) sum of the incident face quadrics for each frame."""
+    n_frames, n_verts = positions.shape[:2]
+    quadrics = np.zeros((n_verts, n_frames, 10))
+    rows, cols = list(_QUADRIC_ROWS), list(_QUADRIC_COLS)
+    for start in range(0, n_frames, _FRAME_CHUNK):
+        chunk = positions[start:start + _FRAME_CHUNK].astype(np.float64)
+        planes = _face_planes(chunk, faces)
+        face_q = planes[..., rows] * planes[..., cols]
+        for k in range(3):
+            np.add.at(quadrics[:, start:start + _FRAME_CHUNK], faces[:, k], face_q)
+    return quadrics
+
+
+def _quadric_cost(q: np.ndarray, p: np.ndarray) -> float:
+    x, y, z = p[:, 0], p[:, 1], p[:, 2]
+    return float(np.sum(
+        q[:, 0] * x * x + 2 * q[:, 1] * x * y + 2 * q[:, 2] * x * z + 2 * q[:, 3] * x
+        + q[:, 4] * y * y + 2 * q[:, 5] * y * z + 2 * q[:, 6] * y
+        + q[:, 7] * z * z + 2 * q[:, 8] * z + q[:, 9]
+    ))
+
+
+class _Decimator:
+    def __init__(self, positions: np.ndarray, faces: np.ndarray):
+        self.positions = positions.astype(np.float64)  # (frames, verts, 3)
+        self.n_frames, self.n_verts = positions.shape[:2]
+        self.faces = faces.tolist()
+        self.face_alive = [True] * len(self.faces)
+        self.quadrics = vertex_quadrics(positions, faces)
+
+        self.vert_faces = [set() for _ in range(self.n_verts)]
+        for f, face in enumerate(self.faces):
+            for v in face:
+                self.vert_faces[v].add(f)
+
+        self.removed = np.zeros(self.n_verts, dtype=bool)
+        self.stamp = [0] * self.n_verts
+        self.locked = self._find_locked()
+        self.heap = []
+        for u, v in self._edges():
+            self._push(u, v)
+            self._push(v, u)
+
+    def _edges(self):
+        edges = set()
+        for face in self.faces:
+            for k in range(3):
+                a, b = face[k], face[(k + 1) % 3]
+                edges.add((min(a, b), max(a, b)))
+        return sorted(edges)
+
+    def _find_locked(self) -> np.ndarray:
+        # Vertices duplicated across UV/normal seams share their position in
+        # every frame; moving one copy without the other would open a crack.
+        flat = self.positions.swapaxes(0, 1).reshape(self.n_verts, -1)
+        _, inverse, counts = np.unique(flat, axis=0, return_inverse=True, return_counts=True)
+        return counts[inverse.reshape(-1)] > 1
+
+    def _neighbours(self, v: int) -> set:
+        return {w for f in self.vert_faces[v] for w in self.faces[f]} - {v}
+
+    def _is_boundary_edge(self, u: int, v: int) -> bool:
+        return len(self.vert_faces[u] & self.vert_faces[v]) == 1
+
+    def _is_boundary_vertex(self, u: int) -> bool:
+        return any(self._is_boundary_edge(u, w) for w in self._neighbours(u))
+
+    def _push(self, u: int, v: int):
+        """Queues the collapse u -> v (u is removed, v keeps its keyframes)."""
+        if self.locked[u]:
+            return
+        cost = _quadric_cost(self.quadrics[u] + self.quadrics[v], self.positions[:, v])
+        heapq.heappush(self.heap, (max(cost, 0.0), u, v, self.stamp[u], self.stamp[v]))
+
+    def _can_collapse(self, u: int, v: int) -> bool:
+        shared = self.vert_faces[u] & self.vert_faces[v]
+        if not shared:
+            return False
+        # Link condition: only the vertices opposite the collapsed edge may be shared
+        if len(self._neighbours(u) & self._neighbours(v)) != len(shared):
+            return False
+        if self._is_boundary_vertex(u) and len(shared) != 1:
+            return False
+
+        moved = [f for f in self.vert_faces[u] if f not in shared]
+        if not moved:
+            return True
+        # Reject collapses that flip a face in any frame
+        before = np.array([self.faces[f] for f in moved])
+        after = np.where(before == u, v, before)
+        return bool(np.all(np.einsum('tfi,tfi->tf', self._normals(before), self._normals(after)) > 0))
+
+    def _normals(self, faces: np.ndarray) -> np.ndarray:
+        p = self.positions[:, faces].swapaxes(0, 1)  # (faces, frames, 3, 3)
+        return np.cross(p[:, :, 1] - p[:, :, 0], p[:, :, 2] - p[:, :, 0])
+
+    def _collapse(self, u: int, v: int):
+        for f in list(self.vert_faces[u]):
+            face = self.faces[f]
+            if v in face:
+                self.face_alive[f] = False
+                for w in face:
+                    self.vert_faces[w].discard(f)
+            else:
+                face[face.index(u)] = v
+                self.vert_faces[v].add(f)
+        self.vert_faces[u].clear()
+
+        self.quadrics[v] += self.quadrics[u]
+        self.removed[u] = True
+        # Only v's quadric changed: stale entries are those that involve v.
+        # Entries (w, x) between other vertices keep their cost and stay valid.
+        self.stamp[v] += 1
+        for w in self._neighbours(v):
+            self._push(v, w)
+            self._push(w, v)
+
+    def run(self, targets: Sequence[int], max_error: float) -> List[DecimationLevel]:
+        levels = []
+        pending = sorted(targets, reverse=True)
+        alive = self.n_verts
+        last_error = 0.0
+
+        while pending and self.heap:
+            if alive <= pending[0]:
+                levels.append(self._snapshot(last_error))
+                pending.pop(0)
+                continue
+
+            cost, u, v, stamp_u, stamp_v = heapq.heappop(self.heap)
+            if self.removed[u] or self.removed[v] or stamp_u != self.stamp[u] or stamp_v != self.stamp[v]:
+                continue
+            error = np.sqrt(cost / self.n_frames)
+            if max_error > 0 and error > max_error and not levels:
+                # The error bound stops the first (largest) target only
+                levels.append(self._snapshot(last_error))
+                pending.pop(0)
+                if not pending:
+                    break
+            if not self._can_collapse(u, v):
+                continue
+
+            self._collapse(u, v)
+            alive -= 1
+            last_error = error
+
+        # Targets that could not be reached get the coarsest mesh found
+        while len(levels) < len(targets):
+            levels.append(self._snapshot(last_error))
+        return levels
+
+    def _snapshot(self, error: float) -> DecimationLevel:
+        keep = ~self.removed
+        new_index = np.cumsum(keep) - 1
+        faces = np.array([face for face, alive in zip(self.faces, self.face_alive) if alive],
+                         dtype=np.int64).reshape(-1, 3)
+        return DecimationLevel(keep=keep.copy(), faces=new_index[faces], error=float(error))
+
+
+def decimate(keyframes: np.ndarray, faces: np.ndarray, targets: Sequence[int],
+             max_error: float = 0.0) -> List[DecimationLevel]:
+    """
+    Reduces the mesh to each target vertex count (largest first, one
+    progressive pass). The largest target also stops early when the next
+    collapse would exceed max_error (RMS plane distance over all frames,
+    0 = no limit); smaller targets continue from there.
+    Quadrics are accumulated separately for every frame, so a fold that only
+    appears mid-animation makes its vertices as expensive to remove as a
+    fold in the rest pose. Returns one DecimationLevel per target, in the
+    order the targets were given.
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    decimator = _Decimator(keyframes[:, :, 0], faces)
+    order = sorted(range(len(targets)), key=lambda i: targets[i], reverse=True)
+    levels = decimator.run([targets[i] for i in order], max_error)
+
+    result = [None] * len(targets)
+    for level, i in zip(levels, order):
+        result[i] = level
+    return result
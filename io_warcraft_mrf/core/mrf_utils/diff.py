@@ -0,0 +1,182 @@
+# Numeric comparison of two .mrf files: header, texture, topology, UVs and
+# per-frame keyframe deviation. Keyframes are read in blocks through
+# MRFReader, so memory stays bounded whatever the file size.
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .header import Header
+from .reader import MRFReader
+
+# Header fields compared; offsets and the reserved (signature) field are layout, not content
+HEADER_FIELDS = ('nFrames', 'nVerts', 'nIndices', 'frameDuration', 'pivot',
+                 'boundsRadius', 'elapsedTime', 'debugFlag')
+BLOCK_BYTES = 64 * 1024 * 1024  # Keyframe data of both files per block
+
+
+@dataclass
+class DeviationStats:
+    """Per-frame distance statistics between matched vertices."""
+    max: np.ndarray           # (nFrames,)
+    mean: np.ndarray          # (nFrames,)
+    rms: np.ndarray           # (nFrames,)
+    worst_vertex: np.ndarray  # (nFrames,) vertex of the first file with the largest distance
+
+    @property
+    def overall_max(self) -> float:
+        return float(self.max.max()) if len(self.max) else 0.0
+
+    @property
+    def overall_rms(self) -> float:
+        return float(np.sqrt(np.mean(self.rms ** 2))) if len(self.rms) else 0.0
+
+    def worst(self) -> Tuple[int, int, float]:
+        """(frame, vertex, distance) of the largest deviation."""
+        if not len(self.max):
+            return -1, -1, 0.0
+        frame = int(self.max.argmax())
+        return frame, int(self.worst_vertex[frame]), float(self.max[frame])
+
+
+@dataclass
+class DiffResult:
+    header: Dict[str, Tuple] = field(default_factory=dict)  # field: (a, b), differing fields only
+    texture: Optional[Tuple[str, str]] = None               # (a, b) if different
+    topology: str = 'identical'                             # 'identical', 'reordered' or 'different'
+    uv_max: float = 0.0
+    remapped: bool = False
+    unmatched: Tuple[int, int] = (0, 0)                     # vertices of a / b without a counterpart
+    positions: DeviationStats = None
+    normals: DeviationStats = None
+
+    def matches(self, position_tolerance: float = 0.0, normal_tolerance: float = 0.0,
+                uv_tolerance: float = 0.0) -> bool:
+        """True if both files describe the same model within the tolerances."""
+        header = dict(self.header)
+        if self.remapped:
+            # Deduplicated and raw exports differ in counts by design
+            header.pop('nVerts', None)
+            header.pop('nIndices', None)
+        return (not header and self.texture is None and self.topology != 'different'
+                and self.unmatched == (0, 0) and self.uv_max <= uv_tolerance
+                and self.positions.overall_max <= position_tolerance
+                and self.normals.overall_max <= normal_tolerance)
+
+
+def _compare_headers(a: Header, b: Header) -> Dict[str, Tuple]:
+    diffs = {}
+    for name in HEADER_FIELDS:
+        va, vb = getattr(a, name), getattr(b, name)
+        if np.any(np.asarray(va) != np.asarray(vb)):
+            diffs[name] = (va, vb)
+    return diffs
+
+
+def _canonical_triangles(faces: np.ndarray) -> np.ndarray:
+    """Rotates each triangle so its smallest index comes first (winding kept), then sorts rows."""
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    shift = faces.argmin(axis=1)
+    rows = np.arange(len(faces))[:, None]
+    rotated = faces[rows, (shift[:, None] + np.arange(3)) % 3]
+    return rotated[np.lexsort(rotated.T[::-1])]
+
+
+def _compare_topology(faces_a: np.ndarray, faces_b: np.ndarray) -> str:
+    if faces_a.shape == faces_b.shape and np.array_equal(faces_a, faces_b):
+        return 'identical'
+    if faces_a.shape == faces_b.shape and np.array_equal(_canonical_triangles(faces_a),
+                                                          _canonical_triangles(faces_b)):
+        return 'reordered'
+    return 'different'
+
+
+def match_vertices(attributes_a: np.ndarray, attributes_b: np.ndarray, quantum: float = 1e-4) -> np.ndarray:
+    """
+    For each row of attributes_b (n, k), the index of the row of attributes_a
+    with the same values rounded to quantum, or -1. Duplicate rows in a
+    resolve to the lowest index.
+    """
+    keys_a = np.rint(np.asarray(attributes_a, dtype=np.float64) / quantum).astype(np.int64)
+    keys_b = np.rint(np.asarray(attributes_b, dtype=np.float64) / quantum).astype(np.int64)
+    unique_a, first_a = np.unique(keys_a, axis=0, return_index=True)
+    combined, inverse = np.unique(np.vstack((unique_a, keys_b)), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # combined row -> row of a (or -1); unique_a rows are all distinct
+    owner = np.full(len(combined), -1, dtype=np.int64)
+    owner[inverse[:len(unique_a)]] = first_a
+    return owner[inverse[len(unique_a):]]
+
+
+def _vertex_attributes(reader: MRFReader, with_frame: bool = True) -> np.ndarray:
+    """(nVerts, 8) frame-0 position, normal and UV, or (nVerts, 2) UV alone without with_frame."""
+    if not with_frame:
+        return reader.uvs
+    frame = reader.keyframe(0)
+    return np.hstack((frame['pos'], frame['normal'], reader.uvs))
+
+
+def _deviation(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """a, b: (frames, n, 3). Returns per-frame max, mean, rms and argmax of |a - b|."""
+    diff = a.astype(np.float64) - b
+    dist = np.sqrt(np.einsum('fvi,fvi->fv', diff, diff))
+    if dist.shape[1] == 0:
+        zeros = np.zeros(len(dist))
+        return zeros, zeros, zeros, np.zeros(len(dist), dtype=np.int64)
+    return dist.max(axis=1), dist.mean(axis=1), np.sqrt(np.mean(dist ** 2, axis=1)), dist.argmax(axis=1)
+
+
+def diff_files(path_a: str, path_b: str, remap: bool = False, quantum: float = 1e-4) -> DiffResult:
+    """
+    Compares two .mrf files. Without remap, vertices are compared by index
+    and the vertex counts must agree. With remap, every vertex of b is matched
+    to a vertex of a by its frame-0 position, normal and UV rounded to quantum,
+    so a deduplicated export can be compared with a raw one; faces of b are
+    then compared after renumbering. If either file has no keyframes, only
+    UVs are matched, and only topology and UVs are compared.
+    """
+    result = DiffResult()
+    with MRFReader(path_a) as a, MRFReader(path_b) as b:
+        ha, hb = a.header, b.header
+        result.header = _compare_headers(ha, hb)
+        if a.texture_path != b.texture_path:
+            result.texture = (a.texture_path, b.texture_path)
+
+        if remap:
+            result.remapped = True
+            with_frame = ha.nFrames > 0 and hb.nFrames > 0
+            matched = match_vertices(_vertex_attributes(a, with_frame), _vertex_attributes(b, with_frame), quantum)
+            index_b = np.flatnonzero(matched >= 0)
+            index_a = matched[index_b]
+            result.unmatched = (ha.nVerts - len(np.unique(index_a)), hb.nVerts - len(index_b))
+            faces_b = matched[b.faces.astype(np.int64)]
+            result.topology = 'different' if (faces_b < 0).any() else _compare_topology(a.faces, faces_b)
+        else:
+            if ha.nVerts != hb.nVerts:
+                raise ValueError(f"Vertex counts differ ({ha.nVerts} / {hb.nVerts}); use remap to match vertices")
+            index_a = index_b = np.arange(ha.nVerts)
+            result.topology = _compare_topology(a.faces, b.faces)
+
+        if len(index_a):
+            result.uv_max = float(np.abs(a.uvs[index_a] - b.uvs[index_b]).max())
+
+        n_frames = min(ha.nFrames, hb.nFrames)
+        stats = {name: [np.empty(n_frames), np.empty(n_frames), np.empty(n_frames),
+                        np.empty(n_frames, dtype=np.int64)] for name in ('pos', 'normal')}
+        block = max(1, BLOCK_BYTES // max(1, a.keyframe_size + b.keyframe_size))
+        for start in range(0, n_frames, block):
+            frames = slice(start, min(start + block, n_frames))
+            ka, kb = a.keyframes(frames), b.keyframes(frames)
+            for name, values in stats.items():
+                deviation = _deviation(ka[name][:, index_a], kb[name][:, index_b])
+                for out, value in zip(values, deviation):
+                    out[frames] = value
+        if len(index_a):
+            # Worst vertices in the numbering of file a
+            for values in stats.values():
+                values[3] = index_a[values[3]]
+        result.positions = DeviationStats(*stats['pos'])
+        result.normals = DeviationStats(*stats['normal'])
+    return result
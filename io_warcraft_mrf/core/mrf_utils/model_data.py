@@ -2,6 +2,9 @@
 
 from dataclasses import dataclass
 from typing import List, Tuple
+
+import numpy as np
+
 from .header import Header
 
 
@@ -12,3 +15,53 @@ class ModelData:
     faces: List[Tuple[int, int, int]]
     uvs: List[Tuple[float, float]]
     keyframes: List[List[Tuple[Tuple[float, float, float], Tuple[float, float, float]]]]
+
+
+@dataclass
+class ArrayModelData(ModelData):
+    """
+    ModelData backed by contiguous arrays instead of nested tuples:
+    - faces: (nFaces, 3) uint16
+    - uvs: (nVerts, 2) float64, V already flipped.
+      float64 keeps the 1 - v flip exact, the array is only 16 bytes per vertex.
+    - keyframes: (nFrames, nVerts, 2, 3) float32, [..., 0, :] is the position
+      and [..., 1, :] the normal; the memory layout equals the keyframe chunk.
+
+    Indexing and iteration work like the list backing
+    (keyframes[f][v] unpacks to pos, normal), so code written for ModelData
+    accepts either one.
+    """
+    faces: np.ndarray
+    uvs: np.ndarray
+    keyframes: np.ndarray
+
+    @classmethod
+    def from_model_data(cls, model: ModelData) -> 'ArrayModelData':
+        keyframes = model.keyframes
+        if isinstance(keyframes, np.ndarray) and keyframes.dtype.names:
+            keyframes = keyframes.view('<f4')
+        if len(keyframes):
+            keyframes = np.asarray(keyframes, dtype=np.float32).reshape(len(keyframes), -1, 2, 3)
+        else:
+            # reshape cannot infer the vertex count from an empty array
+            keyframes = np.empty((0, model.header.nVerts, 2, 3), dtype=np.float32)
+        return cls(
+            header=model.header,
+            texture_path=model.texture_path,
+            faces=np.asarray(model.faces, dtype=np.uint16).reshape(-1, 3),
+            uvs=np.asarray(model.uvs, dtype=np.float64).reshape(-1, 2),
+            keyframes=keyframes,
+        )
+
+    def to_model_data(self) -> ModelData:
+        """Converts back to the list-of-tuples backing."""
+        return ModelData(
+            header=self.header,
+            texture_path=self.texture_path,
+            faces=[tuple(f) for f in self.faces.tolist()],
+            uvs=[tuple(uv) for uv in self.uvs.tolist()],
+            keyframes=[
+                [(tuple(pos), tuple(normal)) for pos, normal in frame]
+                for frame in self.keyframes.tolist()
+            ],
+        )
@@ -0,0 +1,106 @@
+# Vertex normals recomputed from positions, for sources that carry no
+# evaluated normals (point caches) or whose surface changed. All frames of
+# a (frames, nVerts, 3) array are processed in blocks: gathers, cross
+# products and corner weights are whole-block array operations, and one
+# bincount per axis scatters every corner of the block.
+
+from typing import Optional
+
+import numpy as np
+
+WEIGHTINGS = ('AREA', 'ANGLE')
+_BLOCK_CORNERS = 1 << 18  # Corners (frames * faces * 3) scattered per bincount
+
+
+def seam_groups(positions: np.ndarray, normals: np.ndarray, quantum: float = 1e-5) -> np.ndarray:
+    """
+    (nVerts,) group ids of vertices that share a rest position and normal,
+    i.e. copies of one mesh vertex split only because of their UVs. Copies
+    split at sharp edges have different normals and stay in separate groups.
+    """
+    values = np.hstack((np.asarray(positions, dtype=np.float64), np.asarray(normals, dtype=np.float64)))
+    keys = np.rint(values / quantum).astype(np.int64)
+    _, inverse = np.unique(keys, axis=0, return_inverse=True)
+    return inverse.reshape(-1)
+
+
+def _corner_weights(x: np.ndarray, y: np.ndarray, z: np.ndarray, weighting: str):
+    """
+    x, y, z: (frames, 3, nFaces) corner coordinates. Returns the (frames,
+    3, nFaces) x, y and z contributions of every corner to its vertex.
+    """
+    ax, ay, az = x[:, 1] - x[:, 0], y[:, 1] - y[:, 0], z[:, 1] - z[:, 0]
+    bx, by, bz = x[:, 2] - x[:, 0], y[:, 2] - y[:, 0], z[:, 2] - z[:, 0]
+    # Cross product component-wise: np.cross on (..., 3) arrays is several times slower
+    nx, ny, nz = ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+    shape = x.shape
+
+    if weighting == 'AREA':
+        # |n| is twice the face area, so the unnormalized normal is the area weight
+        return tuple(np.broadcast_to(n[:, None], shape) for n in (nx, ny, nz))
+
+    # Corner angle between the edges to the next and the previous corner;
+    # |e1 x e2| is the same for every corner of a face: |n|
+    length = np.sqrt(nx * nx + ny * ny + nz * nz)
+    ex, ey, ez = (np.roll(c, -1, axis=1) - c for c in (x, y, z))
+    fx, fy, fz = (np.roll(c, -2, axis=1) - c for c in (x, y, z))
+    angle = np.arctan2(np.broadcast_to(length[:, None], shape), ex * fx + ey * fy + ez * fz)
+    scale = angle / np.where(length > 0, length, 1.0)[:, None]
+    return nx[:, None] * scale, ny[:, None] * scale, nz[:, None] * scale
+
+
+def vertex_normals(positions: np.ndarray, faces: np.ndarray, weighting: str = 'AREA',
+                   groups: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Vertex normals of triangle meshes: the face normals around each vertex,
+    weighted by face area ('AREA') or by the corner angle ('ANGLE', as
+    Blender does), summed and normalized. positions is (nVerts, 3) or
+    (frames, nVerts, 3); the result has the same shape, in float32.
+    Vertices without faces get a zero normal.
+
+    groups (nVerts,) sums the contributions of all vertices with the same
+    id and gives each of them the group's normal. With seam_groups() this
+    keeps vertices duplicated across UV seams on one shared normal, as on
+    the unsplit mesh, instead of shading each side of the seam separately.
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"Unknown normal weighting: {weighting}")
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    single = positions.ndim == 2
+    p = np.asarray(positions, dtype=np.float32)
+    if single:
+        p = p[None]
+    n_frames, n_verts = p.shape[:2]
+
+    # Accumulate per group (or per vertex), expand at the end
+    if groups is not None:
+        _, inverse = np.unique(groups, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        targets = inverse[faces]
+        n_targets = int(inverse.max()) + 1 if len(inverse) else 0
+    else:
+        targets = faces
+        n_targets = n_verts
+    corners = np.ascontiguousarray(faces.T)   # (3, nFaces), gathers positions
+    slots = np.ascontiguousarray(targets.T)   # (3, nFaces), scatters normals
+
+    # Component-major gathers (x.take(corners)) are several times faster than p[faces]
+    xyz = np.ascontiguousarray(np.moveaxis(p, 2, 0))  # (3, frames, nVerts)
+    sums = np.empty((n_frames, n_targets, 3))
+    block = max(1, _BLOCK_CORNERS // max(1, faces.size))
+    for start in range(0, n_frames, block):
+        stop = min(start + block, n_frames)
+        x, y, z = (c[start:stop].take(corners, axis=1) for c in xyz)
+        # Slot of every corner in the flattened (frames, targets) block
+        offsets = (np.arange(stop - start) * n_targets)[:, None, None]
+        flat = (offsets + slots).ravel()
+        for axis, weights in enumerate(_corner_weights(x, y, z, weighting)):
+            scattered = np.bincount(flat, weights.ravel(), minlength=(stop - start) * n_targets)
+            sums[start:stop, :, axis] = scattered.reshape(stop - start, n_targets)
+
+    lengths = np.sqrt(np.einsum('fvi,fvi->fv', sums, sums))[..., None]
+    sums /= np.where(lengths > 0, lengths, 1.0)
+    normals = sums.astype(np.float32)
+    if groups is not None:
+        normals = normals[:, inverse]
+    return normals[0] if single else normals
@@ -2,20 +2,33 @@
 from typing import List, Tuple, BinaryIO
 from pathlib import Path
 
+import numpy as np
+
 from .header import Header
-from .model_data import ModelData
+from .model_data import ModelData, ArrayModelData
+from .profiler import NULL_PROFILER
 from .binary_utils import (
     read_uint32, read_float, read_vector3,
-    read_vector2, read_triangle
+    read_vector2, read_triangle, read_array,
+    KEYFRAME_DTYPE, TRIANGLE_DTYPE, VECTOR2_DTYPE
 )
 
 class MRFParser:
-    def __init__(self, file_path: str):
+    """
+    Reads an .mrf file into ModelData.
+
+    With vectorized=True every chunk is decoded in one bulk read and the
+    result is an ArrayModelData. Values are identical to the tuple-based path.
+    """
+
+    def __init__(self, file_path: str, vectorized: bool = False, profiler=NULL_PROFILER):
         self.file_path = Path(file_path)
+        self.vectorized = vectorized
+        self.profiler = profiler
         self.data = None
 
     def read(self):
-        with self.file_path.open('rb') as f:
+        with self.profiler.stage('parse'), self.file_path.open('rb') as f:
             self.data = self._read_all(f)
 
     def _read_all(self, f: BinaryIO) -> ModelData:
@@ -56,9 +69,20 @@ class MRFParser:
         )
 
         texture_path = self._read_texture(f, texture_offset, face_offset)
-        faces = self._read_faces(f, face_offset, nIndices)
-        uvs = self._read_uvs(f, mapping_offset, nVerts)
-        keyframes = [self._read_keyframe(f, offset, nVerts) for offset in keyframe_offsets]
+
+        if self.vectorized:
+            with self.profiler.stage('parse.static_chunks'):
+                faces = self._read_faces_array(f, face_offset, nIndices)
+                uvs = self._read_uvs_array(f, mapping_offset, nVerts)
+            with self.profiler.stage('parse.keyframes'):
+                keyframes = self._read_keyframes_array(f, keyframe_offsets, nVerts)
+            return ArrayModelData(header, texture_path, faces, uvs, keyframes)
+
+        with self.profiler.stage('parse.static_chunks'):
+            faces = self._read_faces(f, face_offset, nIndices)
+            uvs = self._read_uvs(f, mapping_offset, nVerts)
+        with self.profiler.stage('parse.keyframes'):
+            keyframes = [self._read_keyframe(f, offset, nVerts) for offset in keyframe_offsets]
 
         return ModelData(header, texture_path, faces, uvs, keyframes)
 
@@ -87,4 +111,24 @@ class MRFParser:
             pos = read_vector3(f)
             normal = read_vector3(f)
             verts.append((pos, normal))
-        return verts
\ No newline at end of file
+        return verts
+
+    # === Vectorized path ===
+
+    def _read_faces_array(self, f: BinaryIO, offset: int, nIndices: int) -> np.ndarray:
+        f.seek(offset)
+        return read_array(f, TRIANGLE_DTYPE, nIndices // 3).copy()
+
+    def _read_uvs_array(self, f: BinaryIO, offset: int, nVerts: int) -> np.ndarray:
+        f.seek(offset)
+        # Flip in float64, like the tuple path does, so values match exactly
+        uvs = read_array(f, VECTOR2_DTYPE, nVerts).astype(np.float64)
+        uvs[:, 1] = 1 - uvs[:, 1]
+        return uvs
+
+    def _read_keyframes_array(self, f: BinaryIO, offsets: List[int], nVerts: int) -> np.ndarray:
+        keyframes = np.empty((len(offsets), nVerts), dtype=KEYFRAME_DTYPE)
+        for i, offset in enumerate(offsets):
+            f.seek(offset)
+            keyframes[i] = read_array(f, KEYFRAME_DTYPE, nVerts)
+        return keyframes.view('<f4').reshape(len(offsets), nVerts, 2, 3)
@@ -0,0 +1,161 @@
+# Point cache sidecar formats read and written by Blender's Mesh Cache modifier.
+# PC2: little-endian, 32-byte header, then nSamples * nPoints * vector3.
+# MDD: big-endian, int32 nFrames, int32 nPoints, float32 times[nFrames],
+#      then nFrames * nPoints * vector3.
+
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+PC2_MAGIC = b'POINTCACHE2\x00'
+PC2_HEADER = struct.Struct('<12siiffi')  # magic, version, nPoints, startFrame, sampleRate, nSamples
+MDD_HEADER = struct.Struct('>ii')        # nFrames, nPoints
+
+FORMATS = ('PC2', 'MDD')
+
+
+class PointCacheReader:
+    """
+    Reads frames of a .pc2 or .mdd file one at a time (the format is taken
+    from the extension), so memory stays at one frame whatever the length.
+    PC2 stores no time base: frame_duration is sampleRate / fps. MDD stores
+    per-frame times, their first step is used when it is positive.
+    """
+
+    def __init__(self, file_path: str, fps: float = 30.0):
+        self.file_path = Path(file_path)
+        self.fmt = self.file_path.suffix[1:].upper()
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Unsupported point cache format: {self.file_path.suffix}")
+        self.fps = fps
+        self.n_points = 0
+        self.n_frames = 0
+        self.frame_duration = 1.0 / fps
+        self.start_frame = 0.0
+        self._data_offset = 0
+        self._file = None
+        self._dtype = np.dtype('<f4' if self.fmt == 'PC2' else '>f4')
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n_frames
+
+    def open(self):
+        self._file = self.file_path.open('rb')
+        try:
+            self._read_header()
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError(f"{self.file_path}: not a valid {self.fmt} file")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_header(self):
+        if self.fmt == 'PC2':
+            magic, _, self.n_points, self.start_frame, sample_rate, self.n_frames = \
+                PC2_HEADER.unpack(self._file.read(PC2_HEADER.size))
+            if magic != PC2_MAGIC:
+                raise ValueError("bad magic")
+            if sample_rate > 0:
+                self.frame_duration = sample_rate / self.fps
+            self._data_offset = PC2_HEADER.size
+        else:
+            self.n_frames, self.n_points = MDD_HEADER.unpack(self._file.read(MDD_HEADER.size))
+            times = np.fromfile(self._file, dtype='>f4', count=self.n_frames)
+            if len(times) > 1 and times[1] > times[0]:
+                self.frame_duration = float(times[1] - times[0])
+            self._data_offset = MDD_HEADER.size + 4 * self.n_frames
+
+        end = self._data_offset + self.n_frames * self.frame_bytes
+        if self.n_points < 0 or self.n_frames < 0 or end > self.file_path.stat().st_size:
+            raise ValueError("truncated")
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.n_points * 3 * self._dtype.itemsize
+
+    def frame(self, index: int) -> np.ndarray:
+        """(nPoints, 3) float32 positions of one frame."""
+        if not 0 <= index < self.n_frames:
+            raise IndexError(f"Frame {index} out of range [0, {self.n_frames})")
+        self._file.seek(self._data_offset + index * self.frame_bytes)
+        data = np.fromfile(self._file, dtype=self._dtype, count=self.n_points * 3)
+        return data.astype(np.float32).reshape(-1, 3)
+
+    def iter_frames(self, indices: Sequence[int] = None) -> Iterator[np.ndarray]:
+        for index in range(self.n_frames) if indices is None else indices:
+            yield self.frame(index)
+
+
+class PointCacheWriter:
+    """
+    Streams frames of (nPoints, 3) positions into a .pc2 or .mdd file.
+    Both formats store the frame count up front, so it must be known when
+    the writer is created; close() checks that exactly n_frames were written.
+    """
+
+    def __init__(self, file_path: str, n_points: int, n_frames: int, fmt: str = 'PC2',
+                 frame_duration: float = 1.0, start_frame: float = 0.0):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported point cache format: {fmt}")
+        self.file_path = Path(file_path)
+        self.n_points = n_points
+        self.n_frames = n_frames
+        self.fmt = fmt
+        self.frame_duration = frame_duration
+        self.start_frame = start_frame
+        self.frames_written = 0
+        self._file = None
+        self._dtype = '<f4' if fmt == 'PC2' else '>f4'
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            self.file_path.unlink(missing_ok=True)
+
+    def open(self):
+        self._file = self.file_path.open('wb')
+        if self.fmt == 'PC2':
+            self._file.write(PC2_HEADER.pack(PC2_MAGIC, 1, self.n_points, self.start_frame, 1.0, self.n_frames))
+        else:
+            self._file.write(MDD_HEADER.pack(self.n_frames, self.n_points))
+            times = np.arange(self.n_frames, dtype=np.float64) * self.frame_duration
+            self._file.write(times.astype('>f4').tobytes())
+
+    def write_frame(self, positions: np.ndarray):
+        positions = np.asarray(positions)
+        if positions.shape != (self.n_points, 3):
+            raise ValueError(f"Expected ({self.n_points}, 3) positions, got {positions.shape}")
+        self._file.write(positions.astype(self._dtype, copy=False).tobytes())
+        self.frames_written += 1
+
+    def close(self):
+        self._file.close()
+        if self.frames_written != self.n_frames:
+            self.file_path.unlink(missing_ok=True)
+            raise ValueError(f"Expected {self.n_frames} frames, got {self.frames_written}")
+
+
+def write_point_cache(file_path: str, frames: Iterable[np.ndarray], n_points: int, n_frames: int,
+                      fmt: str = 'PC2', frame_duration: float = 1.0):
+    with PointCacheWriter(file_path, n_points, n_frames, fmt, frame_duration) as writer:
+        for positions in frames:
+            writer.write_frame(positions)
+
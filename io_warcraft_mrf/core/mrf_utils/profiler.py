@@ -0,0 +1,169 @@
+# Opt-in per-stage instrumentation for import/export. Code under test wraps
+# its stages in `with profiler.stage('name'):`; the default NULL_PROFILER
+# returns a shared no-op context manager, so uninstrumented runs pay one
+# attribute lookup and call per stage.
+#
+# Stage times are inclusive: a stage that drives a keyframe generator (e.g.
+# write.keyframes during a streamed export) also contains the sampling time.
+
+import json
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_HISTOGRAM_BINS = 10
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullProfiler:
+    """Profiler interface that records nothing."""
+    enabled = False
+
+    def stage(self, name: str) -> _NullStage:
+        return _NULL_STAGE
+
+    def summary(self) -> dict:
+        return {}
+
+    def report_lines(self, limit: Optional[int] = None) -> List[str]:
+        return []
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _StageStats:
+    __slots__ = ('calls', 'durations', 'peak')
+
+    def __init__(self):
+        self.calls = 0
+        self.durations: List[float] = []
+        self.peak = 0  # Bytes allocated above the level at stage entry, max over calls
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start', 'base', 'peak')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._exit(self)
+        return False
+
+
+class Profiler:
+    """
+    Records wall time and call count per stage, the distribution of the
+    per-call times (stages called once per frame give per-frame timing
+    histograms) and, with trace_memory, the tracemalloc peak of each stage
+    above the memory in use when it was entered. Nested stages are allowed.
+    """
+    enabled = True
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, _StageStats] = {}
+        self._stack: List[_Stage] = []
+        self._started_tracing = False
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def _enter(self, stage: _Stage):
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            # reset_peak() below would lose the enclosing stages' peak so far
+            for outer in self._stack:
+                outer.peak = max(outer.peak, peak)
+            tracemalloc.reset_peak()
+            stage.base = stage.peak = current
+        self._stack.append(stage)
+        stage.start = time.perf_counter()
+
+    def _exit(self, stage: _Stage):
+        elapsed = time.perf_counter() - stage.start
+        self._stack.pop()
+        stats = self.stages.get(stage.name)
+        if stats is None:
+            stats = self.stages[stage.name] = _StageStats()
+        stats.calls += 1
+        stats.durations.append(elapsed)
+
+        if self.trace_memory:
+            peak = max(stage.peak, tracemalloc.get_traced_memory()[1])
+            stats.peak = max(stats.peak, peak - stage.base)
+            for outer in self._stack:
+                outer.peak = max(outer.peak, peak)
+            if not self._stack and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def summary(self) -> dict:
+        """Stage name -> totals, per-call percentiles and a log-spaced histogram."""
+        result = {}
+        for name, stats in self.stages.items():
+            durations = np.array(stats.durations)
+            entry = {
+                'calls': stats.calls,
+                'total_s': float(durations.sum()),
+                'mean_ms': float(durations.mean() * 1e3),
+            }
+            if self.trace_memory:
+                entry['peak_bytes'] = stats.peak
+            if stats.calls > 1:
+                p50, p95 = np.percentile(durations, (50, 95))
+                entry.update(min_ms=float(durations.min() * 1e3), p50_ms=float(p50 * 1e3),
+                             p95_ms=float(p95 * 1e3), max_ms=float(durations.max() * 1e3))
+                entry['histogram'] = _histogram(durations)
+            result[name] = entry
+        return result
+
+    def report_lines(self, limit: Optional[int] = None) -> List[str]:
+        """One line per stage, slowest first."""
+        lines = []
+        entries = sorted(self.summary().items(), key=lambda item: -item[1]['total_s'])
+        for name, entry in entries[:limit]:
+            line = f"{name}: {entry['total_s'] * 1e3:.1f} ms"
+            if entry['calls'] > 1:
+                line += f" ({entry['calls']} calls, median {entry['p50_ms']:.2f} ms, p95 {entry['p95_ms']:.2f} ms)"
+            if 'peak_bytes' in entry:
+                line += f", peak {entry['peak_bytes'] / 1e6:.1f} MB"
+            lines.append(line)
+        return lines
+
+    def write_json(self, file_path: str, **metadata):
+        with open(file_path, 'w') as f:
+            json.dump({**metadata, 'stages': self.summary()}, f, indent=2)
+
+
+def _histogram(durations: np.ndarray) -> dict:
+    """Counts over log-spaced bins between the fastest and slowest call (edges in ms)."""
+    low, high = max(durations.min(), 1e-7), max(durations.max(), 1e-7)
+    if high <= low:
+        return {'edges_ms': [low * 1e3, high * 1e3], 'counts': [len(durations)]}
+    edges = np.geomspace(low, high, _HISTOGRAM_BINS + 1)
+    counts, _ = np.histogram(durations, edges)
+    return {'edges_ms': (edges * 1e3).tolist(), 'counts': counts.tolist()}
@@ -0,0 +1,219 @@
+# See spec for details: https://github.com/wiselencave/Warcraft_MRF_Blender/blob/main/mrf_spec.md
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from .header import Header
+from .model_data import ArrayModelData
+from .binary_utils import KEYFRAME_DTYPE, TRIANGLE_DTYPE, VECTOR2_DTYPE
+
+# The first 80 bytes the game copies into memory (magic .. mapping offset).
+HEADER_STRUCT = struct.Struct('<4s3If3fffI6I3I')
+HEADER_SIZE = HEADER_STRUCT.size
+
+
+class MRFReader:
+    """
+    Memory-mapped, lazy random access to an .mrf file.
+
+    Only the 80-byte header and the keyframe offset table are parsed on open.
+    Keyframes are served on demand as read-only views into the mapping, so
+    the cost is proportional to the frames actually touched. Offsets are used
+    as stored: out-of-order or non-contiguous keyframe chunks are supported.
+
+    Arrays returned by this class are only valid while the reader is open.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = Path(file_path)
+        self.header: Optional[Header] = None
+        self.keyframe_offsets: Optional[np.ndarray] = None
+        self._file = None
+        self._map = None
+        self._faces = None
+        self._uvs = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.header.nFrames
+
+    def __getitem__(self, index: Union[int, slice]) -> np.ndarray:
+        if isinstance(index, slice):
+            return self.keyframes(index)
+        return self.keyframe(index)
+
+    @property
+    def file_size(self) -> int:
+        return len(self._map)
+
+    @property
+    def keyframe_size(self) -> int:
+        return self.header.nVerts * KEYFRAME_DTYPE.itemsize
+
+    def open(self):
+        self._file = self.file_path.open('rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty file: {self.file_path}")
+        try:
+            self.header = self._read_header()
+        except ValueError:
+            self.close()
+            raise
+
+    def close(self):
+        self._faces = None
+        self._uvs = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Views handed out by keyframe() are still alive;
+                # the mapping is released once they are garbage collected.
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_header(self) -> Header:
+        if self.file_size < HEADER_SIZE:
+            raise ValueError("File is smaller than the 80-byte header")
+
+        fields = HEADER_STRUCT.unpack_from(self._map, 0)
+        magic, nFrames, nVerts, nIndices, frameDuration = fields[:5]
+        if magic != b'Morf':
+            raise ValueError("Invalid magic header")
+
+        table_end = HEADER_SIZE + nFrames * 4
+        if table_end > self.file_size:
+            raise ValueError("Keyframe offset table extends past end of file")
+        self.keyframe_offsets = np.frombuffer(self._map, dtype='<u4', count=nFrames, offset=HEADER_SIZE)
+
+        return Header(
+            nFrames=nFrames,
+            nVerts=nVerts,
+            nIndices=nIndices,
+            frameDuration=frameDuration,
+            pivot=tuple(fields[5:8]),
+            boundsRadius=fields[8],
+            elapsedTime=fields[9],
+            debugFlag=fields[10],
+            reserved_data=tuple(fields[11:17]),
+            offsets={
+                'texture': fields[17],
+                'faces': fields[18],
+                'mapping': fields[19],
+                'keyframes': self.keyframe_offsets.tolist(),
+            }
+        )
+
+    def _view(self, dtype: np.dtype, count: int, offset: int, name: str) -> np.ndarray:
+        if offset + dtype.itemsize * count > self.file_size:
+            raise ValueError(f"{name} at offset {offset} extends past end of file")
+        return np.frombuffer(self._map, dtype=dtype, count=count, offset=offset)
+
+    # === Static data ===
+
+    @property
+    def texture_path(self) -> str:
+        start = self.header.offsets['texture']
+        end = self.header.offsets['faces']
+        return self._map[start:end].rstrip(b'\x00').decode('ascii')
+
+    @property
+    def faces(self) -> np.ndarray:
+        if self._faces is None:
+            self._faces = self._view(TRIANGLE_DTYPE, self.header.nIndices // 3,
+                                     self.header.offsets['faces'], "Face data")
+        return self._faces
+
+    @property
+    def uvs(self) -> np.ndarray:
+        # Flipped copy, as returned by MRFParser
+        if self._uvs is None:
+            raw = self._view(VECTOR2_DTYPE, self.header.nVerts, self.header.offsets['mapping'], "Mapping data")
+            uvs = raw.astype(np.float64)
+            uvs[:, 1] = 1 - uvs[:, 1]
+            self._uvs = uvs
+        return self._uvs
+
+    # === Keyframes ===
+
+    def keyframe(self, index: int) -> np.ndarray:
+        """Zero-copy (nVerts,) KEYFRAME_DTYPE view of one keyframe."""
+        n = self.header.nFrames
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(f"Keyframe index {index} out of range [0, {n})")
+        return self._view(KEYFRAME_DTYPE, self.header.nVerts, int(self.keyframe_offsets[index]), f"Keyframe {index}")
+
+    def keyframes(self, frames: Union[slice, Sequence[int], None] = None) -> np.ndarray:
+        """
+        (n, nVerts) KEYFRAME_DTYPE array for a slice or list of frame indices.
+        A zero-copy strided view is returned when the selected chunks are
+        evenly spaced in ascending order; otherwise the frames are gathered
+        into a new array.
+        """
+        if frames is None:
+            frames = slice(None)
+        if isinstance(frames, slice):
+            indices = np.arange(self.header.nFrames)[frames]
+        else:
+            indices = np.asarray(frames, dtype=np.int64)
+            indices = np.where(indices < 0, indices + self.header.nFrames, indices)
+            if len(indices) and (indices.min() < 0 or indices.max() >= self.header.nFrames):
+                raise IndexError("Keyframe index out of range")
+
+        nVerts = self.header.nVerts
+        if len(indices) == 0:
+            return np.empty((0, nVerts), dtype=KEYFRAME_DTYPE)
+
+        offsets = self.keyframe_offsets[indices].astype(np.int64)
+        strides = np.diff(offsets)
+        chunk = self.keyframe_size
+        if len(indices) == 1 or (strides[0] >= chunk and np.all(strides == strides[0])):
+            stride = int(strides[0]) if len(strides) else chunk
+            last = int(offsets[-1]) + chunk
+            if last > self.file_size:
+                raise ValueError(f"Keyframe at offset {offsets[-1]} extends past end of file")
+            return np.ndarray(
+                shape=(len(indices), nVerts),
+                dtype=KEYFRAME_DTYPE,
+                buffer=self._map,
+                offset=int(offsets[0]),
+                strides=(stride, KEYFRAME_DTYPE.itemsize),
+            )
+
+        out = np.empty((len(indices), nVerts), dtype=KEYFRAME_DTYPE)
+        for i, index in enumerate(indices):
+            out[i] = self.keyframe(int(index))
+        return out
+
+    def iter_keyframes(self):
+        for i in range(self.header.nFrames):
+            yield self.keyframe(i)
+
+    def to_model_data(self) -> ArrayModelData:
+        """Materializes the whole file as ArrayModelData (copies)."""
+        keyframes = self.keyframes()
+        return ArrayModelData(
+            self.header,
+            self.texture_path,
+            self.faces.copy(),
+            self.uvs.copy(),
+            keyframes.view('<f4').reshape(len(keyframes), self.header.nVerts, 2, 3).copy(),
+        )
@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+_BLOCK_ELEMENTS = 1 << 16  # Source frames * vertices checked per block
+
+
+@dataclass
+class ResampleResult:
+    keyframes: np.ndarray  # (nFrames', nVerts, 2, 3) float32
+    frame_duration: float
+    max_error: float       # worst position error against the source frames
+
+
+def resample(keyframes: np.ndarray, n_frames: int) -> np.ndarray:
+    """
+    Resamples (nFrames, nVerts, 2, 3) keyframes to n_frames uniformly spaced
+    frames covering the same time span, with linear interpolation.
+    Normals are interpolated and renormalized.
+    """
+    src_frames = len(keyframes)
+    if n_frames == src_frames:
+        return keyframes
+
+    times = np.linspace(0.0, src_frames - 1, n_frames)
+    lo = np.minimum(np.floor(times).astype(np.int64), src_frames - 2)
+    weight = (times - lo).astype(np.float32)[:, None, None, None]
+
+    out = keyframes[lo] * (1 - weight) + keyframes[lo + 1] * weight
+    normals = out[:, :, 1]
+    lengths = np.linalg.norm(normals, axis=2, keepdims=True)
+    out[:, :, 1] = normals / np.where(lengths > 0, lengths, 1.0)
+    return out.astype(np.float32, copy=False)
+
+
+def interpolation_error(keyframes: np.ndarray, resampled: np.ndarray) -> float:
+    """
+    Largest vertex position distance between every source frame and the
+    linear interpolation of the resampled frames at the same time,
+    i.e. what the game would show in place of the source frame.
+    """
+    src_frames, n_frames = len(keyframes), len(resampled)
+    if n_frames == src_frames:
+        return 0.0
+
+    times = np.arange(src_frames) * ((n_frames - 1) / (src_frames - 1))
+    lo = np.minimum(np.floor(times).astype(np.int64), n_frames - 2)
+    weight = (times - lo)[:, None, None]
+
+    positions = resampled[:, :, 0].astype(np.float64)
+    rebuilt = positions[lo] * (1 - weight) + positions[lo + 1] * weight
+    diff = rebuilt - keyframes[:, :, 0]
+    return float(np.sqrt(np.einsum('fvi,fvi->fv', diff, diff).max()))
+
+
+def candidate_counts(src_frames: int) -> List[int]:
+    """
+    Frame counts of the source rate divided by an integer stride s
+    (rounded to keep the time span), ascending: about 2 * sqrt(src_frames)
+    counts instead of every count from 2 to src_frames.
+    """
+    span = src_frames - 1
+    return sorted({round(span / stride) + 1 for stride in range(1, span + 1)} - {1})
+
+
+def _max_error_within(positions: np.ndarray, n_frames: int, max_error: float) -> Optional[float]:
+    """
+    interpolation_error of resample() to n_frames, computed on positions
+    alone and block by block; None as soon as a block exceeds max_error.
+    """
+    src_frames, n_verts = positions.shape[:2]
+    to_resampled = (n_frames - 1) / (src_frames - 1)
+    # Source time of every resampled frame, as in resample()
+    resampled_times = np.linspace(0.0, src_frames - 1, n_frames)
+    block = max(1, _BLOCK_ELEMENTS // max(1, n_verts))
+    worst = 0.0
+    for start in range(0, src_frames, block):
+        times = np.arange(start, min(start + block, src_frames)) * to_resampled
+        lo = np.minimum(np.floor(times).astype(np.int64), n_frames - 2)
+        needed = np.arange(lo[0], lo[-1] + 2)
+
+        # The resampled frames these source frames fall between, as resample() computes them
+        src_times = resampled_times[needed]
+        src_lo = np.minimum(np.floor(src_times).astype(np.int64), src_frames - 2)
+        weight = (src_times - src_lo).astype(np.float32)[:, None, None]
+        resampled = (positions[src_lo] * (1 - weight) + positions[src_lo + 1] * weight).astype(np.float64)
+
+        local = lo - lo[0]
+        weight = (times - lo)[:, None, None]
+        rebuilt = resampled[local] * (1 - weight) + resampled[local + 1] * weight
+        diff = rebuilt - positions[start:start + len(times)]
+        error = float(np.sqrt(np.einsum('fvi,fvi->fv', diff, diff).max()))
+        if error > max_error:
+            return None
+        worst = max(worst, error)
+    return worst
+
+
+def find_resample(keyframes: np.ndarray, frame_duration: float, max_error: float) -> ResampleResult:
+    """
+    Lowest frame rate among the source rate divided by an integer stride
+    (see candidate_counts) whose linear interpolation stays within
+    max_error of every source frame. The error is not monotonic in the
+    frame count (periodic motion can fit at n frames and not at n + 1), so
+    candidates are tried from the lowest rate up; each one is checked in
+    blocks of frames and dropped at the first block over max_error.
+    """
+    src_frames = len(keyframes)
+    if src_frames <= 2:
+        return ResampleResult(keyframes, frame_duration, 0.0)
+
+    positions = keyframes[:, :, 0]
+    for n in candidate_counts(src_frames)[:-1]:
+        error = _max_error_within(positions, n, max_error)
+        if error is not None:
+            duration = frame_duration * (src_frames - 1) / (n - 1)
+            return ResampleResult(resample(keyframes, n), duration, error)
+    return ResampleResult(keyframes, frame_duration, 0.0)
@@ -0,0 +1,270 @@
+# See spec for details: https://github.com/wiselencave/Warcraft_MRF_Blender/blob/main/mrf_spec.md
+# Structural checks for .mrf files and in-memory models. Every check is one
+# array operation over the offset table, the faces or a block of keyframes,
+# so a file validates in milliseconds.
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List
+
+import numpy as np
+
+from .header import Header
+from .model_data import ModelData
+from .reader import MRFReader, HEADER_SIZE
+
+MAX_VERTS = 0xFFFF            # Face indices are uint16
+ALIGNMENT = 16                # Chunk alignment used by the game's own files
+NORMAL_TOLERANCE = 1e-3       # Allowed deviation of a normal's length from 1
+_FRAME_BLOCK = 64             # Keyframes checked per array operation
+
+
+@dataclass
+class ValidationReport:
+    errors: List[str] = field(default_factory=list)    # The game would crash or show garbage
+    warnings: List[str] = field(default_factory=list)  # Suspicious but loadable
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self):
+        if self.errors:
+            raise ValueError('; '.join(self.errors))
+
+
+def _check_header(report: ValidationReport, header: Header):
+    if header.nVerts > MAX_VERTS:
+        report.errors.append(f"nVerts {header.nVerts} exceeds the uint16 face index range ({MAX_VERTS})")
+    if header.nIndices % 3:
+        report.errors.append(f"nIndices {header.nIndices} is not divisible by 3")
+    if header.nFrames == 0:
+        report.errors.append("nFrames is 0")
+    if not np.isfinite(header.frameDuration) or header.frameDuration <= 0:
+        report.errors.append(f"frameDuration {header.frameDuration} is not a positive number")
+    if not np.all(np.isfinite([*header.pivot, header.boundsRadius, header.elapsedTime])):
+        report.errors.append("Pivot, boundsRadius or elapsedTime is NaN or infinite")
+
+
+def _check_faces(report: ValidationReport, faces: np.ndarray, n_verts: int):
+    if faces.size == 0:
+        report.warnings.append("Mesh has no faces")
+        return
+    bad = np.count_nonzero(faces >= n_verts)
+    if bad:
+        report.errors.append(f"{bad} face indices >= nVerts {n_verts} (max {int(faces.max())})")
+    degenerate = np.count_nonzero((faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2])
+                                  | (faces[:, 0] == faces[:, 2]))
+    if degenerate:
+        report.warnings.append(f"{degenerate} degenerate faces")
+
+
+class _KeyframeStats:
+    """Accumulates per-block NaN/Inf and normal length findings."""
+
+    def __init__(self, normal_tolerance: float):
+        self.normal_tolerance = normal_tolerance
+        self.bad_position_frames = []
+        self.bad_normal_frames = []
+        self.non_unit = 0
+        self.worst_length = 1.0
+
+    def add(self, first_frame: int, keyframes: np.ndarray):
+        """keyframes: (frames, nVerts, 2, 3) float32, may be a strided view."""
+        flat = keyframes.reshape(len(keyframes), -1)
+        # min/max propagate NaN and expose Inf without a full-size boolean mask
+        finite = np.isfinite(flat.min(axis=1)) & np.isfinite(flat.max(axis=1))
+        for f in np.flatnonzero(~finite).tolist():
+            if not np.isfinite(keyframes[f, :, 0]).all():
+                self.bad_position_frames.append(first_frame + f)
+            if not np.isfinite(keyframes[f, :, 1]).all():
+                self.bad_normal_frames.append(first_frame + f)
+
+        normals = keyframes[finite, :, 1] if not finite.all() else keyframes[:, :, 1]
+        x, y, z = normals[..., 0], normals[..., 1], normals[..., 2]
+        squared = x * x + y * y + z * z
+        low, high = (1 - self.normal_tolerance) ** 2, (1 + self.normal_tolerance) ** 2
+        non_unit = np.count_nonzero((squared < low) | (squared > high))
+        if non_unit:
+            self.non_unit += int(non_unit)
+            lengths = np.sqrt(squared.reshape(-1))
+            worst = float(lengths[np.abs(lengths - 1).argmax()])
+            if abs(worst - 1) > abs(self.worst_length - 1):
+                self.worst_length = worst
+
+    def report(self, report: ValidationReport):
+        for name, frames in (('positions', self.bad_position_frames), ('normals', self.bad_normal_frames)):
+            if frames:
+                shown = ', '.join(map(str, frames[:5])) + (', ...' if len(frames) > 5 else '')
+                report.errors.append(f"NaN or infinite {name} in {len(frames)} keyframes ({shown})")
+        if self.non_unit:
+            report.warnings.append(f"{self.non_unit} non-unit normals (worst length {self.worst_length:.4f})")
+
+
+def _check_layout(report: ValidationReport, header: Header, offsets: np.ndarray, file_size: int,
+                  keyframe_size: int) -> np.ndarray:
+    """
+    Checks the static chunk offsets and the keyframe table against the file
+    size and each other. Returns a mask of keyframes that lie inside the file.
+    """
+    table_end = HEADER_SIZE + 4 * header.nFrames
+    texture, faces, mapping = (header.offsets[k] for k in ('texture', 'faces', 'mapping'))
+    chunks = [
+        ('Texture path', texture, faces),
+        ('Face data', faces, faces + 2 * header.nIndices),
+        ('Mapping data', mapping, mapping + 8 * header.nVerts),
+    ]
+    if not table_end <= texture < faces:
+        report.errors.append(f"Texture offset {texture} is not between the offset table end ({table_end}) "
+                             f"and the face offset {faces}")
+    for name, start, end in chunks:
+        if end > file_size:
+            report.errors.append(f"{name} [{start}, {end}) extends past end of file ({file_size} bytes)")
+        if start % ALIGNMENT:
+            report.warnings.append(f"{name} offset {start} is not {ALIGNMENT}-byte aligned")
+
+    starts = offsets.astype(np.int64)
+    ends = starts + keyframe_size
+    inside = (starts >= table_end) & (ends <= file_size)
+    if not inside.all():
+        report.errors.append(f"{np.count_nonzero(~inside)} keyframe(s) outside the data area "
+                             f"(first: keyframe {int(np.argmin(inside))} at offset {int(starts[~inside][0])})")
+    misaligned = np.count_nonzero(starts % ALIGNMENT)
+    if misaligned:
+        report.warnings.append(f"{misaligned} keyframe offsets are not {ALIGNMENT}-byte aligned")
+    if np.any(np.diff(starts) <= 0):
+        report.warnings.append("Keyframe offsets are not strictly increasing")
+
+    # Overlaps between any two chunks: sort by start, compare with the running end
+    all_starts = np.concatenate(([start for _, start, _ in chunks], starts))
+    all_ends = np.concatenate(([end for _, _, end in chunks], ends))
+    nonempty = all_ends > all_starts
+    all_starts, all_ends = all_starts[nonempty], all_ends[nonempty]
+    order = np.argsort(all_starts, kind='stable')
+    running_end = np.maximum.accumulate(all_ends[order])
+    overlaps = np.count_nonzero(all_starts[order][1:] < running_end[:-1])
+    if overlaps:
+        report.errors.append(f"{overlaps} chunk(s) overlap an earlier chunk")
+    return inside
+
+
+def _check_reader(report: ValidationReport, reader: MRFReader, normal_tolerance: float):
+    header = reader.header
+    file_size = reader.file_size
+    _check_header(report, header)
+    inside = _check_layout(report, header, reader.keyframe_offsets, file_size, reader.keyframe_size)
+
+    if header.offsets['texture'] < header.offsets['faces'] <= file_size:
+        try:
+            reader.texture_path
+        except UnicodeDecodeError:
+            report.errors.append("Texture path is not ASCII")
+
+    if header.offsets['faces'] + 2 * header.nIndices <= file_size and header.nIndices % 3 == 0:
+        _check_faces(report, reader.faces, header.nVerts)
+
+    stats = _KeyframeStats(normal_tolerance)
+    valid = np.flatnonzero(inside)
+    for block in range(0, len(valid), _FRAME_BLOCK):
+        frames = valid[block:block + _FRAME_BLOCK]
+        keyframes = reader.keyframes(frames.tolist())
+        stats.add(int(frames[0]), keyframes.view('<f4').reshape(len(frames), -1, 2, 3))
+    stats.report(report)
+
+
+def validate_file(file_path: str, normal_tolerance: float = NORMAL_TOLERANCE) -> ValidationReport:
+    """
+    Checks an .mrf file: header fields, every offset against the file size,
+    the keyframe table (bounds, overlaps, alignment, order), face indices,
+    NaN/Inf keyframe values and normal lengths.
+    """
+    report = ValidationReport()
+    try:
+        # Magic, header size and the offset table bounds are checked on open
+        with MRFReader(file_path) as reader:
+            _check_reader(report, reader, normal_tolerance)
+    except ValueError as e:
+        report.errors.append(str(e))
+    return report
+
+
+def validate_model(model: ModelData, normal_tolerance: float = NORMAL_TOLERANCE) -> ValidationReport:
+    """
+    Pre-flight checks for a model about to be written: header fields, array
+    sizes against the header, face indices, texture path and, if they are
+    already in memory, NaN/Inf keyframe values and normal lengths.
+    Keyframes given as an iterator (streamed export) are not consumed.
+    """
+    report = ValidationReport()
+    header = model.header
+    _check_header(report, header)
+
+    try:
+        model.texture_path.encode('ascii')
+    except UnicodeEncodeError:
+        report.errors.append(f"Texture path {model.texture_path!r} is not ASCII")
+    if not model.texture_path:
+        report.warnings.append("Texture path is empty")
+
+    faces = np.asarray(model.faces, dtype=np.int64).reshape(-1, 3)
+    if faces.size != header.nIndices:
+        report.errors.append(f"{faces.size} face indices, header says nIndices {header.nIndices}")
+    _check_faces(report, faces, header.nVerts)
+
+    n_uvs = len(model.uvs)
+    if n_uvs != header.nVerts:
+        report.errors.append(f"{n_uvs} UVs, header says nVerts {header.nVerts}")
+
+    keyframes = model.keyframes
+    if not hasattr(keyframes, '__len__'):
+        return report
+    if len(keyframes) != header.nFrames:
+        report.errors.append(f"{len(keyframes)} keyframes, header says nFrames {header.nFrames}")
+    if isinstance(keyframes, np.ndarray) and keyframes.dtype.names:
+        keyframes = keyframes.view('<f4')
+
+    stats = _KeyframeStats(normal_tolerance)
+    for start in range(0, len(keyframes), _FRAME_BLOCK):
+        block = np.asarray(keyframes[start:start + _FRAME_BLOCK], dtype=np.float32)
+        block = block.reshape(len(block), -1, 2, 3)
+        if block.shape[1] != header.nVerts:
+            report.errors.append(f"Keyframes have {block.shape[1]} vertices, header says nVerts {header.nVerts}")
+            return report
+        stats.add(start, block)
+    stats.report(report)
+    return report
+
+
+class KeyframeCheck:
+    """
+    Checks keyframes pushed one at a time, in any order, as checked_keyframes
+    does for a stream: check() raises ValueError on the first keyframe with
+    NaN/Inf values, finish() adds the normal length warnings to report.
+    """
+
+    def __init__(self, report: ValidationReport, normal_tolerance: float = NORMAL_TOLERANCE):
+        self.report = report
+        self.stats = _KeyframeStats(normal_tolerance)
+
+    def check(self, index: int, frame):
+        self.stats.add(index, np.asarray(frame, dtype=np.float32).reshape(1, -1, 2, 3))
+        if self.stats.bad_position_frames or self.stats.bad_normal_frames:
+            self.stats.report(self.report)
+            self.report.raise_for_errors()
+
+    def finish(self):
+        self.stats.report(self.report)
+
+
+def checked_keyframes(keyframes: Iterable, report: ValidationReport,
+                      normal_tolerance: float = NORMAL_TOLERANCE) -> Iterator[np.ndarray]:
+    """
+    Passes streamed keyframes through to the writer, checking each one as it
+    goes by. Raises ValueError on the first keyframe with NaN/Inf values (the
+    writer then drops what it wrote); normal length warnings are added to
+    report once the stream is exhausted.
+    """
+    check = KeyframeCheck(report, normal_tolerance)
+    for i, frame in enumerate(keyframes):
+        check.check(i, frame)
+        yield frame
+    check.finish()
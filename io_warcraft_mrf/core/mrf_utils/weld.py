@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from itertools import product
+
+import numpy as np
+
+_NEIGHBOUR_OFFSETS = np.array(list(product((-1, 0, 1), repeat=3)), dtype=np.int64)
+_HASH_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+
+
+@dataclass
+class WeldResult:
+    keep: np.ndarray   # (nVerts,) bool, vertices that survive
+    remap: np.ndarray  # (nVerts,) int64, new index of every old vertex
+    faces: np.ndarray  # (nFaces', 3) remapped faces, collapsed faces removed
+
+    @property
+    def removed(self) -> int:
+        return int(len(self.keep) - np.count_nonzero(self.keep))
+
+
+def _cell_hash(cells: np.ndarray) -> np.ndarray:
+    # Collisions only add candidates, they are filtered by the distance test
+    h = cells * _HASH_PRIMES
+    return h[:, 0] ^ h[:, 1] ^ h[:, 2]
+
+
+def candidate_pairs(points: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Unique (i, j) pairs with i < j and |points[i] - points[j]| <= radius,
+    found with a spatial hash grid of cell size radius (sort + searchsorted).
+    """
+    n = len(points)
+    if n < 2 or radius <= 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    cells = np.floor(points / radius).astype(np.int64)
+    keys = _cell_hash(cells)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    found = []
+    for offset in _NEIGHBOUR_OFFSETS:
+        neighbour_keys = _cell_hash(cells + offset)
+        lo = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        hi = np.searchsorted(sorted_keys, neighbour_keys, side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        i = np.repeat(np.arange(n), counts)
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        j = order[starts + np.arange(total)]
+        mask = i < j
+        found.append(np.column_stack((i[mask], j[mask])))
+
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.unique(np.concatenate(found), axis=0)
+
+    diff = points[pairs[:, 0]] - points[pairs[:, 1]]
+    return pairs[np.einsum('ij,ij->i', diff, diff) <= radius * radius]
+
+
+def find_weld_pairs(keyframes: np.ndarray, uvs: np.ndarray, distance: float,
+                    normal_angle: float, uv_tolerance: float) -> np.ndarray:
+    """
+    Pairs of vertices that stay within tolerance in every frame:
+    position distance <= distance, angle between normals <= normal_angle
+    (radians) and UV distance <= uv_tolerance.
+    keyframes is a (nFrames, nVerts, 2, 3) array.
+    """
+    if len(keyframes) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    pairs = candidate_pairs(keyframes[0, :, 0].astype(np.float64), distance)
+
+    uv_diff = uvs[pairs[:, 0]] - uvs[pairs[:, 1]]
+    pairs = pairs[np.einsum('ij,ij->i', uv_diff, uv_diff) <= uv_tolerance * uv_tolerance]
+
+    min_cos = np.cos(normal_angle)
+    for frame in keyframes:
+        if len(pairs) == 0:
+            break
+        pos = frame[:, 0].astype(np.float64)
+        nrm = frame[:, 1].astype(np.float64)
+        a, b = pairs[:, 0], pairs[:, 1]
+
+        diff = pos[a] - pos[b]
+        within = np.einsum('ij,ij->i', diff, diff) <= distance * distance
+
+        dot = np.einsum('ij,ij->i', nrm[a], nrm[b])
+        lengths = np.linalg.norm(nrm[a], axis=1) * np.linalg.norm(nrm[b], axis=1)
+        within &= dot >= min_cos * lengths
+
+        pairs = pairs[within]
+    return pairs
+
+
+def weld(keyframes: np.ndarray, faces: np.ndarray, uvs: np.ndarray, distance: float,
+         normal_angle: float, uv_tolerance: float) -> WeldResult:
+    """
+    Merges vertices that stay within tolerance across the whole animation.
+    Each group is represented by its lowest-index vertex and every member is
+    within tolerance of that vertex (no transitive chains), so the surviving
+    vertex data is used unchanged. Faces that collapse are dropped.
+    """
+    n = keyframes.shape[1]
+    pairs = find_weld_pairs(keyframes, uvs, distance, normal_angle, uv_tolerance)
+
+    # Pairs are sorted by (i, j), i < j: j has not become a representative yet
+    rep = np.arange(n)
+    for i, j in pairs.tolist():
+        if rep[i] == i and rep[j] == j:
+            rep[j] = i
+
+    keep = rep == np.arange(n)
+    new_index = np.cumsum(keep) - 1
+    remap = new_index[rep]
+
+    new_faces = remap[faces]
+    valid = ((new_faces[:, 0] != new_faces[:, 1]) &
+             (new_faces[:, 1] != new_faces[:, 2]) &
+             (new_faces[:, 0] != new_faces[:, 2]))
+    return WeldResult(keep=keep, remap=remap, faces=new_faces[valid])
@@ -1,40 +1,269 @@
 # See spec for details: https://github.com/wiselencave/Warcraft_MRF_Blender/blob/main/mrf_spec.md
 
-from os import path, makedirs
+import mmap
+from os import path, makedirs, remove, replace
 from io import BytesIO
+from shutil import copyfile
 from typing import List, Tuple
+
+import numpy as np
+
 from .model_data import ModelData
+from .profiler import NULL_PROFILER
 from .header import Header
 from .binary_utils import (
     write_uint32, write_float, write_vector2, write_vector3,
-    write_triangle, align16
+    write_triangle, align16, KEYFRAME_DTYPE
 )
 
 
+UPDATE_BUFFER_BYTES = 64 * 1024 * 1024  # Changed chunks held for an in-place update
+
+
+def _aligned(size: int) -> int:
+    return size + (16 - size % 16) % 16
+
+
+def mrf_file_size(nFrames: int, nVerts: int, nIndices: int, texture_path: str) -> int:
+    """Size in bytes of the file MRFWriter produces for these counts."""
+    return (_aligned(80 + 4 * nFrames)
+            + _aligned(len(texture_path.encode('ascii')))
+            + _aligned(nIndices * 2)
+            + _aligned(nVerts * 8)
+            + nFrames * _aligned(nVerts * 24))
+
+
+class _PatchCopy:
+    """
+    Copy of a file made on the first write() and patched through a memory
+    map, for updates that change more than UPDATE_BUFFER_BYTES; commit() replaces the original with it, discard() removes it.
+    """
+
+    def __init__(self, target: str):
+        self.target = target
+        self.temp_path = target + '.tmp'
+        self._file = None
+        self._map = None
+
+    def write(self, offset: int, data: bytes):
+        if self._map is None:
+            copyfile(self.target, self.temp_path)
+            self._file = open(self.temp_path, 'r+b')
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        self._map[offset:offset + len(data)] = data
+
+    def _close(self) -> bool:
+        if self._map is None:
+            return False
+        self._map.close()
+        self._file.close()
+        self._map = self._file = None
+        return True
+
+    def commit(self):
+        if self._close():
+            replace(self.temp_path, self.target)
+
+    def discard(self):
+        self._close()
+        if path.exists(self.temp_path):
+            remove(self.temp_path)
+
+
 class MRFWriter:
     # Signature field: occupies 24 unused bytes in the header.
     # Can be used for export metadata or custom tool identifiers.
     _DEFAULT_SIGNATURE = b'Exported by Wiselen'
 
-    def __init__(self, model: ModelData, signature: bool = True, make_game_copy: bool = False):
+    def __init__(self, model: ModelData, signature: bool = True, make_game_copy: bool = False,
+                 profiler=NULL_PROFILER):
         self.model = model
-        self.buffer = BytesIO()
+        self.profiler = profiler
+        self.buffer = None
         self.offsets = {}
         self.signature = signature
         self.make_game_copy = make_game_copy
+        self.incremental = False
+        self.temp_path = None
+        self._original = self._original_file = None
 
     def write(self, file_path: str):
-        self._write_header_stub()
-        self._write_chunks()
-        self._patch_header_offsets()
+        """
+        Streams the file straight to disk: the header and offset table are
+        reserved first, chunks are written as they are produced (keyframes
+        may come from any iterator, e.g. a generator) and the offsets are
+        patched with a single seek back at the end.
+        The data goes to a temporary file next to the target, which replaces
+        the target only once it is complete: if producing the keyframes
+        fails or is interrupted, an existing file is left as it was.
+        With make_game_copy the file is written directly to the game path.
+        """
+        with self.profiler.stage('write'):
+            self._write_all(file_path, incremental=False)
 
-        if self.make_game_copy:
-            self._make_game_ready_copy(file_path)
+    def update(self, file_path: str) -> int:
+        """
+        Incremental counterpart of write(). If the target already exists with
+        the same layout (frame, vertex and index counts, texture path length,
+        hence the same size and offsets), it is compared with the new data
+        chunk by chunk and only the chunks whose bytes differ are written,
+        in place, once every keyframe has been produced and checked; an
+        unchanged file is not written to at all. Changed chunks are kept in
+        memory until then, up to UPDATE_BUFFER_BYTES; past that, they go to
+        a copy of the file that replaces it at the end. Either way a failure
+        midway leaves the existing file as it was.
+        Files with a different layout are written from scratch.
+        Returns the number of keyframe chunks written.
+        """
+        with self.profiler.stage('update'):
+            return self._write_all(file_path, incremental=True)
+
+    def _write_all(self, file_path: str, incremental: bool) -> int:
+        self.open(file_path, incremental)
+        try:
+            for index, frame in enumerate(self.model.keyframes):
+                self.put_keyframe(index, frame)
+            return self.close()
+        except BaseException:
+            self.abort()
+            raise
+
+    # Push interface: open(), put_keyframe() for every frame in any order,
+    # then close(), or abort() to leave the target untouched. write() and
+    # update() pull the model's keyframes through it; callers that produce
+    # keyframes over time (the modal export operator) push them directly.
+
+    def open(self, file_path: str, incremental: bool = False):
+        """Starts a write (or with incremental, an update) of the model's header and static data."""
+        target = self._game_ready_path(file_path) if self.make_game_copy else file_path
+        h = self.model.header
+        self.target = target
+        self.chunk_size = _aligned(h.nVerts * 24)
+        self.filled = np.zeros(h.nFrames, dtype=bool)
+        self.written = 0
+
+        size = mrf_file_size(h.nFrames, h.nVerts, h.nIndices, self.model.texture_path)
+        if incremental and path.isfile(target) and path.getsize(target) == size:
+            self._open_update()
+        else:
+            self._open_write()
+
+    def _open_write(self):
+        self.incremental = False
+        self.temp_path = self.target + '.tmp'
+        self.buffer = open(self.temp_path, 'wb')
+        try:
+            with self.profiler.stage('write.header'):
+                self._write_header_stub()
+            with self.profiler.stage('write.static_chunks'):
+                self._write_static_chunks()
+        except BaseException:
+            self.abort()
+            raise
+        # Keyframe chunks have a fixed size, so every one has a known place
+        start = self.buffer.tell()
+        self.keyframe_offsets = [start + i * self.chunk_size for i in range(self.model.header.nFrames)]
+
+    def _open_update(self):
+        self.incremental = True
+        with self.profiler.stage('update.prefix'):
+            prefix = self._build_prefix()
+        self._changes = []  # (offset, bytes) written over the target on close()
+        self._changed_bytes = 0
+        self._patch = None
+        self._original_file = open(self.target, 'rb')
+        self._original = mmap.mmap(self._original_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._original[:len(prefix)] != prefix:
+            self._change(0, prefix)
+
+    def put_keyframe(self, index: int, keyframe):
+        """Writes (or with an update, compares) keyframe number index."""
+        with self.profiler.stage('update.keyframe' if self.incremental else 'write.keyframe'):
+            chunk = self._build_keyframe_chunk(keyframe)
+            n_frames = self.model.header.nFrames
+            if not 0 <= index < n_frames or len(chunk) != self.chunk_size:
+                raise ValueError(f"Keyframe {index} does not match the header ({n_frames} frames, "
+                                 f"{self.model.header.nVerts} vertices)")
+            start = self.keyframe_offsets[index]
+            if not self.incremental:
+                self.buffer.seek(start)
+                self.buffer.write(chunk)
+            elif self._original[start:start + self.chunk_size] != chunk:
+                self._change(start, chunk)
+                self.written += 1
+            self.filled[index] = True
+
+    def _change(self, offset: int, data: bytes):
+        if self._patch is None:
+            self._changes.append((offset, data))
+            self._changed_bytes += len(data)
+            if self._changed_bytes <= UPDATE_BUFFER_BYTES:
+                return
+            # Too much to hold: patch a copy of the file instead
+            self._patch = _PatchCopy(self.target)
+            for start, chunk in self._changes:
+                self._patch.write(start, chunk)
+            self._changes = []
+        else:
+            self._patch.write(offset, data)
+
+    def close(self) -> int:
+        """Finishes the file once every keyframe was put. Returns the number of keyframe chunks written."""
+        count = int(np.count_nonzero(self.filled))
+        if count != self.model.header.nFrames:
+            raise ValueError(f"Expected {self.model.header.nFrames} keyframes, got {count}")
+
+        if not self.incremental:
+            with self.profiler.stage('write.patch_offsets'):
+                self._patch_header_offsets()
+            self.buffer.close()
+            self.buffer = None
+            replace(self.temp_path, self.target)
+            return count
+
+        self._close_original()
+        if self._patch is not None:
+            self._patch.commit()
+        elif self._changes:
+            with open(self.target, 'r+b') as f:
+                for offset, data in self._changes:
+                    f.seek(offset)
+                    f.write(data)
+            self._changes = []
+        return self.written
+
+    def abort(self):
+        """Drops everything put so far; the target stays as it was before open()."""
+        if not self.incremental:
+            if self.buffer is not None:
+                self.buffer.close()
+                self.buffer = None
+            if self.temp_path is not None and path.exists(self.temp_path):
+                remove(self.temp_path)
             return
-
-        with open(file_path, 'wb') as f:
-            f.write(self.buffer.getvalue())
-      
+        self._close_original()
+        self._changes = []
+        if self._patch is not None:
+            self._patch.discard()
+
+    def _close_original(self):
+        if self._original is not None:
+            self._original.close()
+            self._original_file.close()
+            self._original = self._original_file = None
+
+    def _build_prefix(self) -> bytes:
+        """Header, offset table and static chunks exactly as write() lays them out."""
+        self.buffer = BytesIO()
+        try:
+            self._write_header_stub()
+            self._write_static_chunks()
+            start = self.buffer.tell()
+            self.keyframe_offsets = [start + i * self.chunk_size for i in range(self.model.header.nFrames)]
+            self._patch_header_offsets()
+            return self.buffer.getvalue()
+        finally:
+            self.buffer = None
 
     def _write_header_stub(self):
         m = self.model
@@ -68,7 +297,7 @@ class MRFWriter:
         self.buffer.write(b'\x00' * padding)
 
 
-    def _write_chunks(self):
+    def _write_static_chunks(self):
         self.chunk_positions = {}
 
         # Texture path
@@ -83,12 +312,6 @@ class MRFWriter:
         self.chunk_positions['mapping'] = self.buffer.tell()
         self.buffer.write(self._build_mapping_chunk())
 
-        # Keyframes
-        self.keyframe_offsets = []
-        for frame in self.model.keyframes:
-            self.keyframe_offsets.append(self.buffer.tell())
-            self.buffer.write(self._build_keyframe_chunk(frame))
-
     def _patch_header_offsets(self):
         self.buffer.seek(self.offsets['texture'])
         self.buffer.write(write_uint32(self.chunk_positions['texture']))
@@ -107,21 +330,35 @@ class MRFWriter:
         data = self.model.texture_path.encode('ascii')
         return align16(data)
 
+    # Array-backed data (ArrayModelData or keyframes yielded as arrays)
+    # is serialized with a single tobytes() call per chunk.
+
     def _build_faces_chunk(self) -> bytes:
-        raw = b''.join(write_triangle(f) for f in self.model.faces)
+        faces = self.model.faces
+        if isinstance(faces, np.ndarray):
+            return align16(faces.astype('<u2', copy=False).tobytes())
+        raw = b''.join(write_triangle(f) for f in faces)
         return align16(raw)
 
     def _build_mapping_chunk(self) -> bytes:
-        raw = b''.join(write_vector2((u, 1 - v)) for u, v in self.model.uvs)
+        uvs = self.model.uvs
+        if isinstance(uvs, np.ndarray):
+            flipped = np.column_stack((uvs[:, 0], 1 - uvs[:, 1])).astype('<f4')
+            return align16(flipped.tobytes())
+        raw = b''.join(write_vector2((u, 1 - v)) for u, v in uvs)
         return align16(raw)
 
     def _build_keyframe_chunk(self, keyframe: List[Tuple[Tuple[float, float, float], Tuple[float, float, float]]]) -> bytes:
+        if isinstance(keyframe, np.ndarray):
+            if keyframe.dtype != KEYFRAME_DTYPE:
+                keyframe = keyframe.astype('<f4', copy=False)
+            return align16(keyframe.tobytes())
         raw = b''.join(write_vector3(pos) + write_vector3(normal) for pos, normal in keyframe)
         return align16(raw)
         
-    def _make_game_ready_copy(self, original_path: str):
+    def _game_ready_path(self, original_path: str) -> str:
         """
-        Creates a game-ready copy of the file in:
+        Returns the game-ready path for the file:
         doodads\cinematic\\arthasillidanfight\
         (relative to the export directory)
         The filename is prefixed with 'arthascape'.
@@ -133,11 +370,8 @@ class MRFWriter:
         base_name = path.basename(original_path)
         name, ext = path.splitext(base_name)
         new_name = f"arthascape{name}{ext}"
-        new_path = path.join(rel_folder, new_name)
+        return path.join(rel_folder, new_name)
 
-        with open(new_path, 'wb') as f:
-            f.write(self.buffer.getvalue())
-    
     def _build_reserved_data_field(self):
         """
         Writes the 24-byte reserved field in the header:
@@ -19,12 +19,19 @@ class ExportContextBuilder:
         return self.DEFAULT_TEXTURE
 
     def get_keyframe_range(self):
+        return self.get_keyframe_ranges()[0]
+
+    def get_keyframe_ranges(self):
+        """One (start, end) clip per pair of MRF markers in timeline order: (1st, 2nd), (3rd, 4th), ..."""
         markers = [m for m in bpy.context.scene.timeline_markers if m.name.upper() == self.MARKER_RANGE_NAME]
         if len(markers) >= 2:
-            markers.sort(key=lambda m: m.frame)
-            return markers[0].frame, markers[1].frame
+            frames = sorted(m.frame for m in markers)
+            if len(frames) % 2:
+                MessageBox.show(f"Marker at frame {frames[-1]} has no pair and is ignored",
+                                f"Odd number of '{self.MARKER_RANGE_NAME}' markers", "ERROR")
+            return [(frames[i], frames[i + 1]) for i in range(0, len(frames) - 1, 2)]
         MessageBox.show(f"Default keyframe range {self.DEFAULT_RANGE} used", f"Markers '{self.MARKER_RANGE_NAME}' not found!", "ERROR")
-        return self.DEFAULT_RANGE
+        return [self.DEFAULT_RANGE]
 
     def get_elapsed_marker_frame(self, start: int, end: int) -> int:
         marker = next((m for m in bpy.context.scene.timeline_markers if m.name.upper() == self.MARKER_ELAPSED_NAME), None)
@@ -1,24 +1,59 @@
 import bpy
+import time
+from os import path
 from bpy_extras.io_utils import ExportHelper
 from bpy.types import Operator
 from ..utils.message_box import MessageBox
-from ..core.exporter import MRFExporter
+from ..core.exporter import MRFExporter, ExportJob, export_batch
 from ..core.mrf_utils.writer import MRFWriter
+from ..core.mrf_utils.profiler import Profiler, NULL_PROFILER
+from ..core.mrf_utils.validator import validate_model, checked_keyframes, KeyframeCheck
 from .context_utils import ExportContextBuilder
 
+TIMER_INTERVAL = 0.01  # Seconds between modal export steps
+STEP_BUDGET = 0.1  # Seconds of frame evaluation per step, then the UI gets control back
+
 class ExportMRFOperator(Operator, ExportHelper):
-    """Export MRF"""
+    """Export MRF. Keyframes are written as frames are evaluated; weld, resample, decimate and LODs keep the whole animation in memory first"""
     bl_idname = "export.mrf"
     bl_label = "Export MRF"
     filename_ext = ".mrf"
 
+    _timer = None
+    _streams = {}
+
     filter_glob: bpy.props.StringProperty(default="*.mrf", options={'HIDDEN'})
     scale_factor: bpy.props.FloatProperty(name="Scale Factor", default=50.0, min=0.01)
     deduplicate: bpy.props.BoolProperty(name="Deduplicate mesh", description="Removes duplicate vertices with same position, normal, and UV", default=True)
     reverse_keyframes: bpy.props.BoolProperty(name="Reverse Keyframes", description="Export keyframes in reverse order (from end to start)", default=False)
     auto_bounds: bpy.props.BoolProperty(name="Compute Pivot/Radius", description="Automatically compute pivot point and bounds radius from mesh geometry", default=False)
+    weld: bpy.props.BoolProperty(name="Weld vertices", description="Merge vertices that stay within tolerance in every exported frame", default=False)
+    weld_distance: bpy.props.FloatProperty(name="Distance", description="Maximum distance between welded vertices", default=0.0001, min=0.0, precision=5, subtype='DISTANCE')
+    weld_angle: bpy.props.FloatProperty(name="Normal Angle", description="Maximum angle between normals of welded vertices", default=0.0175, min=0.0, max=3.14159, subtype='ANGLE')
+    weld_uv: bpy.props.FloatProperty(name="UV Tolerance", description="Maximum UV distance between welded vertices", default=0.0001, min=0.0, precision=5)
+    resample: bpy.props.BoolProperty(name="Resample keyframes", description="Export at the lowest frame rate (the scene rate divided by a whole number) that stays within the maximum error", default=False)
+    resample_error: bpy.props.FloatProperty(name="Max Error", description="Maximum vertex deviation from the original animation", default=0.001, min=0.0, precision=5, subtype='DISTANCE')
+    optimize_cache: bpy.props.BoolProperty(name="Optimize vertex cache", description="Reorder triangles and vertices for the GPU vertex cache and memory locality", default=False)
+    decimate: bpy.props.BoolProperty(name="Decimate", description="Reduce the vertex count using quadric error metrics over all exported frames", default=False)
+    decimate_ratio: bpy.props.FloatProperty(name="Ratio", description="Fraction of vertices to keep", default=0.5, min=0.01, max=1.0, subtype='FACTOR')
+    decimate_error: bpy.props.FloatProperty(name="Max Error", description="Stop decimating before this error is exceeded (0 = ratio only)", default=0.0, min=0.0, precision=5, subtype='DISTANCE')
+    lod_ratios: bpy.props.StringProperty(name="LOD Ratios", description="Comma-separated vertex ratios for extra LOD files (e.g. \"0.5, 0.25\"), written as <name>_lod1.mrf, <name>_lod2.mrf, ...", default="")
+    keyframe_source: bpy.props.EnumProperty(
+        name="Keyframes",
+        description="Where vertex positions are taken from",
+        items=[('SCENE', "Scene evaluation", "Evaluate the scene at every exported frame"),
+               ('BPHYS', "Baked cloth cache", "Read the Cloth modifier's disk cache (.bphys) directly, normals are recomputed")],
+        default='SCENE',
+    )
+    world_normals: bpy.props.BoolProperty(name="World-space normals", description="Rotate normals by the object's world matrix", default=False)
     playback_delay: bpy.props.FloatProperty(name="Playback delay", description="Set animation playback delay in seconds", default=0.0, min=0.0)
     author_sign: bpy.props.BoolProperty(name="Embed export signature", description="Adds a 24-byte signature to the unused header space. Disable for clean exports", default=True)
+    batch: bpy.props.BoolProperty(name="Batch export", description="Export every selected mesh and every pair of MRF markers to its own file (<name>_<object>_clip<n>.mrf), evaluating the scene once per frame", default=False)
+    incremental: bpy.props.BoolProperty(name="Update existing file", description="If the file exists with the same frame and vertex counts, only overwrite the keyframes that changed", default=True)
+    profile: bpy.props.BoolProperty(name="Profile export", description="Report the time and peak memory of every export stage", default=False)
+    profile_json: bpy.props.BoolProperty(name="Save profile", description="Also write the stage timings, with per-frame histograms, to <name>.profile.json", default=False)
+    # Set by invoke: exports started from the UI run as a modal operator, script calls stay blocking
+    run_modal: bpy.props.BoolProperty(default=False, options={'HIDDEN', 'SKIP_SAVE'})
     game_format: bpy.props.BoolProperty(name="Pack for import", description="Make a copy and apply the path \"doodads/cinematic/arthasillidanfight/arthascape\" to it", default=False)
 
     def draw(self, context):
@@ -34,6 +69,12 @@ class ExportMRFOperator(Operator, ExportHelper):
         
         layout.prop(self, 'game_format')
         layout.prop(self, 'author_sign')
+        layout.prop(self, 'incremental')
+        layout.prop(self, 'batch')
+        layout.prop(self, 'profile')
+        row = layout.row()
+        row.enabled = self.profile
+        row.prop(self, 'profile_json')
 
         create_box(layout, "Scale Factor", 'ERROR',
                 ["Blender sizes will be too small for Warcraft!", 
@@ -42,11 +83,58 @@ class ExportMRFOperator(Operator, ExportHelper):
         
         layout.label(text="Options:")
 
+        box = layout.box()
+        box.label(text="Keyframe Source", icon='MOD_CLOTH')
+        box.label(text="A cloth baked with 'Disk Cache' can be read directly,")
+        box.label(text="without evaluating the scene at every frame.")
+        box.prop(self, 'keyframe_source')
+
         create_box(layout, "Deduplicate Mesh", 'MESH_DATA', 
                 ["Removes duplicate vertices with same position, normal, and UV.",
                     "Useful for optimizing size and animation data."],
                 'deduplicate')
 
+        box = layout.box()
+        box.label(text="Weld Vertices", icon='AUTOMERGE_ON')
+        box.label(text="Merges near-duplicate vertices (cloth seams, float noise).")
+        box.label(text="Checked across every exported frame.")
+        box.prop(self, 'weld')
+        col = box.column()
+        col.enabled = self.weld
+        col.prop(self, 'weld_distance')
+        col.prop(self, 'weld_angle')
+        col.prop(self, 'weld_uv')
+
+        box = layout.box()
+        box.label(text="Resample Keyframes", icon='IPO_LINEAR')
+        box.label(text="Lowers the frame rate while the game's linear")
+        box.label(text="interpolation stays within the maximum error.")
+        box.prop(self, 'resample')
+        col = box.column()
+        col.enabled = self.resample
+        col.prop(self, 'resample_error')
+
+        create_box(layout, "Optimize Vertex Cache", 'SORTSIZE',
+                ["Reorder triangles (Forsyth) and vertices in first-use order.",
+                    "Improves vertex cache hits and memory locality in-game."],
+                'optimize_cache')
+
+        box = layout.box()
+        box.label(text="Decimate", icon='MOD_DECIM')
+        box.label(text="Removes vertices using errors measured in every frame,")
+        box.label(text="so folds that appear mid-animation are kept.")
+        box.prop(self, 'decimate')
+        col = box.column()
+        col.enabled = self.decimate
+        col.prop(self, 'decimate_ratio')
+        col.prop(self, 'decimate_error')
+        box.prop(self, 'lod_ratios')
+
+        create_box(layout, "World-space Normals", 'NORMALS_VERTEX',
+                ["Rotate normals by the object's world matrix.",
+                    "By default normals are exported in object space."],
+                'world_normals')
+
         create_box(layout, "Playback Delay", 'TIME', 
                 ["Set animation playback delay in seconds.", 
                     "This option will overwrite the offset from the MRF_START marker."], 
@@ -62,6 +150,27 @@ class ExportMRFOperator(Operator, ExportHelper):
                 'reverse_keyframes')
 
 
+    def parse_lod_ratios(self):
+        ratios = [float(r) for r in self.lod_ratios.replace(';', ',').split(',') if r.strip()]
+        if any(not 0.0 < r <= 1.0 for r in ratios):
+            raise ValueError(f"LOD ratios must be in (0, 1]: {self.lod_ratios}")
+        return ratios
+
+    def report_stats(self, stats):
+        if 'weld_vertices' in stats:
+            self.report({'INFO'}, f"Welded {stats['weld_vertices']} vertices, "
+                                  f"saved {stats['weld_bytes']} bytes")
+        if 'decimate_before' in stats:
+            self.report({'INFO'}, f"Decimated {stats['decimate_before']} -> {stats['verts']} vertices, "
+                                  f"error {stats['decimate_error']:.6f}")
+        for i, lod in enumerate(stats.get('lods', []), start=1):
+            self.report({'INFO'}, f"LOD {i}: {lod['verts']} vertices")
+        if 'acmr_before' in stats:
+            self.report({'INFO'}, f"Vertex cache ACMR {stats['acmr_before']:.3f} -> {stats['acmr_after']:.3f}")
+        if 'resample_fps' in stats:
+            self.report({'INFO'}, f"Resampled to {stats['resample_frames']} frames at {stats['resample_fps']:.2f} FPS, "
+                                  f"max error {stats['resample_error']:.6f}, saved {stats['resample_bytes']} bytes")
+
     def check(self, context):
         return True
 
@@ -69,9 +178,237 @@ class ExportMRFOperator(Operator, ExportHelper):
         if not any(obj.type == 'MESH' for obj in bpy.context.selected_objects):
             MessageBox.show('Error!', 'No Mesh Object Selected.', 'ERROR')
             return {'CANCELLED'}
+        self.run_modal = True
         return ExportHelper.invoke(self, context, event)
 
+    def make_exporter(self, obj, kf_range=None) -> MRFExporter:
+        ctx = ExportContextBuilder(obj)
+        texture_path = ctx.get_texture_path()
+        kf_start, kf_end = kf_range if kf_range is not None else ctx.get_keyframe_range()
+        elapsed_frame = ctx.get_elapsed_marker_frame(kf_start, kf_end)
+
+        return MRFExporter(obj, self.scale_factor, texture_path, (kf_start, kf_end), 
+                           elapsed_frame=elapsed_frame, 
+                           deduplicate=self.deduplicate, 
+                           reverse_keyframes=self.reverse_keyframes, 
+                           auto_bounds=self.auto_bounds,
+                           playback_delay=self.playback_delay,
+                           transform_normals=self.world_normals,
+                           weld_distance=self.weld_distance if self.weld else 0.0,
+                           weld_angle=self.weld_angle,
+                           weld_uv=self.weld_uv,
+                           resample_error=self.resample_error if self.resample else 0.0,
+                           optimize_cache=self.optimize_cache,
+                           decimate_ratio=self.decimate_ratio if self.decimate else 1.0,
+                           decimate_error=self.decimate_error if self.decimate else 0.0,
+                           source=self.keyframe_source,
+                           profiler=self.profiler
+                           )
+
+    def write_models(self, models, file_path: str):
+        """Writes the main model to file_path and LODs to <name>_lod<i>.mrf next to it."""
+        for i, model_data in enumerate(models):
+            lod_path = file_path if i == 0 else f"{file_path[:-4]}_lod{i}.mrf"
+            # Pre-flight: refuse to write files the game would crash on
+            with self.profiler.stage('validate'):
+                validation = validate_model(model_data)
+            validation.raise_for_errors()
+            if not hasattr(model_data.keyframes, '__len__'):
+                model_data.keyframes = checked_keyframes(model_data.keyframes, validation)
+            writer = self.make_writer(model_data)
+            if self.incremental:
+                written = writer.update(lod_path)
+            else:
+                writer.write(lod_path)
+                written = None
+            self.report_written(lod_path, written, model_data.header.nFrames, validation)
+
+    def make_writer(self, model_data) -> MRFWriter:
+        return MRFWriter(model_data, signature=self.author_sign, make_game_copy=self.game_format,
+                         profiler=self.profiler)
+
+    def report_written(self, file_path: str, written, n_frames: int, validation):
+        """written: keyframes written by an incremental update, None for a full write."""
+        if written is not None:
+            self.report({'INFO'}, f"{file_path}: unchanged" if written == 0
+                        else f"{file_path}: {written} of {n_frames} keyframes written")
+        for warning in validation.warnings:
+            self.report({'WARNING'}, warning)
+
+    def make_batch_exporters(self, file_path: str):
+        """Every selected mesh x every MRF marker pair, with its output path."""
+        objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
+        if not objects:
+            raise ValueError("No mesh objects selected")
+        clips = ExportContextBuilder(objects[0]).get_keyframe_ranges()
+        base = file_path[:-4]
+
+        exporters, paths = [], []
+        for obj in objects:
+            for n, clip in enumerate(clips, start=1):
+                exporters.append(self.make_exporter(obj, clip))
+                clip_suffix = f"_clip{n}" if len(clips) > 1 else ""
+                paths.append(f"{base}_{bpy.path.clean_name(obj.name)}{clip_suffix}.mrf")
+        return exporters, paths
+
+    def write_results(self, exporters, results, paths):
+        """results: per exporter, its models, or None if it was streamed (see start_modal)."""
+        for i, (exporter, models, file_path) in enumerate(zip(exporters, results, paths)):
+            if models is None:
+                self.close_stream(i, file_path)
+            else:
+                self.write_models(models, file_path)
+            self.report_stats(exporter.stats)
+        if self.batch:
+            n_objects = len({exporter.obj.name for exporter in exporters})
+            self.report({'INFO'}, f"Exported {n_objects} object(s) x {len(exporters) // n_objects} clip(s)")
+
+    def execute_batch(self, context, file_path: str):
+        """Every selected mesh x every MRF marker pair, sampled from one scene evaluation per frame."""
+        exporters, paths = self.make_batch_exporters(file_path)
+        self.write_results(exporters, export_batch(exporters, self.parse_lod_ratios()), paths)
+
+    def report_profile(self, file_path: str):
+        if not self.profiler.enabled:
+            return
+        for line in self.profiler.report_lines():
+            self.report({'INFO'}, line)
+        if self.profile_json:
+            self.profiler.write_json(path.splitext(file_path)[0] + '.profile.json',
+                                     file=file_path, operation='export')
+
+    def start_modal(self, context, file_path: str):
+        """
+        Evaluates the frames from a timer, STEP_BUDGET seconds at a time, so
+        Blender stays responsive and the export can be cancelled with Esc.
+        Each keyframe goes to its writer as soon as it is sampled: into the
+        output's temporary file, or compared with the existing file when
+        updating. Targets are only replaced or patched once every frame has
+        been evaluated, so a cancelled export leaves them as they were.
+        Exports with whole-animation stages (weld, resample, decimate, LODs)
+        keep their keyframes in memory and are written at the end.
+        """
+        if self.batch:
+            exporters, paths = self.make_batch_exporters(file_path)
+        else:
+            exporters, paths = [self.make_exporter(context.active_object)], [file_path]
+        self._job = ExportJob(exporters, self.parse_lod_ratios(), stream=True)
+        self._paths = paths
+        self._file_path = file_path
+        self._streams = {}
+        try:
+            for i, model in self._job.streamed.items():
+                self.open_stream(i, model, paths[i])
+        except BaseException:
+            self.abort_streams()
+            raise
+        self._started = time.perf_counter()
+
+        wm = context.window_manager
+        wm.progress_begin(0, self._job.n_steps)
+        self._timer = wm.event_timer_add(TIMER_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def open_stream(self, i: int, model_data, file_path: str):
+        """Opens the writer of streamed exporter i and connects it to the job."""
+        # Pre-flight on the header and static data; keyframes are checked as they arrive
+        with self.profiler.stage('validate'):
+            validation = validate_model(model_data)
+        validation.raise_for_errors()
+        writer = self.make_writer(model_data)
+        writer.open(file_path, incremental=self.incremental)
+        check = KeyframeCheck(validation)
+        self._streams[i] = writer, check, validation
+
+        def sink(index, keyframe):
+            check.check(index, keyframe)
+            writer.put_keyframe(index, keyframe)
+        self._job.sinks[i] = sink
+
+    def close_stream(self, i: int, file_path: str):
+        writer, check, validation = self._streams.pop(i)
+        check.finish()
+        written = writer.close()
+        self.report_written(file_path, written if writer.incremental else None,
+                            writer.model.header.nFrames, validation)
+
+    def abort_streams(self):
+        for writer, _, _ in self._streams.values():
+            writer.abort()
+        self._streams = {}
+
+    def modal(self, context, event):
+        job = self._job
+        if event.type == 'ESC' and event.value == 'PRESS':
+            job.cancel()
+            self.abort_streams()
+            self.end_modal(context)
+            self.report({'WARNING'}, f"Export cancelled after {job.done} of {job.n_steps} frames, nothing written")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        try:
+            deadline = time.perf_counter() + STEP_BUDGET
+            while not job.finished and time.perf_counter() < deadline:
+                job.step()
+            if not job.finished:
+                self.show_progress(context)
+                return {'RUNNING_MODAL'}
+
+            self.end_modal(context)
+            self.write_results(job.exporters, job.finish(), self._paths)
+            self.report_profile(self._file_path)
+            return {'FINISHED'}
+        except Exception as e:
+            job.cancel()
+            self.abort_streams()
+            self.end_modal(context)
+            self.report({'ERROR'}, f"Failed to export MRF: {e}")
+            return {'CANCELLED'}
+
+    def show_progress(self, context):
+        job = self._job
+        context.window_manager.progress_update(job.done)
+        fps = job.done / max(time.perf_counter() - self._started, 1e-6)
+        context.workspace.status_text_set(
+            f"Exporting MRF: frame {job.done} of {job.n_steps}, {fps:.1f} FPS (Esc to cancel)")
+
+    def end_modal(self, context):
+        if self._timer is None:
+            return
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        self._timer = None
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
     def execute(self, context):
+        file_path = self.filepath
+        if not file_path.lower().endswith('.mrf'):
+            file_path += '.mrf'
+        self.profiler = Profiler() if self.profile else NULL_PROFILER
+
+        if self.run_modal and context.window is not None:
+            if not self.batch and (not context.active_object or context.active_object.type != 'MESH'):
+                MessageBox.show('Error!', 'No Active Mesh Object.', 'ERROR')
+                return {'CANCELLED'}
+            try:
+                return self.start_modal(context, file_path)
+            except Exception as e:
+                self.report({'ERROR'}, f"Failed to export MRF: {e}")
+                return {'CANCELLED'}
+
+        if self.batch:
+            try:
+                self.execute_batch(context, file_path)
+                self.report_profile(file_path)
+                return {'FINISHED'}
+            except Exception as e:
+                self.report({'ERROR'}, f"Failed to export MRF: {e}")
+                return {'CANCELLED'}
+
         # Export selected mesh
         obj = bpy.context.active_object
         if not obj or obj.type != 'MESH':
@@ -79,27 +416,18 @@ class ExportMRFOperator(Operator, ExportHelper):
             return {'CANCELLED'}
 
         try:
-            ctx = ExportContextBuilder(obj)
-            texture_path = ctx.get_texture_path()
-            kf_start, kf_end = ctx.get_keyframe_range()
-            elapsed_frame = ctx.get_elapsed_marker_frame(kf_start, kf_end)
-
-            exporter = MRFExporter(obj, self.scale_factor, texture_path, (kf_start, kf_end), 
-                                   elapsed_frame=elapsed_frame, 
-                                   deduplicate=self.deduplicate, 
-                                   reverse_keyframes=self.reverse_keyframes, 
-                                   auto_bounds=self.auto_bounds,
-                                   playback_delay=self.playback_delay
-                                   )
-            model_data = exporter.export_to_modeldata()
-            file_path = self.filepath
-            if not file_path.lower().endswith('.mrf'):
-                file_path += '.mrf'
-
-            writer = MRFWriter(model_data, signature=self.author_sign, make_game_copy=self.game_format)
-            writer.write(file_path)
+            exporter = self.make_exporter(obj)
 
+            lod_ratios = self.parse_lod_ratios()
+            if lod_ratios:
+                models = exporter.export_lods(lod_ratios)
+            else:
+                models = [exporter.export_to_modeldata(stream=True)]
+
+            self.write_models(models, file_path)
+            self.report_stats(exporter.stats)
+            self.report_profile(file_path)
             return {'FINISHED'}
         except Exception as e:
             self.report({'ERROR'}, f"Failed to export MRF: {e}")
-            return {'CANCELLED'}
\ No newline at end of file
+            return {'CANCELLED'}
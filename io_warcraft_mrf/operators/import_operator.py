@@ -1,7 +1,10 @@
 import bpy
+from os import path
 from bpy_extras.io_utils import ImportHelper
 from bpy.types import Operator
 from ..core.mrf_utils.parser import MRFParser
+from ..core.mrf_utils.validator import validate_file
+from ..core.mrf_utils.profiler import Profiler, NULL_PROFILER
 from ..core.importer import MRFImporter
 
 class ImportMRFOperator(Operator, ImportHelper):
@@ -14,6 +17,14 @@ class ImportMRFOperator(Operator, ImportHelper):
     filter_glob: bpy.props.StringProperty(default="*.mrf", options={'HIDDEN'})
     divisor: bpy.props.FloatProperty(name="Divisor", default=50.0, min=1.0)
     shade_smooth: bpy.props.BoolProperty(name="Shade Smooth", description="Apply Shade Smooth to imported mesh", default=False)
+    use_mesh_cache: bpy.props.BoolProperty(name="Use Mesh Cache", description="Write animation to a point cache file next to the .mrf and play it with a Mesh Cache modifier instead of shape keys", default=False)
+    cache_format: bpy.props.EnumProperty(
+        name="Cache Format",
+        items=[('PC2', "PC2", "Point Cache 2 (.pc2)"), ('MDD', "MDD", "LightWave MDD (.mdd)")],
+        default='PC2',
+    )
+    profile: bpy.props.BoolProperty(name="Profile import", description="Report the time and peak memory of every import stage", default=False)
+    profile_json: bpy.props.BoolProperty(name="Save profile", description="Also write the stage timings to <name>.profile.json next to the .mrf", default=False)
 
     def draw(self, context):
         layout = self.layout
@@ -24,16 +35,38 @@ class ImportMRFOperator(Operator, ImportHelper):
         box.prop(self, 'divisor')
         layout.label(text="Options:")
         layout.prop(self, 'shade_smooth')
+        layout.prop(self, 'use_mesh_cache')
+        row = layout.row()
+        row.enabled = self.use_mesh_cache
+        row.prop(self, 'cache_format')
+        layout.prop(self, 'profile')
+        row = layout.row()
+        row.enabled = self.profile
+        row.prop(self, 'profile_json')
 
     def check(self, context):
         return True
 
     def execute(self, context):
+        profiler = Profiler() if self.profile else NULL_PROFILER
         try:
-            parser = MRFParser(self.filepath)
+            with profiler.stage('validate'):
+                validation = validate_file(self.filepath)
+            validation.raise_for_errors()
+            parser = MRFParser(self.filepath, vectorized=True, profiler=profiler)
             parser.read()
-            importer = MRFImporter(parser.data, divisor=self.divisor, shadesmooth=self.shade_smooth)
+            cache_path = None
+            if self.use_mesh_cache:
+                cache_path = path.splitext(self.filepath)[0] + '.' + self.cache_format.lower()
+            importer = MRFImporter(parser.data, divisor=self.divisor, shadesmooth=self.shade_smooth,
+                                   cache_path=cache_path, cache_format=self.cache_format,
+                                   profiler=profiler)
             importer.import_model()
+            for line in profiler.report_lines():
+                self.report({'INFO'}, line)
+            if profiler.enabled and self.profile_json:
+                profiler.write_json(path.splitext(self.filepath)[0] + '.profile.json',
+                                    file=self.filepath, operation='import')
             return {'FINISHED'}
         except Exception as e:
             self.report({'ERROR'}, f"Failed to import MRF: {e}")
@@ -0,0 +1,29 @@
+"""
+Shared fixtures. The fake bpy layer is installed before anything imports
+the add-on, so exporter tests run without Blender:
+
+    PYTHONPATH=. python -m pytest -q tests
+"""
+
+import pytest
+
+from benchmarks import fake_bpy
+
+fake_bpy.install()
+
+from benchmarks.synthetic import make_model  # noqa: E402
+from io_warcraft_mrf.core.mrf_utils import MRFWriter  # noqa: E402
+
+
+@pytest.fixture
+def model():
+    """400-vertex cloth grid over 12 frames."""
+    return make_model(400, 12)
+
+
+@pytest.fixture
+def mrf_file(tmp_path, model):
+    file_path = str(tmp_path / 'model.mrf')
+    MRFWriter(model).write(file_path)
+    return file_path
+
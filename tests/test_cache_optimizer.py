@@ -0,0 +1,39 @@
+import numpy as np
+
+from benchmarks.synthetic import make_model
+from io_warcraft_mrf.core.mrf_utils.cache_optimizer import acmr, optimize
+
+
+def canonical(faces: np.ndarray) -> np.ndarray:
+    """Triangles as sorted rows, rotation and order independent."""
+    return np.unique(np.sort(faces, axis=1), axis=0)
+
+
+def test_optimize_keeps_triangles_and_improves_acmr():
+    model = make_model(2500, 1, n_faces=5000, seed=3)
+    faces = model.faces.astype(np.int64)
+    # Shuffled triangles are the worst case for the cache
+    faces = faces[np.random.default_rng(3).permutation(len(faces))]
+    result = optimize(faces, 2500)
+
+    assert result.acmr_before == acmr(faces)
+    assert result.acmr_after == acmr(result.faces)
+    assert result.acmr_after < result.acmr_before
+    assert result.acmr_after < 1.0
+    np.testing.assert_array_equal(np.sort(result.vertex_order), np.arange(2500))
+    # Same triangles once the new numbering is mapped back
+    np.testing.assert_array_equal(canonical(result.vertex_order[result.faces]), canonical(faces))
+
+
+def test_unreferenced_vertices_go_last():
+    faces = np.array([[4, 5, 6], [6, 5, 7]])
+    result = optimize(faces, 9)
+    np.testing.assert_array_equal(result.vertex_order[4:], [0, 1, 2, 3, 8])
+    assert result.faces.max() == 3
+
+
+def test_acmr_of_a_strip():
+    # Each triangle of a strip adds one vertex: 2 extra misses for the first
+    strip = np.array([[i, i + 1, i + 2] for i in range(10)])
+    assert acmr(strip) == 12 / 10
+    assert acmr(np.empty((0, 3), dtype=np.int64)) == 0.0
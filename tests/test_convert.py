@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from io_warcraft_mrf.core.mrf_utils import MRFReader, MRFWriter
+from io_warcraft_mrf.core.mrf_utils.convert import point_cache_to_model, topology_from_mrf
+from io_warcraft_mrf.core.mrf_utils.point_cache import PointCacheReader, PointCacheWriter, write_point_cache
+
+
+@pytest.mark.parametrize('extension', ['pc2', 'mdd'])
+def test_point_cache_round_trip(tmp_path, model, extension):
+    file_path = str(tmp_path / f'cache.{extension}')
+    positions = model.keyframes[:, :, 0]
+    write_point_cache(file_path, iter(positions), model.header.nVerts, len(positions),
+                      fmt=extension.upper(), frame_duration=1 / 30)
+    with PointCacheReader(file_path, fps=30.0) as cache:
+        assert (cache.n_points, cache.n_frames) == (model.header.nVerts, len(positions))
+        assert cache.frame_duration == pytest.approx(1 / 30)
+        np.testing.assert_array_equal(cache.frame(5), positions[5])
+        np.testing.assert_array_equal(np.stack(list(cache.iter_frames())), positions)
+
+
+def test_point_cache_writer_checks_the_frame_count(tmp_path, model):
+    file_path = tmp_path / 'short.pc2'
+    writer = PointCacheWriter(str(file_path), model.header.nVerts, 3)
+    writer.open()
+    writer.write_frame(model.keyframes[0, :, 0])
+    with pytest.raises(ValueError, match='Expected 3 frames, got 1'):
+        writer.close()
+    assert not file_path.exists()
+
+
+def test_mrf_to_point_cache_and_back(tmp_path, mrf_file, model):
+    cache_path = str(tmp_path / 'cache.pc2')
+    write_point_cache(cache_path, iter(model.keyframes[:, :, 0]), model.header.nVerts, len(model.keyframes))
+
+    topology = topology_from_mrf(mrf_file)
+    converted = str(tmp_path / 'converted.mrf')
+    with PointCacheReader(cache_path) as cache:
+        MRFWriter(point_cache_to_model(cache, topology, frame_range=(2, 9))).write(converted)
+
+    with MRFReader(mrf_file) as original, MRFReader(converted) as reader:
+        assert reader.header.nFrames == 8
+        assert reader.texture_path == original.texture_path
+        np.testing.assert_array_equal(reader.faces, original.faces)
+        np.testing.assert_array_equal(reader.uvs, original.uvs)
+        keyframes = reader.keyframes()
+        np.testing.assert_array_equal(keyframes['pos'], model.keyframes[2:10, :, 0])
+        # Normals are recomputed from the cache's positions
+        np.testing.assert_allclose(np.linalg.norm(keyframes['normal'], axis=-1), 1.0, atol=1e-5)
+
+
+def test_frame_range_outside_the_cache(tmp_path, mrf_file, model):
+    cache_path = str(tmp_path / 'cache.pc2')
+    write_point_cache(cache_path, iter(model.keyframes[:, :, 0]), model.header.nVerts, len(model.keyframes))
+    with PointCacheReader(cache_path) as cache:
+        with pytest.raises(ValueError, match='outside the cache'):
+            point_cache_to_model(cache, topology_from_mrf(mrf_file), frame_range=(5, 12))
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_model
+from io_warcraft_mrf.core.mrf_utils.decimate import _Decimator, decimate
+
+
+def live_edges(decimator: _Decimator) -> set:
+    """Directed edges (u, v) of the remaining faces whose collapse u -> v may be queued."""
+    edges = set()
+    for face, alive in zip(decimator.faces, decimator.face_alive):
+        if alive:
+            for k in range(3):
+                a, b = face[k], face[(k + 1) % 3]
+                edges |= {(a, b), (b, a)}
+    return {(u, v) for u, v in edges if not decimator.locked[u]}
+
+
+@pytest.mark.parametrize('n_verts, targets', [(400, [300, 150]), (900, [450, 200, 100])])
+def test_heap_covers_live_edges(n_verts, targets):
+    model = make_model(n_verts, 8)
+    decimator = _Decimator(model.keyframes[:, :, 0], model.faces.astype(np.int64))
+    decimator.run(targets, 0.0)
+
+    queued = {(u, v) for _, u, v, stamp_u, stamp_v in decimator.heap
+              if stamp_u == decimator.stamp[u] and stamp_v == decimator.stamp[v]}
+    # An edge may only be missing from the heap because it was popped and rejected
+    for u, v in live_edges(decimator) - queued:
+        assert not decimator._can_collapse(u, v), (u, v)
+
+
+def test_targets_are_reached():
+    model = make_model(900, 8)
+    targets = [100, 450, 200]
+    levels = decimate(model.keyframes, model.faces, targets)
+    assert [level.n_verts for level in levels] == targets
+    for level in levels:
+        assert level.faces.max() < level.n_verts
+        assert np.all(level.faces[:, 0] != level.faces[:, 1])
+
+
+def test_error_is_monotone_in_target_count():
+    model = make_model(900, 8)
+    targets = [800, 600, 450, 300, 200, 100]
+    errors = [level.error for level in decimate(model.keyframes, model.faces, targets)]
+    assert errors == sorted(errors)
+    # A flat-ish cloth loses little until most of its vertices are gone
+    assert errors[2] < 0.1 * errors[-1]
+
+
+def test_max_error_stops_the_largest_target():
+    model = make_model(900, 8)
+    free, = decimate(model.keyframes, model.faces, [100])
+    bounded, = decimate(model.keyframes, model.faces, [100], max_error=free.error / 4)
+    assert bounded.n_verts > free.n_verts
+    assert bounded.error <= free.error / 4
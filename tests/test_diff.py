@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_model
+from io_warcraft_mrf.core.mrf_utils import MRFWriter
+from io_warcraft_mrf.core.mrf_utils.diff import diff_files
+
+
+def write(tmp_path, name, model) -> str:
+    file_path = str(tmp_path / name)
+    MRFWriter(model).write(file_path)
+    return file_path
+
+
+def test_identical_files_match(tmp_path, mrf_file, model):
+    result = diff_files(mrf_file, write(tmp_path, 'copy.mrf', model))
+    assert result.matches()
+    assert result.topology == 'identical'
+
+
+def test_moved_vertex(tmp_path, mrf_file, model):
+    model.keyframes[4, 17, 0] += (0.0, 0.5, 0.0)
+    result = diff_files(mrf_file, write(tmp_path, 'moved.mrf', model))
+    assert not result.matches()
+    assert result.matches(position_tolerance=0.5)
+    assert result.positions.worst() == (4, 17, pytest.approx(0.5))
+    assert result.normals.overall_max == 0.0
+
+
+def test_different_vertex_counts_need_remap(tmp_path, mrf_file):
+    with pytest.raises(ValueError, match='use remap'):
+        diff_files(mrf_file, write(tmp_path, 'other.mrf', make_model(500, 12)))
+
+
+def test_remap_matches_reordered_vertices(tmp_path, mrf_file, model):
+    order = np.random.default_rng(5).permutation(model.header.nVerts)
+    new_index = np.argsort(order)
+    model.keyframes = model.keyframes[:, order]
+    model.uvs = model.uvs[order]
+    model.faces = new_index[model.faces].astype(np.uint16)
+    reordered = write(tmp_path, 'reordered.mrf', model)
+
+    assert diff_files(mrf_file, reordered, remap=True).matches()
+    assert not diff_files(mrf_file, reordered).matches()
+
+
+def test_files_without_keyframes(tmp_path, mrf_file):
+    empty = make_model(400, 0)
+    result = diff_files(mrf_file, write(tmp_path, 'empty.mrf', empty), remap=True)
+    assert result.header == {'nFrames': (12, 0)}
+    assert result.unmatched == (0, 0)
+    assert result.topology == 'identical'
+    assert result.positions.overall_max == 0.0
+    assert result.positions.worst() == (-1, -1, 0.0)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from benchmarks import bench_blender, fake_bpy
+from io_warcraft_mrf.core.exporter import ExportJob, MRFExporter
+from io_warcraft_mrf.core.mrf_utils import MRFWriter
+
+CHECKS = (bench_blender.check_mesh_data, bench_blender.check_keyframes, bench_blender.check_shapeanim,
+          bench_blender.check_cache_keyframes, bench_blender.check_batch, bench_blender.check_cancel)
+
+
+@pytest.mark.parametrize('check', CHECKS, ids=lambda check: check.__name__)
+def test_parity_with_reference_loops(check):
+    assert check('small') == []
+
+
+def make_clips(**options):
+    fake_bpy.reset()
+    cape = fake_bpy.make_cylinder(16, 8, 'Cape')
+    banner = fake_bpy.make_cylinder(12, 8, 'Banner')
+    return [MRFExporter(cape, 64.0, 'Textures/white', (1, 12), 1, **options),
+            MRFExporter(cape, 64.0, 'Textures/white', (5, 16), 5, reverse_keyframes=True, **options),
+            MRFExporter(banner, 64.0, 'Textures/white', (3, 10), 3, **options)]
+
+
+@pytest.mark.parametrize('optimize_cache', [False, True])
+def test_streamed_job_writes_the_buffered_files(tmp_path, optimize_cache):
+    expected = []
+    for i, exporter in enumerate(make_clips(optimize_cache=optimize_cache)):
+        expected.append(tmp_path / f'expected{i}.mrf')
+        MRFWriter(exporter.export_to_modeldata()).write(str(expected[-1]))
+
+    exporters = make_clips(optimize_cache=optimize_cache)
+    job = ExportJob(exporters, stream=True)
+    assert sorted(job.streamed) == [0, 1, 2]
+    writers = []
+    for i, model in job.streamed.items():
+        writer = MRFWriter(model)
+        writer.open(str(tmp_path / f'streamed{i}.mrf'))
+        job.sinks[i] = writer.put_keyframe
+        writers.append(writer)
+    while not job.finished:
+        job.step()
+    assert job.finish() == [None, None, None]
+    for i, writer in enumerate(writers):
+        writer.close()
+        assert (tmp_path / f'streamed{i}.mrf').read_bytes() == expected[i].read_bytes()
+
+
+def test_whole_animation_stages_are_buffered():
+    exporters = make_clips(resample_error=0.01)
+    job = ExportJob(exporters, stream=True)
+    assert job.streamed == {}
+    while not job.finished:
+        job.step()
+    assert all(len(models) == 1 for models in job.finish())
+
+
+def test_pivot_and_bounds_radius():
+    exporter = make_clips()[0]
+    vertices = np.random.default_rng(2).normal(size=(200, 3)).astype(np.float32)
+    pivot = exporter._compute_pivot(vertices)
+    scaled = vertices.astype(np.float64) * 64.0
+    np.testing.assert_allclose(pivot, scaled.mean(axis=0))
+    radius = exporter._compute_bounds_radius(vertices, pivot)
+    assert radius == pytest.approx(max(np.linalg.norm(v - pivot) for v in scaled))
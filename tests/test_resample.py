@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_model
+from io_warcraft_mrf.core.mrf_utils import resample as resample_module
+from io_warcraft_mrf.core.mrf_utils.resample import (
+    candidate_counts, find_resample, interpolation_error, resample
+)
+
+
+def linear_motion(n_frames: int, n_verts: int = 50) -> np.ndarray:
+    keyframes = np.zeros((n_frames, n_verts, 2, 3), dtype=np.float32)
+    keyframes[:, :, 0, 0] = np.arange(n_frames)[:, None] * 2.0
+    keyframes[:, :, 0, 1] = np.arange(n_verts)
+    keyframes[:, :, 1, 2] = 1.0
+    return keyframes
+
+
+def test_candidate_counts_keep_the_time_span():
+    counts = candidate_counts(61)
+    assert counts == sorted(set(counts))
+    assert counts[0] == 2 and counts[-1] == 61
+    assert 31 in counts and 21 in counts
+    assert len(counts) < 20
+
+
+def test_resample_keeps_end_frames():
+    model = make_model(100, 31)
+    resampled = resample(model.keyframes, 11)
+    assert resampled.shape == (11, 100, 2, 3)
+    np.testing.assert_allclose(resampled[[0, -1]], model.keyframes[[0, -1]], atol=1e-5)
+    np.testing.assert_allclose(np.linalg.norm(resampled[:, :, 1], axis=-1), 1.0, atol=1e-5)
+
+
+def test_linear_motion_needs_two_frames():
+    keyframes = linear_motion(40)
+    result = find_resample(keyframes, 1 / 30, 1e-3)
+    assert len(result.keyframes) == 2
+    assert result.frame_duration == pytest.approx(39 / 30)
+    assert result.max_error <= 1e-3
+
+
+@pytest.mark.parametrize('max_error', [0.1, 0.5, 2.0])
+def test_reported_error_matches_interpolation_error(max_error, monkeypatch):
+    # Small blocks so that the blockwise check spans several of them
+    monkeypatch.setattr(resample_module, '_BLOCK_ELEMENTS', 1000)
+    model = make_model(400, 61)
+    result = find_resample(model.keyframes, 1 / 30, max_error)
+    assert len(result.keyframes) < 61
+    assert result.max_error <= max_error
+    assert result.max_error == interpolation_error(model.keyframes, result.keyframes)
+
+
+def test_lowest_fitting_count_is_chosen():
+    model = make_model(400, 61)
+    max_error = 0.5
+    result = find_resample(model.keyframes, 1 / 30, max_error)
+    n = len(result.keyframes)
+    for lower in candidate_counts(61):
+        if lower >= n:
+            break
+        assert interpolation_error(model.keyframes, resample(model.keyframes, lower)) > max_error
+
+
+def test_nothing_fits_keeps_the_source():
+    model = make_model(100, 31)
+    result = find_resample(model.keyframes, 1 / 30, 1e-9)
+    assert result.keyframes is model.keyframes
+    assert result.max_error == 0.0
@@ -0,0 +1,67 @@
+import struct
+
+import numpy as np
+import pytest
+
+from io_warcraft_mrf.core.mrf_utils.validator import (
+    KeyframeCheck, ValidationReport, checked_keyframes, validate_file, validate_model
+)
+
+
+def test_valid_model_and_file(model, mrf_file):
+    assert validate_model(model).ok
+    report = validate_file(mrf_file)
+    assert report.ok and not report.warnings
+
+
+def test_nan_keyframes(model):
+    model.keyframes[3, 7, 0, 1] = np.nan
+    model.keyframes[5, 2, 1, 0] = np.inf
+    report = validate_model(model)
+    assert report.errors == ["NaN or infinite positions in 1 keyframes (3)",
+                             "NaN or infinite normals in 1 keyframes (5)"]
+    with pytest.raises(ValueError):
+        report.raise_for_errors()
+
+
+def test_face_index_out_of_range(model):
+    model.faces = model.faces.copy()
+    model.faces[10, 2] = model.header.nVerts
+    report = validate_model(model)
+    assert any('face indices >= nVerts' in error for error in report.errors)
+
+
+def test_non_unit_normals_warn(model):
+    model.keyframes[0, :4, 1] *= 2.0
+    report = validate_model(model)
+    assert report.ok
+    assert report.warnings == ["4 non-unit normals (worst length 2.0000)"]
+
+
+def test_keyframe_outside_the_file(mrf_file):
+    with open(mrf_file, 'r+b') as f:
+        f.seek(80 + 4 * 2)  # Offset table entry of keyframe 2
+        f.write(struct.pack('<I', 1 << 30))
+    report = validate_file(mrf_file)
+    assert any('outside the data area' in error for error in report.errors)
+
+
+def test_keyframe_check_stops_at_the_first_bad_frame(model):
+    model.keyframes[6, 0, 0, 0] = np.nan
+    report = ValidationReport()
+    seen = []
+    with pytest.raises(ValueError, match=r'positions in 1 keyframes \(6\)'):
+        for frame in checked_keyframes(iter(model.keyframes), report):
+            seen.append(frame)
+    assert len(seen) == 6
+
+
+def test_keyframe_check_in_any_order(model):
+    model.keyframes[2, :3, 1] *= 0.5
+    report = ValidationReport()
+    check = KeyframeCheck(report)
+    for index in reversed(range(len(model.keyframes))):
+        check.check(index, model.keyframes[index])
+    check.finish()
+    assert report.ok
+    assert report.warnings == ["3 non-unit normals (worst length 0.5000)"]
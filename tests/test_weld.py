@@ -0,0 +1,52 @@
+import numpy as np
+
+from benchmarks.synthetic import make_model
+from io_warcraft_mrf.core.mrf_utils.weld import candidate_pairs, weld
+
+
+def brute_force_pairs(points: np.ndarray, radius: float) -> np.ndarray:
+    diff = points[:, None] - points[None]
+    close = np.einsum('ijk,ijk->ij', diff, diff) <= radius * radius
+    return np.argwhere(np.triu(close, k=1))
+
+
+def test_candidate_pairs_match_brute_force():
+    points = np.random.default_rng(1).random((300, 3)) * 10.0
+    for radius in (0.3, 1.0, 2.5):
+        np.testing.assert_array_equal(candidate_pairs(points, radius), brute_force_pairs(points, radius))
+
+
+def split_seams(n_verts: int, n_frames: int):
+    """The synthetic cloth with its first 10 vertices duplicated, as a UV seam split would."""
+    model = make_model(n_verts, n_frames)
+    duplicates = np.arange(10)
+    keyframes = np.concatenate((model.keyframes, model.keyframes[:, duplicates]), axis=1)
+    uvs = np.concatenate((model.uvs, model.uvs[duplicates]))
+    faces = model.faces.astype(np.int64)
+    # Faces of the first grid row use the duplicates instead
+    first_row = faces[:9]
+    faces[:9] = np.where(first_row < 10, first_row + n_verts, first_row)
+    return model, keyframes, uvs, faces
+
+
+def test_weld_merges_duplicates():
+    model, keyframes, uvs, faces = split_seams(100, 6)
+    result = weld(keyframes, faces, uvs, distance=1e-4, normal_angle=0.01, uv_tolerance=1e-6)
+    assert result.removed == 10
+    assert result.keep[:100].all() and not result.keep[100:].any()
+    np.testing.assert_array_equal(result.remap[100:], np.arange(10))
+    np.testing.assert_array_equal(result.faces, model.faces)
+
+
+def test_weld_respects_uv_tolerance():
+    _, keyframes, uvs, faces = split_seams(100, 6)
+    uvs[100:, 0] += 0.5
+    result = weld(keyframes, faces, uvs, distance=1e-4, normal_angle=0.01, uv_tolerance=1e-6)
+    assert result.removed == 0
+
+
+def test_weld_checks_every_frame():
+    _, keyframes, uvs, faces = split_seams(100, 6)
+    keyframes[4, 100:, 0, 1] += 1.0  # The duplicates come apart in one frame
+    result = weld(keyframes, faces, uvs, distance=1e-4, normal_angle=0.01, uv_tolerance=1e-6)
+    assert result.removed == 0
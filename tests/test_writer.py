@@ -0,0 +1,130 @@
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_model
+from io_warcraft_mrf.core.mrf_utils import MRFReader, MRFWriter
+from io_warcraft_mrf.core.mrf_utils import writer as writer_module
+
+
+def read_bytes(file_path: str) -> bytes:
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def test_round_trip(mrf_file, model):
+    with MRFReader(mrf_file) as reader:
+        assert reader.header.nFrames == model.header.nFrames
+        assert reader.header.nVerts == model.header.nVerts
+        assert reader.texture_path == model.texture_path
+        np.testing.assert_array_equal(reader.faces.reshape(-1, 3), model.faces)
+        np.testing.assert_allclose(reader.uvs, model.uvs, atol=1e-6)
+        keyframes = reader.keyframes()
+        np.testing.assert_array_equal(keyframes['pos'], model.keyframes[:, :, 0])
+        np.testing.assert_array_equal(keyframes['normal'], model.keyframes[:, :, 1])
+        np.testing.assert_array_equal(reader[3]['pos'], model.keyframes[3, :, 0])
+
+
+def test_failed_write_keeps_existing_file(mrf_file, model):
+    before = read_bytes(mrf_file)
+    first = model.keyframes[0]
+
+    def failing():
+        yield first
+        raise RuntimeError('interrupted')
+
+    model.keyframes = failing()
+    with pytest.raises(RuntimeError):
+        MRFWriter(model).write(mrf_file)
+    assert read_bytes(mrf_file) == before
+    assert not os.path.exists(mrf_file + '.tmp')
+
+
+def test_push_in_any_order(tmp_path, mrf_file, model):
+    file_path = str(tmp_path / 'pushed.mrf')
+    writer = MRFWriter(model)
+    writer.open(file_path)
+    for index in reversed(range(len(model.keyframes))):
+        writer.put_keyframe(index, model.keyframes[index])
+    assert writer.close() == len(model.keyframes)
+    assert read_bytes(file_path) == read_bytes(mrf_file)
+
+
+def test_close_with_missing_keyframe(tmp_path, model):
+    file_path = str(tmp_path / 'partial.mrf')
+    writer = MRFWriter(model)
+    writer.open(file_path)
+    for index in range(len(model.keyframes) - 1):
+        writer.put_keyframe(index, model.keyframes[index])
+    with pytest.raises(ValueError, match='Expected 12 keyframes, got 11'):
+        writer.close()
+    writer.abort()
+    assert not os.path.exists(file_path)
+    assert not os.path.exists(file_path + '.tmp')
+
+
+def test_put_keyframe_outside_header(tmp_path, model):
+    writer = MRFWriter(model)
+    writer.open(str(tmp_path / 'bad.mrf'))
+    with pytest.raises(ValueError, match='does not match the header'):
+        writer.put_keyframe(len(model.keyframes), model.keyframes[0])
+    writer.abort()
+
+
+# === update ===
+
+def test_update_unchanged_file_is_not_written(mrf_file, model):
+    mtime = os.stat(mrf_file).st_mtime_ns
+    assert MRFWriter(model).update(mrf_file) == 0
+    assert os.stat(mrf_file).st_mtime_ns == mtime
+
+
+def test_update_writes_changed_chunks_in_place(tmp_path, mrf_file, model):
+    inode = os.stat(mrf_file).st_ino
+    model.keyframes[2] += 1.0
+    model.keyframes[9] += 1.0
+    model.header.elapsedTime = 2.5
+    assert MRFWriter(model).update(mrf_file) == 2
+    assert os.stat(mrf_file).st_ino == inode
+
+    expected = str(tmp_path / 'expected.mrf')
+    MRFWriter(model).write(expected)
+    assert read_bytes(mrf_file) == read_bytes(expected)
+
+
+def test_update_spills_to_a_copy(tmp_path, mrf_file, model, monkeypatch):
+    monkeypatch.setattr(writer_module, 'UPDATE_BUFFER_BYTES', 0)
+    model.keyframes[:] *= 2.0
+    assert MRFWriter(model).update(mrf_file) == len(model.keyframes)
+    assert not os.path.exists(mrf_file + '.tmp')
+
+    expected = str(tmp_path / 'expected.mrf')
+    MRFWriter(model).write(expected)
+    assert read_bytes(mrf_file) == read_bytes(expected)
+
+
+@pytest.mark.parametrize('buffer_bytes', [writer_module.UPDATE_BUFFER_BYTES, 0])
+def test_failed_update_keeps_existing_file(mrf_file, model, monkeypatch, buffer_bytes):
+    monkeypatch.setattr(writer_module, 'UPDATE_BUFFER_BYTES', buffer_bytes)
+    before = read_bytes(mrf_file)
+    changed = model.keyframes + 1.0
+
+    def failing():
+        yield from changed[:5]
+        raise RuntimeError('interrupted')
+
+    model.keyframes = failing()
+    with pytest.raises(RuntimeError):
+        MRFWriter(model).update(mrf_file)
+    assert read_bytes(mrf_file) == before
+    assert not os.path.exists(mrf_file + '.tmp')
+
+
+def test_update_with_new_layout_rewrites(tmp_path, mrf_file):
+    longer = make_model(400, 20)
+    assert MRFWriter(longer).update(mrf_file) == 20
+
+    expected = str(tmp_path / 'expected.mrf')
+    MRFWriter(longer).write(expected)
+    assert read_bytes(mrf_file) == read_bytes(expected)